@@ -0,0 +1,192 @@
+"""Persistent, memory-mapped embedding store.
+
+Embeddings of claim templates, evidence phrases and PM prompts are computed
+once and kept on disk as two append-only files:
+
+- `<path>.f32`: raw float32 rows of `dim` values, memory-mapped read-only,
+  so worker processes and the Gradio apps share one page-cached copy;
+- `<path>.keys`: one JSON-encoded string per line, giving the row order.
+
+Rows are written before their keys, so a reader never sees a key without
+its row. One process appends; `refresh()` lets the others pick up the new
+rows. Lookups that miss are embedded, appended (unless the store is
+read-only) and counted, so `hit_rate()` shows how well the precomputed set
+covers the traffic.
+
+Build the default store with:
+
+    python -m aaf.embedding_store
+
+`open_default_store()` attaches the default store, read-only, to the
+module-level functions in `aaf.embeddings` (used by semantic consensus);
+the Gradio apps call it at startup.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import yaml
+
+from aaf.embeddings import EmbeddingEngine, use_store
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_STORE = ROOT / "cache" / "embeddings" / "aaf"
+PROMPT_LIBRARY = ROOT / "prompts" / "pm_prompt_library.yaml"
+
+
+class EmbeddingStore:
+    def __init__(
+        self,
+        path: Path | str = DEFAULT_STORE,
+        engine: Optional[EmbeddingEngine] = None,
+        readonly: bool = False,
+    ) -> None:
+        self.path = Path(path)
+        self.engine = engine or EmbeddingEngine()
+        self.dim = self.engine.dim
+        self.readonly = readonly
+        self.hits = 0
+        self.misses = 0
+        self._rows_path = self.path.with_name(self.path.name + ".f32")
+        self._keys_path = self.path.with_name(self.path.name + ".keys")
+        self._index: Dict[str, int] = {}
+        self._keys_offset = 0
+        self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+        if not readonly:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Load keys appended since the last refresh and remap the rows."""
+        if self._keys_path.exists():
+            with self._keys_path.open("r", encoding="utf-8") as fh:
+                fh.seek(self._keys_offset)
+                while True:
+                    line = fh.readline()
+                    if not line.endswith("\n"):
+                        # Absent or partially written last line.
+                        break
+                    self._index.setdefault(json.loads(line), len(self._index))
+                    self._keys_offset = fh.tell()
+        self._remap()
+
+    def _remap(self) -> None:
+        n = len(self._index)
+        if n == 0:
+            self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+            return
+        size = self._rows_path.stat().st_size // (4 * self.dim)
+        if size < n:
+            raise ValueError(f"Embedding store {self.path} has {size} rows for {n} keys")
+        self._matrix = np.memmap(self._rows_path, dtype=np.float32, mode="r", shape=(n, self.dim))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, text: object) -> bool:
+        return text in self._index
+
+    def add(self, texts: Iterable[str]) -> int:
+        """Embed and append texts not yet in the store; returns how many were added."""
+        if self.readonly:
+            raise PermissionError(f"Embedding store {self.path} is read-only")
+        new: List[str] = []
+        seen = set()
+        for text in texts:
+            if text not in self._index and text not in seen:
+                seen.add(text)
+                new.append(text)
+        if not new:
+            return 0
+
+        rows = self.engine.embed(new)
+        with self._rows_path.open("ab") as fh:
+            # Truncated rows from an interrupted append would misalign the
+            # file; align the write to the row count the keys describe.
+            fh.truncate(len(self._index) * 4 * self.dim)
+            fh.write(rows.astype(np.float32, copy=False).tobytes())
+        with self._keys_path.open("a", encoding="utf-8") as fh:
+            for text in new:
+                fh.write(json.dumps(text) + "\n")
+        self.refresh()
+        return len(new)
+
+    def get(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        (N x dim) float32 embeddings for `texts`. Misses are embedded and,
+        unless the store is read-only, appended.
+        """
+        missing = [t for t in texts if t not in self._index]
+        self.misses += len(missing)
+        self.hits += len(texts) - len(missing)
+        if missing and self.readonly:
+            out = np.empty((len(texts), self.dim), dtype=np.float32)
+            fresh = dict(zip(missing, self.engine.embed(missing)))
+            for i, text in enumerate(texts):
+                row = self._index.get(text)
+                out[i] = self._matrix[row] if row is not None else fresh[text]
+            return out
+        if missing:
+            self.add(missing)
+        return np.asarray(self._matrix[[self._index[t] for t in texts]])
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "rows": float(len(self)),
+            "hits": float(self.hits),
+            "misses": float(self.misses),
+            "hit_rate": self.hit_rate(),
+        }
+
+
+def default_phrases(prompt_library: Path | str = PROMPT_LIBRARY) -> List[str]:
+    """
+    Claim templates and fixed evidence phrases of the registered agents,
+    plus every prompt in the PM prompt library.
+    """
+    from agents.registry import REGISTRY
+
+    phrases: List[str] = []
+    for agent in REGISTRY:
+        phrases.extend(agent.claims)
+        phrases.extend(p for p in (agent.missing_evidence, agent.none_evidence) if p)
+
+    library_path = Path(prompt_library)
+    if library_path.exists():
+        library = yaml.safe_load(library_path.read_text(encoding="utf-8")) or {}
+        for entry in library.get("prompts", []) or []:
+            if entry.get("prompt"):
+                phrases.append(str(entry["prompt"]))
+    return phrases
+
+
+def open_default_store(path: Path | str = DEFAULT_STORE) -> Optional[EmbeddingStore]:
+    """
+    Open the store at `path` read-only and serve `aaf.embeddings` from it.
+    Returns None, leaving the embeddings computed on the fly, when no store
+    has been built there.
+    """
+    store = EmbeddingStore(path, readonly=True)
+    if not len(store):
+        return None
+    use_store(store)
+    return store
+
+
+def build_default_store(path: Path | str = DEFAULT_STORE) -> EmbeddingStore:
+    store = EmbeddingStore(path)
+    store.add(default_phrases())
+    return store
+
+
+if __name__ == "__main__":
+    built = build_default_store()
+    print(f"Embedding store {built.path}: {len(built)} rows")
@@ -6,20 +6,44 @@ hashing-based bag-of-words embedding.
 
 If you later want stronger semantics, replace `embed_claims` with a
 sentence-transformer model, but keep the interface stable.
+
+`EmbeddingEngine` does the work with NumPy: a batch of texts becomes one
+(N x D) float32 matrix of L2-normalized rows, token hashes are kept in a
+bounded LRU cache, and all pairwise cosine similarities come from a single
+matrix multiply. The module-level functions use a shared default engine,
+or read rows from an `aaf.embedding_store.EmbeddingStore` once one is
+attached with `use_store()`.
+
+`SparseEmbeddingEngine` hashes into a much larger space (2^20 dimensions by
+default) so long evidence lists and prompts do not collide, and stores each
+batch in CSR form: memory grows with the number of distinct tokens, not with
+the dimension. Similarities between sparse batches are sparse products too.
 """
 
 from __future__ import annotations
 
-from typing import List
-import math
-import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple, Union
 import hashlib
+import re
+
+import numpy as np
+from scipy import sparse
+
+if TYPE_CHECKING:
+    from aaf.embedding_store import EmbeddingStore
 
 _DIM = 256
+_TOKEN_CACHE_SIZE = 65536
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]+")
+
+Vector = Union[Sequence[float], np.ndarray]
 
 
 def _tokenize(text: str) -> List[str]:
-    return [t for t in re.findall(r"[A-Za-z0-9]+", (text or "").lower()) if t]
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t]
 
 
 def _hash(token: str) -> int:
@@ -27,20 +51,163 @@ def _hash(token: str) -> int:
     return int.from_bytes(h[:4], "little")
 
 
+class EmbeddingEngine:
+    """Hashing bag-of-words embeddings as dense float32 NumPy rows."""
+
+    def __init__(self, dim: int = _DIM, cache_size: int = _TOKEN_CACHE_SIZE) -> None:
+        self.dim = int(dim)
+        self._index = lru_cache(maxsize=cache_size)(self._token_index)
+
+    def _token_index(self, token: str) -> int:
+        return _hash(token) % self.dim
+
+    def cache_info(self):
+        return self._index.cache_info()
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """(N x D) float32 matrix with one L2-normalized row per text."""
+        rows: List[int] = []
+        cols: List[int] = []
+        index = self._index
+        for i, text in enumerate(texts):
+            for token in _tokenize(text):
+                rows.append(i)
+                cols.append(index(token))
+
+        vecs = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(vecs, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), 1.0)
+        norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+        norms[norms == 0.0] = 1.0
+        vecs /= norms
+        return vecs
+
+    def similarity_matrix(self, texts_or_vecs: Union[Sequence[str], np.ndarray]) -> np.ndarray:
+        """All pairwise cosine similarities, from one matrix multiply."""
+        if isinstance(texts_or_vecs, np.ndarray):
+            vecs = texts_or_vecs
+        else:
+            vecs = self.embed(texts_or_vecs)
+        return vecs @ vecs.T
+
+
+@dataclass
+class SparseBatch:
+    """
+    CSR batch of L2-normalized sparse embeddings.
+
+    Row i has columns `indices[indptr[i]:indptr[i + 1]]` (sorted) with
+    weights `data[indptr[i]:indptr[i + 1]]`.
+    """
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    dim: int
+
+    def __len__(self) -> int:
+        return int(self.indptr.shape[0] - 1)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.indptr.nbytes + self.indices.nbytes + self.data.nbytes)
+
+    def row(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return self.indices[lo:hi], self.data[lo:hi]
+
+    def dot(self, i: int, j: int, other: Optional["SparseBatch"] = None) -> float:
+        """Sparse dot product of row i with row j of `other` (default: self)."""
+        a_idx, a_val = self.row(i)
+        b_idx, b_val = (other if other is not None else self).row(j)
+        _, ia, ib = np.intersect1d(a_idx, b_idx, assume_unique=True, return_indices=True)
+        return float(np.dot(a_val[ia], b_val[ib]))
+
+    def to_csr(self) -> sparse.csr_matrix:
+        """The batch as a SciPy CSR matrix, sharing its arrays."""
+        return sparse.csr_matrix((self.data, self.indices, self.indptr), shape=(len(self), self.dim))
+
+    def similarity_matrix(self, other: Optional["SparseBatch"] = None) -> sparse.csr_matrix:
+        """
+        Cosine similarities between all rows of `self` and `other`, as a
+        sparse CSR matrix: the product is computed sparsely and only pairs
+        that share a token are stored.
+        """
+        a = self.to_csr()
+        b = a if other is None or other is self else other.to_csr()
+        return (a @ b.T).tocsr()
+
+
+class SparseEmbeddingEngine:
+    """Hashing bag-of-words embeddings in a 2^18+ dimensional sparse space."""
+
+    def __init__(self, dim: int = 1 << 20, cache_size: int = _TOKEN_CACHE_SIZE) -> None:
+        if dim < 1 or dim > 1 << 32:
+            raise ValueError("Sparse embedding dimension must be in [1, 2^32]")
+        self.dim = int(dim)
+        self._index = lru_cache(maxsize=cache_size)(self._token_index)
+
+    def _token_index(self, token: str) -> int:
+        return _hash(token) % self.dim
+
+    def cache_info(self):
+        return self._index.cache_info()
+
+    def embed(self, texts: Sequence[str]) -> SparseBatch:
+        """Embed texts; join an evidence list into one string to embed it whole."""
+        index = self._index
+        counts: List[int] = []
+        cols: List[int] = []
+        for text in texts:
+            tokens = _tokenize(text)
+            counts.append(len(tokens))
+            cols.extend(index(t) for t in tokens)
+
+        n = len(texts)
+        rows = np.repeat(np.arange(n, dtype=np.int64), counts)
+        keys, weights = np.unique(rows * self.dim + np.asarray(cols, dtype=np.int64), return_counts=True)
+        rows = keys // self.dim
+        data = weights.astype(np.float32)
+        norms = np.sqrt(np.bincount(rows, weights=data.astype(np.float64) ** 2, minlength=n))
+        data /= norms[rows].astype(np.float32)
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        index_dtype = np.int32 if self.dim <= np.iinfo(np.int32).max else np.int64
+        return SparseBatch(indptr, (keys % self.dim).astype(index_dtype), data, self.dim)
+
+    def similarity_matrix(self, texts_or_batch: Union[Sequence[str], SparseBatch]) -> sparse.csr_matrix:
+        batch = texts_or_batch if isinstance(texts_or_batch, SparseBatch) else self.embed(texts_or_batch)
+        return batch.similarity_matrix()
+
+
+_ENGINE = EmbeddingEngine()
+_STORE: Optional["EmbeddingStore"] = None
+
+
+def use_store(store: Optional["EmbeddingStore"]) -> None:
+    """Serve the module-level embeddings from `store` (None detaches it)."""
+    global _STORE
+    if store is not None and store.dim != _ENGINE.dim:
+        raise ValueError(f"Embedding store has dim {store.dim}, expected {_ENGINE.dim}")
+    _STORE = store
+
+
+def embed_matrix(claims: Sequence[str]) -> np.ndarray:
+    if _STORE is not None:
+        return _STORE.get(claims)
+    return _ENGINE.embed(claims)
+
+
+def similarity_matrix(claims: Union[Sequence[str], np.ndarray]) -> np.ndarray:
+    if isinstance(claims, np.ndarray):
+        return _ENGINE.similarity_matrix(claims)
+    vecs = embed_matrix(claims)
+    return vecs @ vecs.T
+
+
 def embed_claims(claims: List[str]) -> List[List[float]]:
-    vecs: List[List[float]] = []
-    for c in claims:
-        v = [0.0] * _DIM
-        toks = _tokenize(c)
-        for t in toks:
-            idx = _hash(t) % _DIM
-            v[idx] += 1.0
-        # L2 normalize
-        norm = math.sqrt(sum(x * x for x in v)) or 1.0
-        v = [x / norm for x in v]
-        vecs.append(v)
-    return vecs
-
-
-def cosine_sim(a: List[float], b: List[float]) -> float:
-    return float(sum(x * y for x, y in zip(a, b)))
+    return _ENGINE.embed(claims).tolist()
+
+
+def cosine_sim(a: Vector, b: Vector) -> float:
+    return float(np.dot(np.asarray(a, dtype=np.float32), np.asarray(b, dtype=np.float32)))
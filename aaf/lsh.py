@@ -0,0 +1,133 @@
+"""MinHash / LSH clustering of near-duplicate incidents.
+
+Each incident is reduced to the token set of its agent claims and evidence,
+using the same tokenizer and token hash as aaf/embeddings.py, plus one token
+per (rounded) telemetry field. A MinHash
+signature of `num_perm` values estimates Jaccard similarity. The signature is
+cut into `bands` bands, and incidents that share any band bucket become
+candidate pairs, so an insert or query only touches its own buckets rather
+than every stored incident. Candidates are confirmed with their exact
+Jaccard similarity before being merged into a cluster.
+
+With the defaults (64 permutations, 16 bands of 4 rows) pairs above a
+Jaccard similarity of about 0.5 are very likely to become candidates.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Hashable, Iterable, List, Sequence, Set
+
+import numpy as np
+
+from aaf.embeddings import _hash, _tokenize
+
+_PRIME = (1 << 61) - 1
+
+
+def incident_tokens(texts: Iterable[str], ignore_numbers: bool = True) -> Set[str]:
+    """
+    Token set of an incident's claims and evidence. Pure numbers are dropped
+    by default, so incidents that differ only in metric values collide.
+    """
+    tokens: Set[str] = set()
+    for text in texts:
+        for token in _tokenize(text):
+            if ignore_numbers and token.isdigit():
+                continue
+            tokens.add(token)
+    return tokens
+
+
+def telemetry_tokens(telemetry: Dict[str, Any], digits: int = 2) -> Set[str]:
+    """
+    One `block.field=value` token per telemetry field, with numbers rounded to
+    `digits` significant digits, so incidents whose metrics agree to that
+    precision share the token.
+    """
+    tokens: Set[str] = set()
+    for block, fields in telemetry.items():
+        if not isinstance(fields, dict):
+            continue
+        for key, value in fields.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                value = f"{float(value):.{digits}g}"
+            tokens.add(f"{block}.{key}={value}")
+    return tokens
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHashLSH:
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 1) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [{} for _ in range(bands)]
+
+    def signature(self, tokens: Iterable[str]) -> np.ndarray:
+        hashes = np.fromiter((_hash(t) for t in tokens), dtype=np.uint64)
+        if hashes.size == 0:
+            return np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        # (a * h + b) mod p over 32-bit h; wraparound in uint64 keeps the
+        # family pseudo-random, which is all MinHash needs.
+        perm = (hashes[:, None] * self._a[None, :] + self._b[None, :]) % np.uint64(_PRIME)
+        return perm.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[i * self.rows:(i + 1) * self.rows].tobytes()
+            for i in range(self.bands)
+        ]
+
+    def insert(self, key: Hashable, signature: np.ndarray) -> None:
+        for band, bucket_key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(bucket_key, []).append(key)
+
+    def query(self, signature: np.ndarray) -> Set[Hashable]:
+        found: Set[Hashable] = set()
+        for band, bucket_key in enumerate(self._band_keys(signature)):
+            found.update(self._buckets[band].get(bucket_key, ()))
+        return found
+
+
+def cluster_near_duplicates(
+    documents: Sequence[Set[str]],
+    threshold: float = 0.9,
+    num_perm: int = 64,
+    bands: int = 16,
+) -> List[List[int]]:
+    """
+    Group documents (token sets) into near-duplicate clusters.
+
+    Documents are visited in order. Each joins the first cluster whose
+    leader is an LSH candidate with Jaccard similarity >= `threshold`, or
+    else leads a new cluster. Only leaders are indexed, so a storm of
+    near-identical incidents costs one candidate check each. Returns lists of
+    indices, each led by its leader, in leader order.
+    """
+    lsh = MinHashLSH(num_perm=num_perm, bands=bands)
+    clusters: Dict[int, List[int]] = {}
+
+    for i, tokens in enumerate(documents):
+        signature = lsh.signature(tokens)
+        leader = None
+        for j in sorted(lsh.query(signature)):
+            if jaccard(tokens, documents[j]) >= threshold:
+                leader = j
+                break
+        if leader is None:
+            clusters[i] = [i]
+            lsh.insert(i, signature)
+        else:
+            clusters[leader].append(i)
+
+    return list(clusters.values())
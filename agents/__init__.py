@@ -1,14 +1,25 @@
-from .base import AgentOutput, BaseAgent
-from .devops import DevOpsAgent
-from .sre import SREAgent
-from .finops import FinOpsAgent
-from .devsecops import DevSecOpsAgent
-
-__all__ = [
-    "AgentOutput",
-    "BaseAgent",
-    "DevOpsAgent",
-    "SREAgent",
-    "FinOpsAgent",
-    "DevSecOpsAgent",
-]
+from .base import AgentBatchOutput, AgentOutput, BaseAgent, frame_from_records
+from .devops import DevOpsAgent
+from .sre import SREAgent
+from .finops import FinOpsAgent
+from .devsecops import DevSecOpsAgent
+from .memo import AgentMemo
+from .registry import REGISTRY, AgentRegistry, load_registry
+from .telemetry import Telemetry, TelemetryBlock
+
+__all__ = [
+    "AgentBatchOutput",
+    "AgentMemo",
+    "AgentOutput",
+    "AgentRegistry",
+    "BaseAgent",
+    "DevOpsAgent",
+    "SREAgent",
+    "FinOpsAgent",
+    "DevSecOpsAgent",
+    "REGISTRY",
+    "Telemetry",
+    "TelemetryBlock",
+    "frame_from_records",
+    "load_registry",
+]
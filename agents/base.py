@@ -1,15 +1,333 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Dict, Any
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, List, Dict, Any, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .rules import RuleResult
+
+
+# Claim codes shared by every domain agent. Each agent maps a code to its
+# own display text through its `claims` tuple.
+CLAIM_NONE = 0
+CLAIM_POSSIBLE = 1
+CLAIM_PRIMARY = 2
+CLAIM_INCOMPLETE = 3
+
+# Claim classes read by consensus. Free-text claims that match none of the
+# marker lists in orchestrator/consensus.py are CLASS_OTHER.
+CLASS_OTHER = 0
+CLASS_NEGATIVE = 1
+CLASS_POSSIBLE = 2
+CLASS_PRIMARY = 3
+
+# Claim class per claim code.
+CLAIM_CLASSES: Tuple[int, int, int, int] = (
+    CLASS_NEGATIVE,
+    CLASS_POSSIBLE,
+    CLASS_PRIMARY,
+    CLASS_POSSIBLE,
+)
+
+
+# Columnar telemetry: domain -> field -> 1-D array with one entry per incident.
+TelemetryFrame = Dict[str, Dict[str, np.ndarray]]
+
+
+class _LazyEvidence:
+    """Private slots behind `AgentOutput.evidence`; not dataclass fields."""
+
+    __slots__ = ("_evidence", "_render")
+
+
+@dataclass(slots=True)
+class AgentOutput(_LazyEvidence):
+    """
+    One agent's claim about its domain.
+
+    Domain agents also set `code` (index into their `claims` tuple) and
+    `claim_class`, so consensus does not have to re-read the claim text.
+    Outputs built from free text leave `claim_class` as None.
+
+    Agents leave `evidence` unset and attach a renderer instead, so outputs
+    that are only scored never format their evidence strings; reading
+    `evidence` renders them once.
+    """
 
-@dataclass
-class AgentOutput:
     agent_type: str
     claim: str
     confidence: float
-    evidence: List[str]
+    evidence: Optional[List[str]] = None
+    code: Optional[int] = None
+    claim_class: Optional[int] = None
+
+    def render(self) -> "AgentOutput":
+        """Render lazy evidence now, e.g. before the output is pickled."""
+        _get_evidence(self)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "agent_type": self.agent_type,
+            "claim": self.claim,
+            "confidence": self.confidence,
+            "evidence": list(self.evidence),
+        }
+
+
+def _get_evidence(self: AgentOutput) -> List[str]:
+    if self._evidence is None:
+        render, self._render = self._render, None
+        self._evidence = render() if render is not None else []
+    return self._evidence
+
+
+def _set_evidence(self: AgentOutput, value: Optional[List[str]]) -> None:
+    self._evidence = value
+    self._render = None
+
+
+# Installed after the dataclass is built, so `evidence` stays an ordinary
+# init field for the constructor and dataclasses.replace().
+AgentOutput.evidence = property(_get_evidence, _set_evidence)  # type: ignore[assignment]
+
+
+@dataclass
+class AgentBatchOutput:
+    """
+    Result of `BaseAgent.infer_batch` for N incidents.
+
+    Evidence strings are not built during batch inference. They are
+    produced on request for a single row via `evidence(i)` or `output(i)`.
+    """
+
+    agent: "BaseAgent"
+    frame: TelemetryFrame
+    codes: np.ndarray
+    confidences: np.ndarray
+    _outputs: Dict[int, AgentOutput] = field(default_factory=dict, repr=False)
+
+    @property
+    def agent_type(self) -> str:
+        return self.agent.agent_type
+
+    def __len__(self) -> int:
+        return int(self.codes.shape[0])
+
+    def claims(self) -> List[str]:
+        return [self.agent.claims[int(c)] for c in self.codes]
+
+    def claim_classes(self) -> np.ndarray:
+        return np.asarray(CLAIM_CLASSES, dtype=np.int8)[self.codes]
+
+    def output(self, i: int) -> AgentOutput:
+        i = int(i)
+        if i not in self._outputs:
+            self._outputs[i] = self.agent.infer(frame_row(self.frame, i))
+        return self._outputs[i]
+
+    def evidence(self, i: int) -> List[str]:
+        return self.output(i).evidence
+
+
+def frame_size(frame: TelemetryFrame) -> int:
+    for block in frame.values():
+        for col in block.values():
+            return int(np.shape(col)[0])
+    return 0
+
+
+def frame_from_records(records: Sequence[Dict[str, Any]]) -> TelemetryFrame:
+    """
+    Build a columnar frame from per-incident telemetry dicts.
+
+    Columns are object arrays; a field absent from a record is stored as None.
+    Callers that already hold numeric columns should build the frame directly.
+    """
+    fields: Dict[str, Dict[str, None]] = {}
+    for rec in records:
+        for domain, block in (rec or {}).items():
+            if isinstance(block, dict):
+                seen = fields.setdefault(domain, {})
+                for key in block:
+                    seen.setdefault(key, None)
+
+    frame: TelemetryFrame = {}
+    for domain, keys in fields.items():
+        frame[domain] = {}
+        for key in keys:
+            values = [((rec or {}).get(domain, {}) or {}).get(key) for rec in records]
+            frame[domain][key] = np.asarray(values, dtype=object)
+    return frame
+
+
+def frame_row(frame: TelemetryFrame, i: int) -> Dict[str, Any]:
+    row: Dict[str, Any] = {}
+    for domain, block in frame.items():
+        row[domain] = {}
+        for key, col in block.items():
+            value = col[i]
+            if value is None:
+                continue
+            row[domain][key] = value.item() if isinstance(value, np.generic) else value
+    return row
+
+
+def frame_column(
+    frame: TelemetryFrame,
+    domain: str,
+    key: str,
+    default: float,
+    n: int,
+    integer: bool = False,
+) -> np.ndarray:
+    """
+    Return one numeric column with the same `float(x or default)` coercion
+    (or `int(float(x or default))` when `integer` is set) that the per-dict
+    `infer()` path applies. Like `int()`, integer columns reject NaN and
+    infinite values.
+    """
+    col = (frame.get(domain, {}) or {}).get(key)
+    if col is None:
+        return np.full(n, default, dtype=np.float64)
+
+    arr = np.asarray(col)
+    if arr.dtype == object:
+        arr = np.array([float(v or default) for v in arr], dtype=np.float64)
+    else:
+        arr = arr.astype(np.float64)
+        if default:
+            arr[arr == 0] = default
+    if integer:
+        if not np.isfinite(arr).all():
+            raise ValueError(f"Invalid telemetry value {domain}.{key}: NaN or infinite integer")
+        arr = np.trunc(arr)
+    return arr
+
+
+def frame_flag(frame: TelemetryFrame, domain: str, key: str, n: int) -> np.ndarray:
+    col = (frame.get(domain, {}) or {}).get(key)
+    if col is None:
+        return np.zeros(n, dtype=bool)
+
+    arr = np.asarray(col)
+    if arr.dtype == object:
+        return np.array([bool(v) for v in arr], dtype=bool)
+    return arr.astype(bool, copy=False)
+
 
 class BaseAgent:
     agent_type: str = "Base"
-    def infer(self, telemetry: Dict[str, Any]) -> AgentOutput:
+    domain: str = ""
+
+    # Display text per claim code: (none, possible, primary, incomplete).
+    claims: Tuple[str, str, str, str] = ("", "", "", "")
+
+    # Score contribution per rule level, keyed by telemetry field. Thresholds
+    # themselves live in the shared rule table (see agents/rules.py).
+    weights: Dict[str, Tuple[float, ...]] = {}
+    primary_at: float = 0.60
+
+    # Evidence text for the incomplete and no-anomaly claims.
+    missing_evidence: str = ""
+    none_evidence: str = ""
+
+    def infer(self, telemetry: Mapping[str, Any]) -> AgentOutput:
+        raise NotImplementedError
+
+    def _output(self, r: "RuleResult") -> AgentOutput:
+        """
+        Decide the claim for one rule evaluation; evidence stays lazy. The
+        renderer keeps only this agent's values and levels, not `r`.
+        """
+        if r.missing[self.domain]:
+            code, confidence = CLAIM_INCOMPLETE, 0.45
+        else:
+            code, confidence = self._decide(self._score(r.levels))
+        output = AgentOutput(
+            self.agent_type,
+            self.claims[code],
+            confidence,
+            code=code,
+            claim_class=CLAIM_CLASSES[code],
+        )
+        if code in (CLAIM_PRIMARY, CLAIM_POSSIBLE):
+            values = {key: r.values[key] for key in self.weights}
+            levels = {key: r.levels[key] for key in self.weights}
+            output._render = partial(self._findings, values, levels)
+        else:
+            output._render = partial(self.render_evidence, code)
+        return output
+
+    def incomplete(self, reason: str) -> AgentOutput:
+        """Evidence-incomplete output with an explicit reason as evidence."""
+        return AgentOutput(
+            self.agent_type,
+            self.claims[CLAIM_INCOMPLETE],
+            0.45,
+            [reason],
+            code=CLAIM_INCOMPLETE,
+            claim_class=CLAIM_CLASSES[CLAIM_INCOMPLETE],
+        )
+
+    def render_evidence(self, code: int, r: Optional["RuleResult"] = None) -> List[str]:
+        if code == CLAIM_INCOMPLETE:
+            return [self.missing_evidence]
+        if code == CLAIM_NONE:
+            return [self.none_evidence]
+        return self._findings(r.values, r.levels)
+
+    def _findings(self, v: Dict[str, Any], lv: Dict[str, int]) -> List[str]:
         raise NotImplementedError
+
+    def infer_batch(
+        self,
+        frame: TelemetryFrame,
+        rules: Optional["RuleResult"] = None,
+    ) -> AgentBatchOutput:
+        """
+        Vectorized inference for N incidents held as NumPy columns.
+
+        Produces the same claim and confidence as calling `infer()` on each
+        row, without building evidence strings. Pass `rules`, the frame's
+        `RuleTable.evaluate_frame` result, to share one rule evaluation
+        across agents (see `AgentRegistry.run_batch`).
+        """
+        if rules is None:
+            from .rules import RULES
+
+            rules = RULES.evaluate_frame(frame)
+        r = rules
+        score = np.zeros(frame_size(frame), dtype=np.float64)
+        for key, w in self.weights.items():
+            score += np.asarray(w, dtype=np.float64)[r.levels[key]]
+
+        codes = np.where(
+            score >= self.primary_at,
+            CLAIM_PRIMARY,
+            np.where(score >= 0.30, CLAIM_POSSIBLE, CLAIM_NONE),
+        )
+        confidences = np.where(
+            codes == CLAIM_PRIMARY,
+            np.minimum(0.92, 0.55 + score),
+            np.where(codes == CLAIM_POSSIBLE, np.minimum(0.78, 0.50 + score), 0.25),
+        )
+        missing = r.missing[self.domain]
+        codes = np.where(missing, CLAIM_INCOMPLETE, codes).astype(np.int8)
+        confidences = np.where(missing, 0.45, confidences)
+        return AgentBatchOutput(self, frame, codes, confidences)
+
+    def _score(self, levels: Dict[str, int]) -> float:
+        score = 0.0
+        for key, w in self.weights.items():
+            score += w[levels[key]]
+        return score
+
+    def _decide(self, score: float) -> Tuple[int, float]:
+        if score >= self.primary_at:
+            return CLAIM_PRIMARY, min(0.92, 0.55 + score)
+        if score >= 0.30:
+            return CLAIM_POSSIBLE, min(0.78, 0.50 + score)
+        return CLAIM_NONE, 0.25
@@ -1,60 +1,48 @@
 from __future__ import annotations
 
-from typing import Dict, Any, List
-from .base import BaseAgent, AgentOutput
+from typing import Any, Dict, List, Mapping
+
+from .base import AgentOutput, BaseAgent
+from .telemetry import Telemetry
 
 
 class DevOpsAgent(BaseAgent):
     agent_type = "DevOps"
-
-    def infer(self, telemetry: Dict[str, Any]) -> AgentOutput:
-        d = telemetry.get("deploy", {}) or {}
+    domain = "deploy"
+    claims = (
+        "No material deployment anomaly detected",
+        "Deployment signal indicates a possible release or configuration issue",
+        "Deployment failure is the likely primary operational cause",
+        "Deployment evidence is incomplete",
+    )
+    weights = {
+        "pipeline_failed": (0.0, 0.30),
+        "config_drift": (0.0, 0.25),
+        "rollback_marker": (0.0, 0.25),
+        "artifact_mismatch": (0.0, 0.25),
+        "restart_loops": (0.0, 0.12, 0.25),
+    }
+    primary_at = 0.60
+    missing_evidence = "Deployment telemetry marked as missing"
+    none_evidence = "No pipeline failure, rollback marker, artifact mismatch, or abnormal restart loop"
+
+    def infer(self, telemetry: Mapping[str, Any]) -> AgentOutput:
+        return self._output(Telemetry.parse(telemetry).rules)
+
+    def _findings(self, v: Dict[str, Any], lv: Dict[str, int]) -> List[str]:
         evidence: List[str] = []
 
-        if d.get("_missing"):
-            return AgentOutput(
-                self.agent_type,
-                "Deployment evidence is incomplete",
-                0.45,
-                ["Deployment telemetry marked as missing"],
-            )
-
-        pipeline_failed = bool(d.get("pipeline_failed", False))
-        config_drift = bool(d.get("config_drift", False))
-        rollback_marker = bool(d.get("rollback_marker", False))
-        artifact_mismatch = bool(d.get("artifact_mismatch", False))
-        restart_loops = int(float(d.get("restart_loops", 0) or 0))
-
-        score = 0.0
-
-        if pipeline_failed:
+        if v["pipeline_failed"]:
             evidence.append("CI/CD pipeline failure detected")
-            score += 0.30
-        if config_drift:
+        if v["config_drift"]:
             evidence.append("Configuration drift detected")
-            score += 0.25
-        if rollback_marker:
+        if v["rollback_marker"]:
             evidence.append("Rollback marker present in release telemetry")
-            score += 0.25
-        if artifact_mismatch:
+        if v["artifact_mismatch"]:
             evidence.append("Deployment artifact mismatch detected")
-            score += 0.25
-        if restart_loops >= 12:
-            evidence.append(f"Container restart loops observed: {restart_loops}")
-            score += 0.25
-        elif restart_loops >= 6:
-            evidence.append(f"Moderate restart loops observed: {restart_loops}")
-            score += 0.12
-
-        if score >= 0.60:
-            claim = "Deployment failure is the likely primary operational cause"
-            confidence = min(0.92, 0.55 + score)
-        elif score >= 0.30:
-            claim = "Deployment signal indicates a possible release or configuration issue"
-            confidence = min(0.78, 0.50 + score)
-        else:
-            claim = "No material deployment anomaly detected"
-            confidence = 0.25
-            evidence = ["No pipeline failure, rollback marker, artifact mismatch, or abnormal restart loop"]
-
-        return AgentOutput(self.agent_type, claim, confidence, evidence)
+        if lv["restart_loops"] == 2:
+            evidence.append(f"Container restart loops observed: {v['restart_loops']}")
+        elif lv["restart_loops"] == 1:
+            evidence.append(f"Moderate restart loops observed: {v['restart_loops']}")
+
+        return evidence
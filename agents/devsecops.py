@@ -1,59 +1,48 @@
 from __future__ import annotations
 
-from typing import Dict, Any, List
-from .base import BaseAgent, AgentOutput
+from typing import Any, Dict, List, Mapping
+
+from .base import AgentOutput, BaseAgent
+from .telemetry import Telemetry
 
 
 class DevSecOpsAgent(BaseAgent):
     agent_type = "DevSecOps"
-
-    def infer(self, telemetry: Dict[str, Any]) -> AgentOutput:
-        s = telemetry.get("sec", {}) or {}
+    domain = "sec"
+    claims = (
+        "No material security or compliance anomaly detected",
+        "Security signal indicates a possible policy or compliance risk",
+        "Security or compliance issue is the likely primary operational cause",
+        "Security evidence is incomplete",
+    )
+    weights = {
+        "critical_cves": (0.0, 0.30, 0.40),
+        "policy_violation": (0.0, 0.25),
+        "iam_drift": (0.0, 0.20),
+        "compliance_gap": (0.0, 0.20),
+    }
+    primary_at = 0.55
+    missing_evidence = "Security telemetry marked as missing"
+    none_evidence = "No critical CVE, policy violation, IAM drift, or compliance gap"
+
+    def infer(self, telemetry: Mapping[str, Any]) -> AgentOutput:
+        return self._output(Telemetry.parse(telemetry).rules)
+
+    def _findings(self, v: Dict[str, Any], lv: Dict[str, int]) -> List[str]:
         evidence: List[str] = []
 
-        if s.get("_missing"):
-            return AgentOutput(
-                self.agent_type,
-                "Security evidence is incomplete",
-                0.45,
-                ["Security telemetry marked as missing"],
-            )
-
-        cves = int(float(s.get("critical_cves", 0) or 0))
-        policy = bool(s.get("policy_violation", False))
-        iam = bool(s.get("iam_drift", False))
-        compliance_gap = bool(s.get("compliance_gap", False))
-
-        score = 0.0
-
-        if cves >= 2:
-            evidence.append(f"Multiple critical CVEs detected: {cves}")
-            score += 0.40
-        elif cves == 1:
+        if lv["critical_cves"] == 2:
+            evidence.append(f"Multiple critical CVEs detected: {v['critical_cves']}")
+        elif lv["critical_cves"] == 1:
             evidence.append("Critical CVE detected")
-            score += 0.30
 
-        if policy:
+        if v["policy_violation"]:
             evidence.append("Policy-as-code violation detected")
-            score += 0.25
 
-        if iam:
+        if v["iam_drift"]:
             evidence.append("IAM drift detected")
-            score += 0.20
 
-        if compliance_gap:
+        if v["compliance_gap"]:
             evidence.append("Compliance evidence gap detected")
-            score += 0.20
-
-        if score >= 0.55:
-            claim = "Security or compliance issue is the likely primary operational cause"
-            confidence = min(0.92, 0.55 + score)
-        elif score >= 0.30:
-            claim = "Security signal indicates a possible policy or compliance risk"
-            confidence = min(0.78, 0.50 + score)
-        else:
-            claim = "No material security or compliance anomaly detected"
-            confidence = 0.25
-            evidence = ["No critical CVE, policy violation, IAM drift, or compliance gap"]
-
-        return AgentOutput(self.agent_type, claim, confidence, evidence)
+
+        return evidence
@@ -1,62 +1,55 @@
 from __future__ import annotations
 
-from typing import Dict, Any, List
-from .base import BaseAgent, AgentOutput
+from typing import Any, Dict, List, Mapping
+
+from .base import AgentOutput, BaseAgent
+from .telemetry import Telemetry
 
 
 class FinOpsAgent(BaseAgent):
     agent_type = "FinOps"
-
-    def infer(self, telemetry: Dict[str, Any]) -> AgentOutput:
-        f = telemetry.get("finops", {}) or {}
+    domain = "finops"
+    claims = (
+        "No material cost anomaly detected",
+        "Cost signal indicates a possible scaling or provisioning issue",
+        "Cost or resource efficiency issue is the likely primary operational cause",
+        "Cost evidence is incomplete",
+    )
+    # The lowest cost_spike_pct level only feeds utility severity scoring.
+    weights = {
+        "cost_spike_pct": (0.0, 0.0, 0.30, 0.40),
+        "hpa_scale_to": (0.0, 0.15, 0.25),
+        "cpu_request_increase_pct": (0.0, 0.20),
+        "memory_request_increase_pct": (0.0, 0.20),
+    }
+    primary_at = 0.55
+    missing_evidence = "FinOps telemetry marked as missing"
+    none_evidence = "No significant cost spike, scale-out, or resource request increase"
+
+    def infer(self, telemetry: Mapping[str, Any]) -> AgentOutput:
+        return self._output(Telemetry.parse(telemetry).rules)
+
+    def _findings(self, v: Dict[str, Any], lv: Dict[str, int]) -> List[str]:
         evidence: List[str] = []
+        spike = v["cost_spike_pct"]
+        hpa = v["hpa_scale_to"]
+        cpu_inc = v["cpu_request_increase_pct"]
+        mem_inc = v["memory_request_increase_pct"]
 
-        if f.get("_missing"):
-            return AgentOutput(
-                self.agent_type,
-                "Cost evidence is incomplete",
-                0.45,
-                ["FinOps telemetry marked as missing"],
-            )
-
-        spike = float(f.get("cost_spike_pct", 0.0) or 0.0)
-        hpa = int(float(f.get("hpa_scale_to", 0) or 0))
-        cpu_inc = float(f.get("cpu_request_increase_pct", 0.0) or 0.0)
-        mem_inc = float(f.get("memory_request_increase_pct", 0.0) or 0.0)
-
-        score = 0.0
-
-        if spike >= 35:
+        if lv["cost_spike_pct"] == 3:
             evidence.append(f"Severe cost spike detected: {spike:.0f}%")
-            score += 0.40
-        elif spike >= 22:
+        elif lv["cost_spike_pct"] == 2:
             evidence.append(f"Cost spike detected: {spike:.0f}%")
-            score += 0.30
 
-        if hpa >= 14:
+        if lv["hpa_scale_to"] == 2:
             evidence.append(f"Large HPA scale-out observed: {hpa} pods")
-            score += 0.25
-        elif hpa >= 11:
+        elif lv["hpa_scale_to"] == 1:
             evidence.append(f"HPA scale-out observed: {hpa} pods")
-            score += 0.15
 
-        if cpu_inc >= 50:
+        if lv["cpu_request_increase_pct"]:
             evidence.append(f"CPU request increase detected: {cpu_inc:.0f}%")
-            score += 0.20
 
-        if mem_inc >= 40:
+        if lv["memory_request_increase_pct"]:
             evidence.append(f"Memory request increase detected: {mem_inc:.0f}%")
-            score += 0.20
-
-        if score >= 0.55:
-            claim = "Cost or resource efficiency issue is the likely primary operational cause"
-            confidence = min(0.92, 0.55 + score)
-        elif score >= 0.30:
-            claim = "Cost signal indicates a possible scaling or provisioning issue"
-            confidence = min(0.78, 0.50 + score)
-        else:
-            claim = "No material cost anomaly detected"
-            confidence = 0.25
-            evidence = ["No significant cost spike, scale-out, or resource request increase"]
-
-        return AgentOutput(self.agent_type, claim, confidence, evidence)
+
+        return evidence
@@ -0,0 +1,60 @@
+"""Memoization of domain agent outputs across repeated evaluations.
+
+Each domain agent reads only its own telemetry block, so its output is a
+function of that block's fingerprint. During RAR the enriched telemetry
+usually differs from the previous snapshot in a single block; `AgentMemo`
+re-runs only the agents whose block changed.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Tuple
+
+from .base import AgentOutput
+from .registry import AgentRegistry
+from .telemetry import Telemetry
+
+
+class AgentMemo:
+    """
+    Per-run cache of agent outputs keyed on (agent, block fingerprint).
+
+    Cache misses are dispatched through the registry. Outputs of agents that
+    missed their deadline are returned but not cached.
+    """
+
+    def __init__(self, registry: AgentRegistry) -> None:
+        self.registry = registry
+        self.agents = registry.agents()
+        self.hits = 0
+        self.misses = 0
+        self.timeouts = 0
+        self._cache: Dict[Tuple[int, Tuple[Any, ...]], AgentOutput] = {}
+
+    def run(self, telemetry: Mapping[str, Any]) -> List[AgentOutput]:
+        telemetry = Telemetry.parse(telemetry)
+        outputs: List[Any] = []
+        pending: List[int] = []
+        for i, agent in enumerate(self.agents):
+            output = self._cache.get((i, telemetry[agent.domain].fingerprint))
+            if output is None:
+                self.misses += 1
+                pending.append(i)
+            else:
+                self.hits += 1
+            outputs.append(output)
+
+        if pending:
+            fresh, timed_out = self.registry.run_agents(
+                [self.agents[i] for i in pending], telemetry
+            )
+            for i, output, late in zip(pending, fresh, timed_out):
+                outputs[i] = output
+                if late:
+                    self.timeouts += 1
+                else:
+                    self._cache[(i, telemetry[self.agents[i].domain].fingerprint)] = output
+        return outputs
+
+    def counters(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "timeouts": self.timeouts}
@@ -0,0 +1,202 @@
+"""Agent registry and dispatch.
+
+The registry holds the domain agents in evaluation order and runs them on
+one telemetry snapshot. Agents are discovered from the `agents.registry`
+list in `config/config.yaml` ("module:Class" entries); plugins can also
+call `REGISTRY.register(...)` at import time.
+
+With `dispatch: thread` or `dispatch: process` agents run concurrently and
+each gets its own deadline, so a run takes as long as the slowest agent
+rather than the sum of all of them. An agent that misses its deadline is
+replaced by its "evidence incomplete" output, and the pool it hung in is
+abandoned (process workers are terminated) so later runs get fresh
+workers. `serial` (the default) runs agents inline and does not enforce
+deadlines.
+
+`REGISTRY` is built from the default config; `configure()` reloads it in
+place from another config's `agents` section (see `pipeline.configure`).
+"""
+
+from __future__ import annotations
+
+import importlib
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .base import AgentBatchOutput, AgentOutput, BaseAgent, TelemetryFrame
+from .rules import DEFAULT_CONFIG, RULES, load_config
+from .telemetry import Telemetry
+
+
+_DISPATCH_MODES = {"serial", "thread", "process"}
+
+
+def _infer(agent: BaseAgent, telemetry: Telemetry) -> AgentOutput:
+    # Render evidence in the worker so the rule evaluation is not shipped
+    # back across the process boundary.
+    return agent.infer(telemetry).render()
+
+
+class AgentRegistry:
+    def __init__(
+        self,
+        agents: Sequence[BaseAgent] = (),
+        dispatch: str = "serial",
+        max_workers: int = 4,
+        timeout_s: float = 2.0,
+    ) -> None:
+        if dispatch not in _DISPATCH_MODES:
+            raise ValueError(f"Unsupported agent dispatch mode: {dispatch!r}")
+        self.dispatch = dispatch
+        self.max_workers = int(max_workers)
+        self.timeout_s = float(timeout_s)
+        self.timeouts = 0
+        self.pool_resets = 0
+        self._agents: List[BaseAgent] = []
+        self._timeouts: Dict[str, float] = {}
+        self._executor: Optional[Executor] = None
+        for agent in agents:
+            self.register(agent)
+
+    def configure(self, spec: Mapping[str, Any]) -> None:
+        """
+        Reload dispatch settings and agents in place from an `agents` config
+        section. Agents registered outside the config are dropped.
+        """
+        dispatch = str(spec.get("dispatch", "serial"))
+        if dispatch not in _DISPATCH_MODES:
+            raise ValueError(f"Unsupported agent dispatch mode: {dispatch!r}")
+        agents = [_load_agent(entry) for entry in spec.get("registry", []) or []]
+
+        self.close()
+        self.dispatch = dispatch
+        self.max_workers = int(spec.get("max_workers", 4))
+        self.timeout_s = float(spec.get("timeout_s", 2.0))
+        self._agents = []
+        self._timeouts = {}
+        for agent in agents:
+            self.register(agent)
+
+    def register(self, agent: BaseAgent, timeout_s: Optional[float] = None) -> BaseAgent:
+        if any(a.agent_type == agent.agent_type for a in self._agents):
+            raise ValueError(f"Agent already registered: {agent.agent_type}")
+        self._agents.append(agent)
+        if timeout_s is not None:
+            self._timeouts[agent.agent_type] = float(timeout_s)
+        return agent
+
+    def agents(self) -> List[BaseAgent]:
+        return list(self._agents)
+
+    def __iter__(self):
+        return iter(self._agents)
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def timeout_for(self, agent: BaseAgent) -> float:
+        return self._timeouts.get(agent.agent_type, self.timeout_s)
+
+    def run(self, telemetry: Mapping[str, Any]) -> List[AgentOutput]:
+        outputs, _ = self.run_agents(self._agents, telemetry)
+        return outputs
+
+    def run_batch(self, frame: TelemetryFrame) -> List[AgentBatchOutput]:
+        """
+        Batch inference of every agent over a columnar frame. The rule table
+        is evaluated once and the result shared by all agents.
+        """
+        rules = RULES.evaluate_frame(frame)
+        return [agent.infer_batch(frame, rules) for agent in self._agents]
+
+    def run_agents(
+        self,
+        agents: Sequence[BaseAgent],
+        telemetry: Mapping[str, Any],
+    ) -> Tuple[List[AgentOutput], List[bool]]:
+        """
+        Run `agents` on one snapshot.
+
+        Returns the outputs in agent order and, per agent, whether it missed
+        its deadline and was degraded to an "evidence incomplete" output.
+        """
+        telemetry = Telemetry.parse(telemetry)
+        if self.dispatch == "serial" or not agents:
+            return [agent.infer(telemetry) for agent in agents], [False] * len(agents)
+
+        executor = self._pool()
+        started = time.perf_counter()
+        futures = [executor.submit(_infer, agent, telemetry) for agent in agents]
+
+        outputs: List[AgentOutput] = []
+        timed_out: List[bool] = []
+        for agent, future in zip(agents, futures):
+            remaining = self.timeout_for(agent) - (time.perf_counter() - started)
+            try:
+                outputs.append(future.result(timeout=max(0.0, remaining)))
+                timed_out.append(False)
+            except FutureTimeoutError:
+                future.cancel()
+                self.timeouts += 1
+                outputs.append(
+                    agent.incomplete(
+                        f"{agent.agent_type} agent missed its {self.timeout_for(agent):g}s deadline"
+                    )
+                )
+                timed_out.append(True)
+
+        if any(timed_out):
+            # The late workers still hold their slots; start over with a
+            # fresh pool instead of queueing behind them.
+            self._abandon(executor)
+        return outputs, timed_out
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _abandon(self, executor: Executor) -> None:
+        if self._executor is executor:
+            self._executor = None
+        self.pool_resets += 1
+        # ProcessPoolExecutor has no public way to stop a busy worker.
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            if self.dispatch == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="aaf-agent"
+                )
+        return self._executor
+
+
+def _load_agent(spec: str) -> BaseAgent:
+    module_name, sep, class_name = str(spec).partition(":")
+    if not sep:
+        raise ValueError(f"Agent entry must be 'module:Class', got {spec!r}")
+    cls = getattr(importlib.import_module(module_name), class_name)
+    if not (isinstance(cls, type) and issubclass(cls, BaseAgent)):
+        raise TypeError(f"Agent entry {spec!r} is not a BaseAgent subclass")
+    return cls()
+
+
+def load_registry(path: Path | str = DEFAULT_CONFIG) -> AgentRegistry:
+    cfg = load_config(path)
+    if "agents" not in cfg:
+        raise KeyError(f"No 'agents' section in {path}")
+    registry = AgentRegistry()
+    registry.configure(cfg["agents"] or {})
+    return registry
+
+
+REGISTRY = load_registry()
@@ -0,0 +1,226 @@
+"""Declarative telemetry threshold rules shared by agents, utility and RAR.
+
+Every threshold used to interpret telemetry lives in the `rules` section of
+`config/config.yaml`. Each rule declares the type and default of one telemetry
+field (used by `agents.telemetry.Telemetry.parse`) and maps its value to a
+small integer level: the number of configured thresholds it crosses.
+Booleans map to 0/1.
+
+Consumers attach their own meaning to levels (agent score weights, utility
+severities, RAR context flags), so thresholds are defined exactly once and
+the table is evaluated once per telemetry snapshot.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+import numpy as np
+import yaml
+
+from .base import TelemetryFrame, frame_column, frame_flag, frame_size
+
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CONFIG = ROOT / "config" / "config.yaml"
+
+DOMAIN_KEYS = ["deploy", "sre", "finops", "sec"]
+
+_OPS = {">=", "<"}
+_TYPES = {"bool", "int", "float"}
+
+
+class Rule:
+    __slots__ = ("domain", "field", "kind", "default", "op", "thresholds")
+
+    def __init__(
+        self,
+        domain: str,
+        field: str,
+        kind: str,
+        default: Any,
+        op: str,
+        thresholds: Tuple[float, ...],
+    ) -> None:
+        self.domain = domain
+        self.field = field
+        self.kind = kind
+        self.default = default
+        self.op = op
+        self.thresholds = tuple(sorted(thresholds))
+
+    def coerce(self, raw: Any) -> Any:
+        """Typed value of one raw field: the `float(x or default)` coercion
+        the agents used to apply inline, truncated for int rules."""
+        if self.kind == "bool":
+            return bool(raw)
+        value = float(raw or self.default)
+        return int(value) if self.kind == "int" else value
+
+    def level_array(self, values: np.ndarray) -> np.ndarray:
+        if self.kind == "bool":
+            return values.astype(np.int8)
+        level = np.zeros(values.shape[0], dtype=np.int8)
+        for t in self.thresholds:
+            level += (values >= t) if self.op == ">=" else (values < t)
+        return level
+
+
+class RuleResult:
+    """
+    One evaluation of the rule table.
+
+    `values` holds the coerced field values, `levels` the rule level per
+    field and `missing` whether each domain block is marked as missing.
+    Entries are scalars for `RuleTable.result` and NumPy arrays for
+    `RuleTable.evaluate_frame`.
+    """
+
+    __slots__ = ("values", "levels", "missing")
+
+    def __init__(
+        self,
+        values: Dict[str, Any],
+        levels: Dict[str, Any],
+        missing: Dict[str, Any],
+    ) -> None:
+        self.values = values
+        self.levels = levels
+        self.missing = missing
+
+
+class RuleTable:
+    def __init__(self, spec: Dict[str, Dict[str, Dict[str, Any]]]) -> None:
+        # Bumped by every configure(), so consumers can rebuild tables
+        # derived from the rules.
+        self.version = 0
+        self.configure(spec)
+
+    def configure(self, spec: Dict[str, Dict[str, Dict[str, Any]]]) -> None:
+        """(Re)build the table in place from a `rules` config section."""
+        self.rules: List[Rule] = []
+        for domain, fields in (spec or {}).items():
+            if domain not in DOMAIN_KEYS:
+                raise ValueError(f"Unknown telemetry domain in rules: {domain}")
+            for field, cfg in (fields or {}).items():
+                self.rules.append(_compile_rule(domain, field, cfg or {}))
+        self.by_field: Dict[str, Rule] = {r.field: r for r in self.rules}
+
+        self.domain_fields: Dict[str, Tuple[str, ...]] = {
+            domain: tuple(r.field for r in self.rules if r.domain == domain)
+            for domain in DOMAIN_KEYS
+        }
+
+        self._domain_rules: Dict[str, Tuple[Rule, ...]] = {
+            domain: tuple(r for r in self.rules if r.domain == domain)
+            for domain in DOMAIN_KEYS
+        }
+        # Flat per-rule specs for the parse loop:
+        # (field, default, kind, thresholds, op is ">=").
+        self._specs: Dict[str, Tuple[Tuple[str, Any, str, Tuple[float, ...], bool], ...]] = {
+            domain: tuple(
+                (r.field, r.default, r.kind, r.thresholds, r.op == ">=") for r in rules
+            )
+            for domain, rules in self._domain_rules.items()
+        }
+        self.version += 1
+
+    def parse_block(
+        self,
+        domain: str,
+        block: Mapping,
+        values: Dict[str, Any],
+        levels: Dict[str, int],
+    ) -> Dict[str, Any]:
+        """
+        Coerce the rule fields of one domain block and compute their levels.
+
+        Returns a copy of `block` with typed rule fields (defaults fill absent
+        ones) and records each value and level into `values` and `levels`.
+        """
+        get = block.get
+        fields = dict(block)
+        try:
+            for key, default, kind, thresholds, ge in self._specs[domain]:
+                if kind == "bool":
+                    value = bool(get(key, False))
+                    level = 1 if value else 0
+                else:
+                    value = float(get(key, default) or default)
+                    if kind == "int":
+                        value = int(value)
+                    # NaN compares false and so crosses no threshold.
+                    level = 0
+                    for t in thresholds:
+                        if (value >= t) if ge else (value < t):
+                            level += 1
+                fields[key] = values[key] = value
+                levels[key] = level
+            return fields
+        except (TypeError, ValueError, OverflowError):
+            pass
+
+        # Find the offending field for the error message.
+        for rule in self._domain_rules[domain]:
+            raw = block.get(rule.field, rule.default)
+            try:
+                rule.coerce(raw)
+            except (TypeError, ValueError, OverflowError) as exc:
+                raise ValueError(f"Invalid telemetry value {domain}.{rule.field}={raw!r}") from exc
+        raise ValueError(f"Invalid telemetry block {domain!r}")
+
+    def evaluate_frame(self, frame: TelemetryFrame) -> RuleResult:
+        n = frame_size(frame)
+        values: Dict[str, np.ndarray] = {}
+        levels: Dict[str, np.ndarray] = {}
+        missing = {domain: frame_flag(frame, domain, "_missing", n) for domain in DOMAIN_KEYS}
+
+        for rule in self.rules:
+            if rule.kind == "bool":
+                value = frame_flag(frame, rule.domain, rule.field, n)
+            else:
+                value = frame_column(
+                    frame, rule.domain, rule.field, rule.default, n,
+                    integer=rule.kind == "int",
+                )
+            values[rule.field] = value
+            levels[rule.field] = rule.level_array(value)
+
+        return RuleResult(values, levels, missing)
+
+
+def _compile_rule(domain: str, field: str, cfg: Dict[str, Any]) -> Rule:
+    kind = str(cfg.get("type", "float"))
+    if kind not in _TYPES:
+        raise ValueError(f"Rule {domain}.{field}: unsupported type {kind!r}")
+
+    op = str(cfg.get("op", ">="))
+    if op not in _OPS:
+        raise ValueError(f"Rule {domain}.{field}: unsupported op {op!r}")
+
+    thresholds = tuple(float(t) for t in cfg.get("thresholds", []) or [])
+    if kind != "bool" and not thresholds:
+        raise ValueError(f"Rule {domain}.{field}: numeric rules need thresholds")
+
+    cast: Callable[[Any], Any] = bool if kind == "bool" else int if kind == "int" else float
+    default = cast(cfg.get("default", 0))
+
+    return Rule(domain, field, kind, default, op, thresholds)
+
+
+def load_config(path: Path | str = DEFAULT_CONFIG) -> Dict[str, Any]:
+    config_path = Path(path)
+    if not config_path.exists():
+        raise FileNotFoundError(f"Config file not found: {config_path}")
+    return yaml.safe_load(config_path.read_text(encoding="utf-8")) or {}
+
+
+def load_rule_table(path: Path | str = DEFAULT_CONFIG) -> RuleTable:
+    cfg = load_config(path)
+    if "rules" not in cfg:
+        raise KeyError(f"No 'rules' section in {path}")
+    return RuleTable(cfg["rules"])
+
+
+RULES = load_rule_table()
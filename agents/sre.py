@@ -1,65 +1,56 @@
 from __future__ import annotations
 
-from typing import Dict, Any, List
-from .base import BaseAgent, AgentOutput
+from typing import Any, Dict, List, Mapping
+
+from .base import AgentOutput, BaseAgent
+from .telemetry import Telemetry
 
 
 class SREAgent(BaseAgent):
     agent_type = "SRE"
-
-    def infer(self, telemetry: Dict[str, Any]) -> AgentOutput:
-        s = telemetry.get("sre", {}) or {}
+    domain = "sre"
+    claims = (
+        "No material reliability anomaly detected",
+        "Reliability signal indicates a possible service health issue",
+        "Reliability degradation is the likely primary operational cause",
+        "Reliability evidence is incomplete",
+    )
+    weights = {
+        "p95_latency_ms": (0.0, 0.25, 0.35),
+        "error_rate_pct": (0.0, 0.25, 0.35),
+        "saturation_pct": (0.0, 0.15, 0.25),
+        "availability_pct": (0.0, 0.25),
+    }
+    primary_at = 0.60
+    missing_evidence = "SRE telemetry marked as missing"
+    none_evidence = "Latency, error rate, saturation, and availability are within expected range"
+
+    def infer(self, telemetry: Mapping[str, Any]) -> AgentOutput:
+        return self._output(Telemetry.parse(telemetry).rules)
+
+    def _findings(self, v: Dict[str, Any], lv: Dict[str, int]) -> List[str]:
         evidence: List[str] = []
+        p95 = v["p95_latency_ms"]
+        err = v["error_rate_pct"]
+        sat = v["saturation_pct"]
+        availability = v["availability_pct"]
 
-        if s.get("_missing"):
-            return AgentOutput(
-                self.agent_type,
-                "Reliability evidence is incomplete",
-                0.45,
-                ["SRE telemetry marked as missing"],
-            )
-
-        p95 = float(s.get("p95_latency_ms", 0.0) or 0.0)
-        err = float(s.get("error_rate_pct", 0.0) or 0.0)
-        sat = float(s.get("saturation_pct", 0.0) or 0.0)
-        availability = float(s.get("availability_pct", 99.9) or 99.9)
-
-        score = 0.0
-
-        if p95 >= 800:
+        if lv["p95_latency_ms"] == 2:
             evidence.append(f"Severe P95 latency elevation: {p95:.0f} ms")
-            score += 0.35
-        elif p95 >= 450:
+        elif lv["p95_latency_ms"] == 1:
             evidence.append(f"P95 latency elevated: {p95:.0f} ms")
-            score += 0.25
 
-        if err >= 12:
+        if lv["error_rate_pct"] == 2:
             evidence.append(f"Severe error rate elevation: {err:.1f}%")
-            score += 0.35
-        elif err >= 8:
+        elif lv["error_rate_pct"] == 1:
             evidence.append(f"Error rate elevated: {err:.1f}%")
-            score += 0.25
 
-        if sat >= 90:
+        if lv["saturation_pct"] == 2:
             evidence.append(f"Severe saturation level: {sat:.0f}%")
-            score += 0.25
-        elif sat >= 85:
+        elif lv["saturation_pct"] == 1:
             evidence.append(f"Saturation elevated: {sat:.0f}%")
-            score += 0.15
 
-        if availability < 99.0:
+        if lv["availability_pct"]:
             evidence.append(f"Availability dropped to {availability:.2f}%")
-            score += 0.25
-
-        if score >= 0.60:
-            claim = "Reliability degradation is the likely primary operational cause"
-            confidence = min(0.92, 0.55 + score)
-        elif score >= 0.30:
-            claim = "Reliability signal indicates a possible service health issue"
-            confidence = min(0.78, 0.50 + score)
-        else:
-            claim = "No material reliability anomaly detected"
-            confidence = 0.25
-            evidence = ["Latency, error rate, saturation, and availability are within expected range"]
 
-        return AgentOutput(self.agent_type, claim, confidence, evidence)
+        return evidence
@@ -0,0 +1,261 @@
+"""Typed telemetry snapshot parsed once at the T-IN stage.
+
+`Telemetry.parse` coerces every rule field of the four domain blocks
+(`deploy`, `sre`, `finops`, `sec`) exactly once, using the types and
+defaults declared in the shared rule table, and evaluates the rule levels in
+the same pass. Agents, utility scoring and RAR then read typed values and
+levels directly from the snapshot.
+
+Both classes read like the nested dicts they replace (`get`, `[]`,
+iteration over the keys the source carried), but reads return the typed
+values: `availability_pct: 0` reads as its default 99.9 and ints in float
+fields read as floats. `to_dict()` returns the source telemetry, with its
+original values and top-level keys such as `service`, for serialization.
+Snapshots are treated as immutable: build a new one instead of mutating,
+or use `Telemetry.overlay` to write a few fields over an existing snapshot.
+"""
+
+from __future__ import annotations
+
+from collections import ChainMap
+from collections.abc import Mapping
+from typing import Any, Dict, FrozenSet, Iterator, Optional, Tuple
+
+from .rules import DOMAIN_KEYS, RULES, RuleResult, RuleTable
+
+
+# Blocks with the same key set share one frozenset.
+_KEYSETS: Dict[FrozenSet[str], FrozenSet[str]] = {}
+
+
+class TelemetryBlock(Mapping):
+    """
+    One parsed domain block.
+
+    `fields` holds a typed value for every rule field of the domain
+    (defaults fill absent ones) plus any extra keys from the source block.
+    `present` records which keys the source block actually carried, so
+    dict-style reads see the same keys as the original dict. `raw` is the
+    source block as given, or None when the telemetry had no such block.
+    """
+
+    __slots__ = ("domain", "missing", "fields", "present", "rule_fields", "raw", "_fingerprint")
+
+    def __init__(
+        self,
+        domain: str,
+        missing: bool,
+        fields: Dict[str, Any],
+        present: FrozenSet[str],
+        rule_fields: Tuple[str, ...] = (),
+        raw: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.domain = domain
+        self.missing = missing
+        self.fields = fields
+        self.present = present
+        self.rule_fields = rule_fields
+        self.raw = raw
+        self._fingerprint: Optional[Tuple[Any, ...]] = None
+
+    @property
+    def fingerprint(self) -> Tuple[Any, ...]:
+        """
+        Hashable key over everything a domain agent reads from this block:
+        the missing marker and the typed rule field values.
+        """
+        if self._fingerprint is None:
+            fields = self.fields
+            self._fingerprint = (self.missing,) + tuple(fields[f] for f in self.rule_fields)
+        return self._fingerprint
+
+    def __getattr__(self, name: str) -> Any:
+        if name in TelemetryBlock.__slots__:
+            raise AttributeError(name)
+        try:
+            return self.fields[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.present:
+            raise KeyError(key)
+        return self.fields[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.present
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.present)
+
+    def __len__(self) -> int:
+        return len(self.present)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.present:
+            return self.fields[key]
+        return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The source block with its original values."""
+        return dict(self.raw or {})
+
+
+class Telemetry(Mapping):
+    """
+    Parsed telemetry snapshot keyed by domain, with its rule evaluation.
+
+    `extra` keeps the source's top-level keys other than the domain blocks.
+    """
+
+    __slots__ = ("deploy", "sre", "finops", "sec", "rules", "extra")
+
+    def __init__(
+        self,
+        deploy: TelemetryBlock,
+        sre: TelemetryBlock,
+        finops: TelemetryBlock,
+        sec: TelemetryBlock,
+        rules: RuleResult,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.deploy = deploy
+        self.sre = sre
+        self.finops = finops
+        self.sec = sec
+        self.rules = rules
+        self.extra = extra or {}
+
+    @classmethod
+    def parse(cls, telemetry: Optional[Mapping], table: RuleTable = RULES) -> "Telemetry":
+        """
+        Parse and validate a telemetry dict. Already parsed snapshots are
+        returned unchanged, so callers can parse defensively at no cost.
+        """
+        # Exact type checks: isinstance() against the Mapping ABC is slow on
+        # this hot path.
+        if type(telemetry) is Telemetry:
+            return telemetry
+        telemetry = telemetry or {}
+        if type(telemetry) is not dict and not isinstance(telemetry, Mapping):
+            raise ValueError(f"Telemetry must be a mapping, got {type(telemetry).__name__}")
+
+        values: Dict[str, Any] = {}
+        levels: Dict[str, int] = {}
+        missing: Dict[str, bool] = {}
+        blocks = []
+
+        for domain in DOMAIN_KEYS:
+            block = telemetry.get(domain) or {}
+            if type(block) is not dict and not isinstance(block, Mapping):
+                raise ValueError(
+                    f"Telemetry block {domain!r} must be a mapping, got {type(block).__name__}"
+                )
+
+            fields = table.parse_block(domain, block, values, levels)
+            is_missing = bool(block.get("_missing"))
+            if "_missing" in block:
+                fields["_missing"] = is_missing
+            missing[domain] = is_missing
+
+            present = frozenset(block)
+            present = _KEYSETS.setdefault(present, present)
+            raw = dict(block) if domain in telemetry else None
+            blocks.append(
+                TelemetryBlock(domain, is_missing, fields, present, table.domain_fields[domain], raw)
+            )
+
+        extra = {key: value for key, value in telemetry.items() if key not in DOMAIN_KEYS}
+        return cls(*blocks, rules=RuleResult(values, levels, missing), extra=extra)
+
+    def overlay(
+        self,
+        changes: Mapping[str, Mapping[str, Any]],
+        table: RuleTable = RULES,
+    ) -> "Telemetry":
+        """
+        New snapshot with `changes[domain]` written over those blocks.
+
+        Only the changed blocks are re-parsed, from a ChainMap of the changes
+        over the current block; every other block (with its fingerprint) and
+        its rule values are shared with this snapshot instead of copied.
+        """
+        if not changes:
+            return self
+        values = dict(self.rules.values)
+        levels = dict(self.rules.levels)
+        missing = dict(self.rules.missing)
+        blocks = []
+
+        for block in self.blocks():
+            domain = block.domain
+            update = changes.get(domain)
+            if not update:
+                blocks.append(block)
+                continue
+
+            source = ChainMap(dict(update), block)
+            fields = table.parse_block(domain, source, values, levels)
+            is_missing = bool(source.get("_missing"))
+            if "_missing" in source:
+                fields["_missing"] = is_missing
+            missing[domain] = is_missing
+
+            present = frozenset(source)
+            present = _KEYSETS.setdefault(present, present)
+            raw = {**(block.raw or {}), **update}
+            blocks.append(
+                TelemetryBlock(domain, is_missing, fields, present, table.domain_fields[domain], raw)
+            )
+
+        return Telemetry(*blocks, rules=RuleResult(values, levels, missing), extra=self.extra)
+
+    def with_blocks(self, sources: Mapping[str, "Telemetry"]) -> "Telemetry":
+        """
+        New snapshot whose `domain` blocks, with their rule values, are taken
+        from `sources[domain]`; the other blocks are shared with this one.
+        """
+        if not sources:
+            return self
+        values = dict(self.rules.values)
+        levels = dict(self.rules.levels)
+        missing = dict(self.rules.missing)
+        blocks = {block.domain: block for block in self.blocks()}
+
+        for domain, source in sources.items():
+            block = blocks[domain] = source[domain]
+            for key in block.rule_fields:
+                values[key] = source.rules.values[key]
+                levels[key] = source.rules.levels[key]
+            missing[domain] = source.rules.missing[domain]
+
+        return Telemetry(
+            *(blocks[d] for d in DOMAIN_KEYS),
+            rules=RuleResult(values, levels, missing),
+            extra=self.extra,
+        )
+
+    def blocks(self) -> Tuple[TelemetryBlock, ...]:
+        return (self.deploy, self.sre, self.finops, self.sec)
+
+    def __getitem__(self, domain: str) -> TelemetryBlock:
+        if domain not in DOMAIN_KEYS:
+            raise KeyError(domain)
+        return getattr(self, domain)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(DOMAIN_KEYS)
+
+    def __len__(self) -> int:
+        return len(DOMAIN_KEYS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Plain telemetry dict: the source values of every block the source
+        carried (or that was written since) and its other top-level keys.
+        """
+        result: Dict[str, Any] = {
+            block.domain: block.to_dict() for block in self.blocks() if block.raw is not None
+        }
+        result.update(self.extra)
+        return result
@@ -0,0 +1,37 @@
+def random_telemetry(rng):
+    """Fuzzed telemetry: rule boundaries, missing and absent blocks, odd types."""
+    t = {
+        "deploy": {
+            "restart_loops": rng.choice([0, 3, 6, 8, 12, 15, "13"]),
+            "config_drift": rng.random() < 0.3,
+            "pipeline_failed": rng.random() < 0.3,
+            "rollback_marker": rng.random() < 0.2,
+            "artifact_mismatch": rng.random() < 0.2,
+        },
+        "sre": {
+            "p95_latency_ms": rng.choice([None, 100, 450, 500, 800, 900.5]),
+            "error_rate_pct": rng.choice([0.5, 8, 9, 12, 13]),
+            "saturation_pct": rng.choice([50, 85, 88, 90, 95]),
+            "availability_pct": rng.choice([0, 99.9, 99.0, 98.5]),
+        },
+        "finops": {
+            "cost_spike_pct": rng.choice([0, 8, 22, 30, 35, 40]),
+            "hpa_scale_to": rng.choice([4, 11, 12, 14, 16]),
+            "cpu_request_increase_pct": rng.choice([0, 50, 60]),
+            "memory_request_increase_pct": rng.choice([0, 40, 45]),
+        },
+        "sec": {
+            "critical_cves": rng.choice([0, 0, 1, 2, 3]),
+            "policy_violation": rng.random() < 0.3,
+            "iam_drift": rng.random() < 0.2,
+            "compliance_gap": rng.random() < 0.2,
+        },
+    }
+    for domain in list(t):
+        if rng.random() < 0.25:
+            t[domain]["_missing"] = True
+        if rng.random() < 0.1:
+            t[domain] = {"_missing": True}
+        elif rng.random() < 0.05:
+            del t[domain]
+    return t
@@ -0,0 +1,54 @@
+import random
+
+import numpy as np
+import pytest
+
+from agents import DevOpsAgent, DevSecOpsAgent, FinOpsAgent, REGISTRY, SREAgent, Telemetry
+from agents.base import frame_from_records
+from agents.rules import RULES
+from agents.tests import random_telemetry
+
+AGENTS = [DevOpsAgent, SREAgent, FinOpsAgent, DevSecOpsAgent]
+
+
+@pytest.fixture(scope="module")
+def records():
+    rng = random.Random(5)
+    return [random_telemetry(rng) for _ in range(1000)] + [{}]
+
+
+def test_rule_frame_matches_scalar_rules(records):
+    batch = RULES.evaluate_frame(frame_from_records(records))
+    for i, record in enumerate(records):
+        scalar = Telemetry.parse(record).rules
+        for field, level in scalar.levels.items():
+            assert batch.levels[field][i] == level, (i, field)
+            assert batch.values[field][i] == scalar.values[field], (i, field)
+        for domain, missing in scalar.missing.items():
+            assert bool(batch.missing[domain][i]) == missing, (i, domain)
+
+
+@pytest.mark.parametrize("agent_cls", AGENTS)
+def test_infer_batch_matches_infer(records, agent_cls):
+    agent = agent_cls()
+    batch = agent.infer_batch(frame_from_records(records))
+    for i, record in enumerate(records):
+        output = agent.infer(record)
+        assert batch.claims()[i] == output.claim, i
+        assert float(batch.confidences[i]) == output.confidence, i
+    assert batch.evidence(3) == agent.infer(records[3]).evidence
+
+
+def test_run_batch_matches_per_agent_batches(records):
+    frame = frame_from_records(records)
+    for shared, agent in zip(REGISTRY.run_batch(frame), REGISTRY):
+        alone = agent.infer_batch(frame)
+        assert np.array_equal(shared.codes, alone.codes)
+        assert np.array_equal(shared.confidences, alone.confidences)
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf")])
+def test_infer_batch_rejects_non_finite_integers(value):
+    frame = {"deploy": {"restart_loops": np.array([3.0, value])}}
+    with pytest.raises(ValueError, match="deploy.restart_loops"):
+        DevOpsAgent().infer_batch(frame)
@@ -0,0 +1,63 @@
+import random
+import threading
+
+import pytest
+
+from agents import AgentRegistry, DevOpsAgent, DevSecOpsAgent, FinOpsAgent, SREAgent
+from agents.tests import random_telemetry
+
+
+class _HungSREAgent(SREAgent):
+    agent_type = "HungSRE"
+    release = threading.Event()
+
+    def infer(self, telemetry):
+        self.release.wait(10.0)
+        return super().infer(telemetry)
+
+
+def _agents():
+    return [DevOpsAgent(), SREAgent(), FinOpsAgent(), DevSecOpsAgent()]
+
+
+def _run(registry, records):
+    return [
+        [(o.agent_type, o.claim, o.confidence, o.evidence) for o in registry.run(r)]
+        for r in records
+    ]
+
+
+@pytest.mark.parametrize("dispatch", ["thread", "process"])
+def test_concurrent_dispatch_matches_serial(dispatch):
+    rng = random.Random(11)
+    records = [random_telemetry(rng) for _ in range(40)]
+    serial = _run(AgentRegistry(_agents()), records)
+
+    registry = AgentRegistry(_agents(), dispatch=dispatch, max_workers=2, timeout_s=30.0)
+    try:
+        assert _run(registry, records) == serial
+        assert registry.timeouts == 0
+    finally:
+        registry.close()
+
+
+def test_hung_agent_degrades_and_replaces_the_pool():
+    registry = AgentRegistry([DevOpsAgent()], dispatch="thread", max_workers=2, timeout_s=5.0)
+    registry.register(_HungSREAgent(), timeout_s=0.05)
+    try:
+        outputs, timed_out = registry.run_agents(registry.agents(), {})
+        assert timed_out == [False, True]
+        assert "deadline" in outputs[1].evidence[0]
+        assert registry.pool_resets == 1
+
+        _HungSREAgent.release.set()
+        outputs, timed_out = registry.run_agents(registry.agents(), {})
+        assert timed_out == [False, False]
+    finally:
+        _HungSREAgent.release.set()
+        registry.close()
+
+
+def test_configure_rejects_unknown_dispatch():
+    with pytest.raises(ValueError, match="dispatch"):
+        AgentRegistry().configure({"dispatch": "fibers"})
@@ -0,0 +1,20 @@
+import random
+
+from agents import Telemetry
+from agents.tests import random_telemetry
+
+
+def test_to_dict_returns_the_source_telemetry():
+    rng = random.Random(3)
+    for _ in range(200):
+        record = {**random_telemetry(rng), "service": "checkout"}
+        assert Telemetry.parse(record).to_dict() == record
+
+
+def test_reparse_keeps_rule_results():
+    rng = random.Random(4)
+    for _ in range(200):
+        parsed = Telemetry.parse(random_telemetry(rng))
+        again = Telemetry.parse(parsed.to_dict())
+        assert again.rules.levels == parsed.rules.levels
+        assert again.rules.missing == parsed.rules.missing
@@ -0,0 +1,15 @@
+"""Streaming ingestion of raw operational metrics into telemetry blocks."""
+
+from .aggregator import TelemetryAggregator
+from .cost import CostScores, score_costs
+from .sketch import DDSketch, RequestSketch
+from .windows import RollingWindow
+
+__all__ = [
+    "CostScores",
+    "DDSketch",
+    "RequestSketch",
+    "RollingWindow",
+    "TelemetryAggregator",
+    "score_costs",
+]
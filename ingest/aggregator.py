@@ -0,0 +1,148 @@
+"""Build `sre` and `finops` telemetry blocks from raw metric samples.
+
+`TelemetryAggregator` keeps rolling windows per service and emits, on
+demand, the telemetry dict that `run_pipeline` expects:
+
+    agg = TelemetryAggregator(window_s=300, step_s=30)
+    agg.observe_request("checkout", t, latency_ms=212.0, error=False)
+    agg.observe_saturation("checkout", t, 71.5)
+    agg.observe_spend("checkout", t, 4.20)
+    telemetry = agg.telemetry("checkout", base=deploy_and_sec_blocks)
+
+Time is stream time (the sample timestamps), so replays are deterministic.
+A block with no samples in its window is emitted as `{"_missing": True}`.
+Request latencies go into per-pane `RequestSketch`es, so memory per service
+is bounded however many requests arrive, and p95/p99, error rate and
+availability come from the same sketch.
+"""
+
+from __future__ import annotations
+
+import copy
+from functools import partial
+from typing import Any, Dict, List, Mapping, Optional
+
+from .sketch import RequestSketch
+from .windows import RollingWindow
+
+
+class _ServiceWindows:
+    __slots__ = ("requests", "saturation", "spend", "spend_baseline", "first_spend_t")
+
+    def __init__(self, agg: "TelemetryAggregator") -> None:
+        self.requests = RollingWindow(
+            agg.window_s,
+            agg.step_s,
+            summary=partial(RequestSketch, agg.relative_accuracy),
+        )
+        self.saturation = RollingWindow(agg.window_s, agg.step_s)
+        self.spend = RollingWindow(agg.cost_window_s, agg.cost_step_s)
+        self.spend_baseline = RollingWindow(agg.cost_baseline_s, agg.cost_window_s)
+        self.first_spend_t: Optional[float] = None
+
+
+class TelemetryAggregator:
+    """
+    Per-service streaming aggregation into telemetry blocks.
+
+    SRE signals use a `window_s` window (tumbling, or sliding when `step_s`
+    is given). Spend is summed over a `cost_window_s` window sliding in
+    `cost_step_s` steps, so the reading does not depend on where `now` falls
+    within an hour, and compared with the average spend per `cost_window_s`
+    over the rest of the trailing `cost_baseline_s` to give
+    `cost_spike_pct`.
+    """
+
+    def __init__(
+        self,
+        window_s: float = 300.0,
+        step_s: Optional[float] = None,
+        cost_window_s: float = 3600.0,
+        cost_baseline_s: float = 7 * 86400.0,
+        relative_accuracy: float = 0.01,
+        cost_step_s: float = 60.0,
+    ) -> None:
+        self.window_s = float(window_s)
+        self.step_s = step_s
+        self.cost_window_s = float(cost_window_s)
+        self.cost_step_s = float(cost_step_s)
+        self.cost_baseline_s = float(cost_baseline_s)
+        self.relative_accuracy = float(relative_accuracy)
+        self._services: Dict[str, _ServiceWindows] = {}
+
+    def _windows(self, service: str) -> _ServiceWindows:
+        windows = self._services.get(service)
+        if windows is None:
+            windows = self._services[service] = _ServiceWindows(self)
+        return windows
+
+    def services(self) -> List[str]:
+        return list(self._services)
+
+    def observe_request(
+        self,
+        service: str,
+        t: float,
+        latency_ms: float,
+        error: bool = False,
+        available: bool = True,
+    ) -> None:
+        self._windows(service).requests.add(t, latency_ms, error, available)
+
+    def observe_saturation(self, service: str, t: float, pct: float) -> None:
+        self._windows(service).saturation.add(t, pct)
+
+    def observe_spend(self, service: str, t: float, amount: float) -> None:
+        w = self._windows(service)
+        w.spend.add(t, amount)
+        w.spend_baseline.add(t, amount)
+        if w.first_spend_t is None or t < w.first_spend_t:
+            w.first_spend_t = t
+
+    def sre_block(self, service: str, now: Optional[float] = None) -> Dict[str, Any]:
+        w = self._windows(service)
+        block: Dict[str, Any] = w.requests.summary(now).sre_fields()
+        if not block:
+            return {"_missing": True}
+
+        saturation = w.saturation.mean(now)
+        if saturation is not None:
+            block["saturation_pct"] = saturation
+        return block
+
+    def finops_block(self, service: str, now: Optional[float] = None) -> Dict[str, Any]:
+        w = self._windows(service)
+        if now is None:
+            now = w.spend.latest_t
+        if w.first_spend_t is None or not w.spend.count(now):
+            return {"_missing": True}
+
+        # Average spend per cost window over the observed part of the
+        # baseline before the current (sliding) window.
+        current = w.spend.sum(now)
+        observed_from = max(w.spend_baseline.start(now), w.first_spend_t)
+        windows = (w.spend.start(now) - observed_from) / self.cost_window_s
+        if windows < 1.0:
+            return {"cost_spike_pct": 0.0}
+        baseline = (w.spend_baseline.sum(now) - current) / windows
+        spike = 100.0 * (current / baseline - 1.0) if baseline > 0 else 0.0
+        return {"cost_spike_pct": max(0.0, spike)}
+
+    def telemetry(
+        self,
+        service: str,
+        now: Optional[float] = None,
+        base: Optional[Mapping[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Telemetry dict for `service`. Blocks from `base` (typically the
+        `deploy` and `sec` blocks) are copied and the aggregated fields are
+        written over their `sre` and `finops` blocks.
+        """
+        telemetry: Dict[str, Any] = copy.deepcopy(dict(base or {}))
+        for domain, block in (("sre", self.sre_block(service, now)), ("finops", self.finops_block(service, now))):
+            if block.get("_missing"):
+                telemetry[domain] = block
+            else:
+                telemetry[domain] = {**(telemetry.get(domain) or {}), **block}
+        return telemetry
@@ -0,0 +1,127 @@
+"""Vectorized cost-anomaly scoring for the `finops` block.
+
+`score_costs` takes spend series for a whole fleet as an (S services x T
+periods) array and scores every service in one NumPy pass:
+
+- a seasonal EWMA baseline: the EWMA of the same phase over the previous
+  `seasons` cycles of `period` (e.g. 24 for hourly data, 7 for daily),
+  falling back to the EWMA of all earlier periods while less than one cycle
+  of history exists; each EWMA is one weighted sum, not a per-period loop,
+- `cost_spike_pct`: how far the scored period exceeds that baseline.
+
+CPU and memory request series, when given, are compared with their own EWMA
+baseline to give `cpu_request_increase_pct` and
+`memory_request_increase_pct`. Baselines only use periods before the scored
+one. Missing periods should be passed as NaN: the EWMA skips them and
+carries its level forward, and a missing scored period reads as no increase.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+
+def ewma_level(series: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Final EWMA level of each row of an (S x T) array, seeded with the first
+    column. Computed as one weighted sum over T instead of a recurrence.
+
+    NaN periods are skipped: the level carries over them unchanged and the
+    first observed period seeds it. Rows with no observed period are NaN.
+    """
+    x = np.asarray(series, dtype=np.float64)
+    n = x.shape[1]
+    observed = ~np.isnan(x)
+    if observed.all():
+        weights = alpha * (1.0 - alpha) ** np.arange(n - 1, -1, -1, dtype=np.float64)
+        weights[0] = (1.0 - alpha) ** (n - 1)
+        return x @ weights
+
+    # Each observed value decays once per observed period after it.
+    later = observed[:, ::-1].cumsum(axis=1)[:, ::-1] - observed
+    weights = np.where(observed, alpha * (1.0 - alpha) ** later, 0.0)
+    first = observed & (observed.cumsum(axis=1) == 1)
+    weights = np.where(first, (1.0 - alpha) ** later, weights)
+    level = np.einsum("ij,ij->i", np.where(observed, x, 0.0), weights)
+    return np.where(observed.any(axis=1), level, np.nan)
+
+
+def _increase_pct(current: np.ndarray, baseline: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct = 100.0 * (current / baseline - 1.0)
+    return np.where((baseline > 0) & ~np.isnan(current), np.maximum(pct, 0.0), 0.0)
+
+
+@dataclass
+class CostScores:
+    """Per-service `finops` fields for one scored period."""
+
+    services: Sequence[str]
+    cost_spike_pct: np.ndarray
+    cpu_request_increase_pct: np.ndarray
+    memory_request_increase_pct: np.ndarray
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """`finops` columns for a TelemetryFrame (see agents.base)."""
+        return {
+            "cost_spike_pct": self.cost_spike_pct,
+            "cpu_request_increase_pct": self.cpu_request_increase_pct,
+            "memory_request_increase_pct": self.memory_request_increase_pct,
+        }
+
+    def finops_block(self, i: int) -> Dict[str, float]:
+        return {key: float(col[i]) for key, col in self.columns().items()}
+
+    def apply(self, telemetry_by_service: Dict[str, Dict[str, Any]]) -> None:
+        """Write the scored fields into each service's `finops` block in place."""
+        for i, service in enumerate(self.services):
+            telemetry = telemetry_by_service.get(service)
+            if telemetry is not None:
+                telemetry.setdefault("finops", {}).update(self.finops_block(i))
+
+
+def score_costs(
+    spend: Any,
+    services: Optional[Sequence[str]] = None,
+    cpu_requests: Any = None,
+    memory_requests: Any = None,
+    alpha: float = 0.3,
+    period: int = 24,
+    seasons: int = 4,
+    at: int = -1,
+) -> CostScores:
+    """Score period `at` (default: the latest) of every service."""
+    x = np.atleast_2d(np.asarray(spend, dtype=np.float64))
+    n_services, n_periods = x.shape
+    t = at % n_periods
+    if t == 0:
+        raise ValueError("Need at least one period of history before the scored period")
+    if services is None:
+        services = [str(i) for i in range(n_services)]
+    if len(services) != n_services:
+        raise ValueError(f"Got {len(services)} service names for {n_services} spend series")
+
+    lags = [t - k * period for k in range(seasons, 0, -1) if t - k * period >= 0]
+    if lags:
+        baseline = ewma_level(x[:, lags], alpha)
+    else:
+        baseline = ewma_level(x[:, :t], alpha)
+    spike = _increase_pct(x[:, t], baseline)
+
+    def request_increase(series: Any) -> np.ndarray:
+        if series is None:
+            return np.zeros(n_services, dtype=np.float64)
+        r = np.atleast_2d(np.asarray(series, dtype=np.float64))
+        if r.shape != x.shape:
+            raise ValueError(f"Request series shape {r.shape} does not match spend {x.shape}")
+        return _increase_pct(r[:, t], ewma_level(r[:, :t], alpha))
+
+    return CostScores(
+        services=list(services),
+        cost_spike_pct=spike,
+        cpu_request_increase_pct=request_increase(cpu_requests),
+        memory_request_increase_pct=request_increase(memory_requests),
+    )
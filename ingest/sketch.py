@@ -0,0 +1,181 @@
+"""Mergeable quantile sketches for request latency.
+
+`DDSketch` stores counts in logarithmic buckets, so every quantile it
+reports is within `relative_accuracy` of a true sample value. Memory is
+bounded by the value range, not by the number of samples. Sketches with the
+same accuracy merge by adding bucket counts, so per-shard or per-process
+sketches combine into one fleet-wide answer.
+
+`RequestSketch` pairs a latency sketch with error and availability
+counters, so p95/p99, `error_rate_pct` and `availability_pct` come from a
+single pass over the raw requests.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+class DDSketch:
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        max_buckets: int = 2048,
+        min_value: float = 1e-3,
+    ) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = float(relative_accuracy)
+        self.max_buckets = int(max_buckets)
+        self.min_value = float(min_value)
+        self.gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value: float, weight: int = 1) -> None:
+        value = float(value)
+        if value > self.min_value:
+            key = self._key(value)
+            self.bins[key] = self.bins.get(key, 0) + weight
+            if len(self.bins) > self.max_buckets:
+                self._collapse()
+        else:
+            self.zero_count += weight
+        self.count += weight
+        self.total += value * weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def add_many(self, values: Any) -> None:
+        """Add a batch of values in one vectorized pass."""
+        arr = np.asarray(values, dtype=np.float64).ravel()
+        if arr.size == 0:
+            return
+        positive = arr[arr > self.min_value]
+        self.zero_count += int(arr.size - positive.size)
+        if positive.size:
+            keys = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64)
+            uniq, counts = np.unique(keys, return_counts=True)
+            bins = self.bins
+            for key, c in zip(uniq.tolist(), counts.tolist()):
+                bins[key] = bins.get(key, 0) + c
+            if len(bins) > self.max_buckets:
+                self._collapse()
+        self.count += int(arr.size)
+        self.total += float(arr.sum())
+        self.min = min(self.min, float(arr.min()))
+        self.max = max(self.max, float(arr.max()))
+
+    def merge(self, other: "DDSketch") -> "DDSketch":
+        if not math.isclose(self.gamma, other.gamma):
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        bins = self.bins
+        for key, c in other.bins.items():
+            bins[key] = bins.get(key, 0) + c
+        if len(bins) > self.max_buckets:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def _collapse(self) -> None:
+        # Fold the lowest buckets together; high quantiles keep their accuracy.
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_buckets
+        target = keys[excess]
+        folded = sum(self.bins.pop(k) for k in keys[:excess])
+        self.bins[target] += folded
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("Quantile must be in [0, 1]")
+
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return self.min
+        seen = self.zero_count
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                value = 2.0 * self.gamma ** key / (self.gamma + 1.0)
+                return min(self.max, max(self.min, value))
+        return self.max
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+
+class RequestSketch:
+    """Latency quantiles plus error and availability counts for one stream."""
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048) -> None:
+        self.latency = DDSketch(relative_accuracy, max_buckets)
+        self.errors = 0
+        self.unavailable = 0
+
+    @property
+    def count(self) -> int:
+        return self.latency.count
+
+    def add(self, latency_ms: float, error: bool = False, available: bool = True) -> None:
+        self.latency.add(latency_ms)
+        if error:
+            self.errors += 1
+        if not available:
+            self.unavailable += 1
+
+    def add_many(
+        self,
+        latency_ms: Any,
+        errors: Any = None,
+        available: Any = None,
+    ) -> None:
+        self.latency.add_many(latency_ms)
+        if errors is not None:
+            self.errors += int(np.count_nonzero(errors))
+        if available is not None:
+            self.unavailable += int(np.size(available) - np.count_nonzero(available))
+
+    def merge(self, other: "RequestSketch") -> "RequestSketch":
+        self.latency.merge(other.latency)
+        self.errors += other.errors
+        self.unavailable += other.unavailable
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.latency.quantile(q)
+
+    def error_rate_pct(self) -> Optional[float]:
+        return 100.0 * self.errors / self.count if self.count else None
+
+    def availability_pct(self) -> Optional[float]:
+        return 100.0 * (1.0 - self.unavailable / self.count) if self.count else None
+
+    def sre_fields(self) -> Dict[str, float]:
+        """`sre` block fields; empty when no requests were recorded."""
+        if not self.count:
+            return {}
+        return {
+            "p95_latency_ms": float(self.quantile(0.95)),
+            "p99_latency_ms": float(self.quantile(0.99)),
+            "error_rate_pct": float(self.error_rate_pct()),
+            "availability_pct": float(self.availability_pct()),
+        }
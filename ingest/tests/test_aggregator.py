@@ -0,0 +1,43 @@
+import pytest
+
+from ingest import TelemetryAggregator
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+
+def _steady_spend(agg, service, until, rate=1.0, spike_from=None, spike=3.0):
+    """One spend sample per minute, `spike` x `rate` from `spike_from` on."""
+    t = 0.0
+    while t <= until:
+        amount = rate * spike if spike_from is not None and t >= spike_from else rate
+        agg.observe_spend(service, t, amount)
+        t += 60.0
+
+
+@pytest.mark.parametrize("offset_min", [0, 5, 20, 40, 59])
+def test_sustained_spike_reads_the_same_across_the_hour(offset_min):
+    agg = TelemetryAggregator()
+    spike_from = 7 * DAY
+    now = spike_from + HOUR + offset_min * 60.0
+    _steady_spend(agg, "checkout", now, spike_from=spike_from)
+
+    spike = agg.finops_block("checkout", now)["cost_spike_pct"]
+    assert spike == pytest.approx(200.0, abs=5.0)
+
+
+@pytest.mark.parametrize("offset_min", [5, 30, 59])
+def test_steady_spend_reads_no_spike(offset_min):
+    agg = TelemetryAggregator()
+    now = 3 * DAY + offset_min * 60.0
+    _steady_spend(agg, "checkout", now)
+
+    assert agg.finops_block("checkout", now)["cost_spike_pct"] == pytest.approx(0.0, abs=0.5)
+
+
+def test_young_service_has_no_baseline():
+    agg = TelemetryAggregator()
+    _steady_spend(agg, "checkout", 90 * 60.0)
+
+    assert agg.finops_block("checkout", 90 * 60.0) == {"cost_spike_pct": 0.0}
+    assert agg.finops_block("cart", 90 * 60.0) == {"_missing": True}
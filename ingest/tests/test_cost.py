@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from ingest import score_costs
+from ingest.cost import ewma_level
+
+
+@pytest.mark.parametrize("alpha", [0.1, 0.3, 0.9])
+def test_ewma_level_matches_recurrence(alpha):
+    series = np.random.default_rng(0).uniform(0.0, 100.0, size=(5, 60))
+    level = series[:, 0].copy()
+    for t in range(1, series.shape[1]):
+        level = alpha * series[:, t] + (1.0 - alpha) * level
+    assert ewma_level(series, alpha) == pytest.approx(level, rel=1e-12)
+
+
+def test_seasonal_spike_is_scored_against_the_same_phase():
+    hours = np.arange(24 * 7)
+    daily = 10.0 + 5.0 * (hours % 24 >= 9)
+    spend = np.vstack([daily, daily])
+    spend[1, -1] *= 3.0
+
+    scores = score_costs(spend, ["steady", "spiking"], period=24)
+    assert scores.cost_spike_pct[0] == pytest.approx(0.0)
+    assert scores.cost_spike_pct[1] == pytest.approx(200.0)
+
+
+def test_score_costs_needs_history():
+    with pytest.raises(ValueError):
+        score_costs(np.ones((2, 5)), at=0)
+
+
+def test_ewma_level_skips_missing_periods():
+    series = np.array([[10.0, np.nan, 20.0, np.nan, np.nan, 30.0], [np.nan] * 6])
+    level = 10.0
+    for value in (20.0, 30.0):
+        level = 0.3 * value + 0.7 * level
+    result = ewma_level(series, 0.3)
+    assert result[0] == pytest.approx(level, rel=1e-12)
+    assert np.isnan(result[1])
+
+
+def test_billing_gap_does_not_inflate_the_spike():
+    spend = np.full((1, 24 * 7), 10.0)
+    spend[0, -30:-5] = np.nan
+    scores = score_costs(spend, period=24)
+    assert scores.cost_spike_pct[0] == pytest.approx(0.0)
+
+    spend[0, -1] = np.nan
+    assert score_costs(spend, period=24).cost_spike_pct[0] == 0.0
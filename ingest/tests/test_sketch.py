@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from ingest import DDSketch, RequestSketch
+
+
+def _latencies(seed, n=20_000):
+    rng = np.random.default_rng(seed)
+    values = rng.lognormal(mean=5.0, sigma=1.0, size=n)
+    values[:50] = 0.0
+    return values
+
+
+def test_add_many_matches_add():
+    values = _latencies(1, 5_000)
+    one, many = DDSketch(), DDSketch()
+    for v in values:
+        one.add(v)
+    many.add_many(values)
+    assert many.bins == one.bins
+    assert (many.count, many.zero_count, many.min, many.max) == (one.count, one.zero_count, one.min, one.max)
+    assert many.total == pytest.approx(one.total)
+
+
+def test_merged_shards_match_one_sketch():
+    values = _latencies(2)
+    whole = DDSketch()
+    whole.add_many(values)
+
+    merged = DDSketch()
+    for shard in np.array_split(values, 7):
+        part = DDSketch()
+        part.add_many(shard)
+        merged.merge(part)
+
+    assert merged.bins == whole.bins
+    assert (merged.count, merged.zero_count, merged.min, merged.max) == (whole.count, whole.zero_count, whole.min, whole.max)
+    for q in (0.5, 0.9, 0.95, 0.99):
+        assert merged.quantile(q) == whole.quantile(q)
+
+
+@pytest.mark.parametrize("q", [0.5, 0.9, 0.95, 0.99])
+def test_quantiles_are_within_relative_accuracy(q):
+    values = _latencies(3)
+    sketch = DDSketch(relative_accuracy=0.01)
+    sketch.add_many(values)
+    exact = np.sort(values)[int(q * (len(values) - 1))]
+    assert sketch.quantile(q) == pytest.approx(exact, rel=0.01)
+
+
+def test_merge_rejects_other_accuracy():
+    with pytest.raises(ValueError):
+        DDSketch(relative_accuracy=0.01).merge(DDSketch(relative_accuracy=0.02))
+
+
+def test_request_sketch_fields():
+    sketch = RequestSketch()
+    sketch.add_many(np.full(100, 200.0), errors=np.arange(100) < 5, available=np.arange(100) >= 2)
+    fields = sketch.sre_fields()
+    assert fields["error_rate_pct"] == pytest.approx(5.0)
+    assert fields["availability_pct"] == pytest.approx(98.0)
+    assert fields["p95_latency_ms"] == pytest.approx(200.0, rel=0.01)
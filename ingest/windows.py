@@ -0,0 +1,155 @@
+"""Tumbling and sliding time windows over one metric stream.
+
+A window of `width_s` seconds is kept as a ring of `width_s / step_s` panes
+(one pane when `step_s` is omitted, which makes it a tumbling window). A
+sample only touches the pane its timestamp falls into; a pane is reset when
+the ring wraps onto a newer time bucket. Updates are O(1) and reads combine
+at most one aggregate per pane.
+
+Panes can also hold a mergeable summary (for example an
+`ingest.sketch.RequestSketch`), which keeps quantiles over the window in
+bounded memory.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, List, Optional
+
+
+class _Pane:
+    __slots__ = ("bucket", "count", "total", "peak", "samples", "summary")
+
+    def __init__(self) -> None:
+        self.bucket: Optional[int] = None
+        self.count = 0
+        self.total = 0.0
+        self.peak = float("-inf")
+        self.samples: Optional[List[float]] = None
+        self.summary: Any = None
+
+    def reset(
+        self,
+        bucket: int,
+        keep_samples: bool,
+        summary: Optional[Callable[[], Any]],
+    ) -> None:
+        self.bucket = bucket
+        self.count = 0
+        self.total = 0.0
+        self.peak = float("-inf")
+        self.samples = [] if keep_samples else None
+        self.summary = summary() if summary is not None else None
+
+
+class RollingWindow:
+    """
+    Count, sum, mean and max of the samples in the window ending at `now`.
+
+    The window covers the time bucket containing `now` and the
+    `panes - 1` buckets before it. Samples older than the window are
+    counted in `dropped` and ignored; a `now` earlier than the retained
+    panes reads as an empty window. With `keep_samples` each pane also
+    keeps the raw values. With `summary`, a factory for objects with
+    `add(value, *args)` and `merge(other)`, each pane feeds its samples
+    into one summary and `summary(now)` merges them.
+    """
+
+    def __init__(
+        self,
+        width_s: float,
+        step_s: Optional[float] = None,
+        keep_samples: bool = False,
+        summary: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        step_s = float(step_s or width_s)
+        if width_s <= 0 or step_s <= 0:
+            raise ValueError("Window width and step must be positive")
+        panes = int(round(float(width_s) / step_s))
+        if panes < 1 or abs(panes * step_s - float(width_s)) > 1e-9 * float(width_s):
+            raise ValueError(f"Window width {width_s} is not a multiple of step {step_s}")
+
+        self.width_s = float(width_s)
+        self.step_s = step_s
+        self.keep_samples = keep_samples
+        self.summary_factory = summary
+        self.dropped = 0
+        self.latest_t = float("-inf")
+        self._panes = [_Pane() for _ in range(panes)]
+
+    @property
+    def kind(self) -> str:
+        return "tumbling" if len(self._panes) == 1 else "sliding"
+
+    def add(self, t: float, value: float = 1.0, *args: Any) -> None:
+        """Add one sample; extra `args` are passed to the pane summary."""
+        bucket = int(t // self.step_s)
+        n = len(self._panes)
+        newest = int(self.latest_t // self.step_s) if self.latest_t > float("-inf") else bucket
+        if bucket <= newest - n:
+            self.dropped += 1
+            return
+
+        pane = self._panes[bucket % n]
+        if pane.bucket != bucket:
+            pane.reset(bucket, self.keep_samples, self.summary_factory)
+        value = float(value)
+        pane.count += 1
+        pane.total += value
+        if value > pane.peak:
+            pane.peak = value
+        if pane.samples is not None:
+            pane.samples.append(value)
+        if pane.summary is not None:
+            pane.summary.add(value, *args)
+        if t > self.latest_t:
+            self.latest_t = t
+
+    def _live(self, now: Optional[float]) -> List[_Pane]:
+        if now is None:
+            now = self.latest_t
+        if now == float("-inf"):
+            return []
+        hi = int(now // self.step_s)
+        lo = hi - len(self._panes) + 1
+        return [p for p in self._panes if p.count and lo <= p.bucket <= hi]
+
+    def start(self, now: Optional[float] = None) -> float:
+        """Start time of the oldest bucket in the window ending at `now`."""
+        if now is None:
+            now = self.latest_t
+        return (int(now // self.step_s) - len(self._panes) + 1) * self.step_s
+
+    def count(self, now: Optional[float] = None) -> int:
+        return sum(p.count for p in self._live(now))
+
+    def sum(self, now: Optional[float] = None) -> float:
+        return sum(p.total for p in self._live(now))
+
+    def mean(self, now: Optional[float] = None) -> Optional[float]:
+        panes = self._live(now)
+        count = sum(p.count for p in panes)
+        if not count:
+            return None
+        return sum(p.total for p in panes) / count
+
+    def max(self, now: Optional[float] = None) -> Optional[float]:
+        panes = self._live(now)
+        if not panes:
+            return None
+        return max(p.peak for p in panes)
+
+    def samples(self, now: Optional[float] = None) -> List[float]:
+        if not self.keep_samples:
+            raise ValueError("Window was created without keep_samples")
+        values: List[float] = []
+        for pane in self._live(now):
+            values.extend(pane.samples or ())
+        return values
+
+    def summary(self, now: Optional[float] = None) -> Any:
+        if self.summary_factory is None:
+            raise ValueError("Window was created without a summary factory")
+        merged = self.summary_factory()
+        for pane in self._live(now):
+            merged.merge(pane.summary)
+        return merged
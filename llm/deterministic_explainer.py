@@ -2,18 +2,12 @@ from __future__ import annotations
 
 from typing import Any, Dict, List
 
-
-NEGATIVE_MARKERS = [
-    "no material",
-    "no anomaly",
-    "no issue",
-    "within expected",
-]
+from agents.base import CLASS_NEGATIVE
+from orchestrator.consensus import classify_claim
 
 
 def _is_negative_claim(claim: str) -> bool:
-    c = (claim or "").lower()
-    return any(m in c for m in NEGATIVE_MARKERS)
+    return classify_claim(claim) == CLASS_NEGATIVE
 
 
 def _select_primary_agent(agents: List[Dict[str, Any]]) -> Dict[str, Any]:
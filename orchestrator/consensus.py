@@ -1,6 +1,13 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+import re
+from functools import lru_cache
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from aaf.embeddings import similarity_matrix
+from agents.base import CLASS_NEGATIVE, CLASS_OTHER, CLASS_POSSIBLE, CLASS_PRIMARY
 
 
 NEGATIVE_MARKERS = [
@@ -31,30 +38,127 @@ POSSIBLE_MARKERS = [
 ]
 
 
+# One scan finds every marker occurrence: each alternative sits inside a
+# lookahead, so matches may overlap, and at a given position negative
+# markers are tried before primary and possible ones.
+_MARKER_RE = re.compile(
+    "(?=(?:(?P<neg>{})|(?P<pri>{})|(?P<pos>{})))".format(
+        "|".join(map(re.escape, NEGATIVE_MARKERS)),
+        "|".join(map(re.escape, PRIMARY_MARKERS)),
+        "|".join(map(re.escape, POSSIBLE_MARKERS)),
+    )
+)
+
+_NEG, _PRI, _POS = 1, 2, 4
+_GROUP_BITS = {"neg": _NEG, "pri": _PRI, "pos": _POS}
+
+
+@lru_cache(maxsize=4096)
+def _marker_bits(claim: Optional[str]) -> int:
+    bits = 0
+    for m in _MARKER_RE.finditer((claim or "").lower()):
+        bits |= _GROUP_BITS[m.lastgroup]
+    return bits
+
+
 def _is_negative_claim(claim: str) -> bool:
-    c = (claim or "").lower()
-    return any(m in c for m in NEGATIVE_MARKERS)
+    return bool(_marker_bits(claim) & _NEG)
 
 
 def _is_primary_claim(claim: str) -> bool:
-    c = (claim or "").lower()
-    return any(m in c for m in PRIMARY_MARKERS)
+    return bool(_marker_bits(claim) & _PRI)
 
 
 def _is_possible_claim(claim: str) -> bool:
-    c = (claim or "").lower()
-    return any(m in c for m in POSSIBLE_MARKERS)
+    return bool(_marker_bits(claim) & _POS)
+
+
+@lru_cache(maxsize=4096)
+def classify_claim(claim: Optional[str]) -> int:
+    """
+    Claim class of a free-text claim; negative markers take precedence.
+    Shared by consensus, the explainer and primary-domain prediction, and
+    memoized per distinct claim string.
+    """
+    bits = _marker_bits(claim)
+    if bits & _NEG:
+        return CLASS_NEGATIVE
+    if bits & _PRI:
+        return CLASS_PRIMARY
+    if bits & _POS:
+        return CLASS_POSSIBLE
+    return CLASS_OTHER
 
 
 def confidence_alignment(a: float, b: float) -> float:
     return max(0.0, 1.0 - abs(float(a) - float(b)))
 
 
+class PairwiseAgreement:
+    """
+    Implicit n x n agreement matrix: 1.0 on the diagonal and one shared
+    off-diagonal score. Rows are built only when indexed; `tolist()`
+    materializes the full matrix.
+
+    Semantic consensus has a distinct score per pair; it passes the dense
+    `matrix`, which rows and entries are then read from.
+    """
+
+    __slots__ = ("n", "score", "matrix")
+
+    def __init__(self, n: int, score: float, matrix: Optional[np.ndarray] = None) -> None:
+        self.n = n
+        self.score = score
+        self.matrix = matrix
+
+    def at(self, i: int, j: int) -> float:
+        if not (0 <= i < self.n and 0 <= j < self.n):
+            raise IndexError((i, j))
+        if self.matrix is not None:
+            return float(self.matrix[i, j])
+        return 1.0 if i == j else self.score
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, i: int) -> List[float]:
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError(i)
+        if self.matrix is not None:
+            return [float(v) for v in self.matrix[i]]
+        row = [self.score] * self.n
+        row[i] = 1.0
+        return row
+
+    def __iter__(self) -> Iterator[List[float]]:
+        for i in range(self.n):
+            yield self[i]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PairwiseAgreement):
+            if self.matrix is not None or other.matrix is not None:
+                return self.tolist() == other.tolist()
+            return self.n == other.n and (self.n < 2 or self.score == other.score)
+        if isinstance(other, list):
+            return self.tolist() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PairwiseAgreement(n={self.n}, score={self.score!r})"
+
+    def tolist(self) -> List[List[float]]:
+        return [self[i] for i in range(self.n)]
+
+
 def consensus_score(
     claims: List[str],
     confidences: List[float],
     lam: float = 0.5,
-) -> Tuple[float, List[List[float]]]:
+    classes: Optional[Sequence[Optional[int]]] = None,
+    mode: str = "evidence",
+) -> Tuple[float, PairwiseAgreement]:
     """
     Evidence-aware consensus for governance interpretation.
 
@@ -67,46 +171,78 @@ def consensus_score(
     - multiple competing primary claims should reduce consensus
     - missing/possible claims should produce moderate uncertainty
     - negative/no-issue claims should not dominate
+
+    `classes` may carry the claim class of each claim (as set on
+    `AgentOutput.claim_class`); claims without one are classified by text.
+
+    The score only depends on counts, so this runs in O(n). The pairwise
+    agreement is returned as a `PairwiseAgreement` view instead of an
+    n x n list.
+
+    `mode="semantic"` uses `semantic_consensus_score` instead, with its
+    dense pairwise matrix behind the returned view. Semantic consensus
+    compares claim text, so it does not accept `classes`.
     """
+    if mode == "semantic":
+        if classes is not None:
+            raise ValueError("classes are only used by mode='evidence'")
+        score, pair = semantic_consensus_score(claims, confidences, lam=lam)
+        return score, PairwiseAgreement(len(claims), score, pair)
+    if mode != "evidence":
+        raise ValueError(f"Unknown consensus mode: {mode!r}")
 
     n = len(claims)
     if n == 0:
-        return 0.0, []
+        return 0.0, PairwiseAgreement(0, 0.0)
     if n == 1:
-        return float(confidences[0]), [[1.0]]
-
-    pair = [[0.0] * n for _ in range(n)]
+        return float(confidences[0]), PairwiseAgreement(1, 1.0)
 
-    active = []
-    primary = []
-    possible = []
+    active_count = 0
+    active_sum = 0.0
+    primary_count = 0
+    primary_confs: List[float] = []
+    possible_count = 0
 
     for i, claim in enumerate(claims):
         conf = float(confidences[i])
-        neg = _is_negative_claim(claim)
-
-        if _is_primary_claim(claim) and not neg:
-            primary.append((i, conf))
-            active.append((i, conf))
-        elif _is_possible_claim(claim) and not neg:
-            possible.append((i, conf))
-            active.append((i, conf))
-        elif not neg and conf >= 0.45:
-            active.append((i, conf))
-
-    if not active:
-        # All agents report no material issue. This is stable consensus.
+        cls = classes[i] if classes is not None else None
+        if cls is None:
+            cls = classify_claim(claim)
+
+        if cls == CLASS_PRIMARY:
+            primary_count += 1
+            if primary_count <= 2:
+                primary_confs.append(conf)
+            active_count += 1
+            active_sum += conf
+        elif cls == CLASS_POSSIBLE:
+            possible_count += 1
+            active_count += 1
+            active_sum += conf
+        elif cls == CLASS_OTHER and conf >= 0.45:
+            active_count += 1
+            active_sum += conf
+
+    if not active_count:
         avg_conf = sum(float(c) for c in confidences) / len(confidences)
-        score = min(0.80, max(0.60, avg_conf))
-        for i in range(n):
-            for j in range(n):
-                pair[i][j] = 1.0 if i == j else score
-        return score, pair
+        score = _quiet_score(avg_conf)
+    else:
+        score = _active_score(active_sum / active_count, primary_count, primary_confs, possible_count)
+
+    return score, PairwiseAgreement(n, score)
 
-    primary_count = len(primary)
-    active_conf = [conf for _, conf in active]
-    avg_active_conf = sum(active_conf) / len(active_conf)
 
+def _quiet_score(avg_conf: float) -> float:
+    # All agents report no material issue. This is stable consensus.
+    return min(0.80, max(0.60, avg_conf))
+
+
+def _active_score(
+    avg_active_conf: float,
+    primary_count: int,
+    primary_confs: Sequence[float],
+    possible_count: int,
+) -> float:
     # Clear single-primary case: enough for governance decision.
     if primary_count == 1:
         score = max(0.70, min(0.92, avg_active_conf + 0.10))
@@ -114,7 +250,6 @@ def consensus_score(
     # Two primary claims can be legitimate cross-domain evidence,
     # but it is less clear than one primary root cause.
     elif primary_count == 2:
-        primary_confs = [conf for _, conf in primary]
         alignment = confidence_alignment(primary_confs[0], primary_confs[1])
         score = min(0.82, 0.55 + 0.25 * alignment)
 
@@ -127,16 +262,204 @@ def consensus_score(
         score = min(0.65, max(0.45, avg_active_conf))
 
     # Penalize incomplete evidence slightly.
-    if possible:
-        score -= min(0.10, 0.03 * len(possible))
+    if possible_count:
+        score -= min(0.10, 0.03 * possible_count)
+
+    return max(0.0, min(1.0, score))
 
-    score = max(0.0, min(1.0, score))
 
-    for i in range(n):
-        for j in range(n):
-            if i == j:
-                pair[i][j] = 1.0
-            else:
-                pair[i][j] = score
+class ConsensusAccumulator:
+    """
+    Evidence-aware consensus kept up to date as agent outputs change.
+
+    Holds each agent's claim class and confidence together with the primary,
+    possible and active counts. `replace()` swaps one agent's output and
+    adjusts the counts in O(1), without re-reading claims; the confidence
+    sums are re-added in agent order on the next `score()`, so the result is
+    bit-identical to `consensus_score` (subtracting the old confidence from a
+    running sum could drift by an ulp).
+    """
+
+    __slots__ = (
+        "classes", "confidences", "active_count", "primary_count",
+        "possible_count", "_score",
+    )
+
+    def __init__(self, classes: Sequence[int], confidences: Sequence[float]) -> None:
+        if len(classes) != len(confidences):
+            raise ValueError(f"Got {len(classes)} claim classes for {len(confidences)} confidences")
+        self.classes: List[int] = []
+        self.confidences: List[float] = []
+        self.active_count = 0
+        self.primary_count = 0
+        self.possible_count = 0
+        self._score: Optional[float] = None
+        for cls, conf in zip(classes, confidences):
+            self.classes.append(cls)
+            self.confidences.append(float(conf))
+            self._count(cls, float(conf), 1)
+
+    @classmethod
+    def from_outputs(cls, outputs: Sequence[Any]) -> "ConsensusAccumulator":
+        """Build from agent outputs, classifying claims that carry no class."""
+        return cls(
+            [
+                o.claim_class if o.claim_class is not None else classify_claim(o.claim)
+                for o in outputs
+            ],
+            [o.confidence for o in outputs],
+        )
+
+    def __len__(self) -> int:
+        return len(self.classes)
+
+    def _count(self, cls: int, conf: float, sign: int) -> None:
+        if cls == CLASS_PRIMARY:
+            self.primary_count += sign
+            self.active_count += sign
+        elif cls == CLASS_POSSIBLE:
+            self.possible_count += sign
+            self.active_count += sign
+        elif cls == CLASS_OTHER and conf >= 0.45:
+            self.active_count += sign
+
+    def replace(self, i: int, claim_class: int, confidence: float) -> None:
+        """Replace agent i's output."""
+        conf = float(confidence)
+        self._count(self.classes[i], self.confidences[i], -1)
+        self._count(claim_class, conf, 1)
+        self.classes[i] = claim_class
+        self.confidences[i] = conf
+        self._score = None
+
+    def replace_output(self, i: int, output: Any) -> None:
+        cls = output.claim_class
+        self.replace(i, classify_claim(output.claim) if cls is None else cls, output.confidence)
+
+    def score(self) -> float:
+        """Same value as `consensus_score` over the current outputs."""
+        if self._score is None:
+            self._score = self._compute()
+        return self._score
+
+    def _compute(self) -> float:
+        n = len(self.classes)
+        if n == 0:
+            return 0.0
+        if n == 1:
+            return self.confidences[0]
+        if not self.active_count:
+            return _quiet_score(sum(self.confidences) / n)
+
+        active_sum = 0.0
+        primary_confs: List[float] = []
+        for cls, conf in zip(self.classes, self.confidences):
+            if cls == CLASS_PRIMARY:
+                if len(primary_confs) < 2:
+                    primary_confs.append(conf)
+                active_sum += conf
+            elif cls == CLASS_POSSIBLE or (cls == CLASS_OTHER and conf >= 0.45):
+                active_sum += conf
+        return _active_score(
+            active_sum / self.active_count,
+            self.primary_count,
+            primary_confs,
+            self.possible_count,
+        )
+
+
+def semantic_consensus_score(
+    claims: Sequence[str],
+    confidences: Sequence[float],
+    lam: float = 0.5,
+) -> Tuple[float, np.ndarray]:
+    """
+    Semantic pairwise consensus.
 
-    return score, pair
+    Each pair of agents scores `lam * cosine(claim_i, claim_j) +
+    (1 - lam) * confidence_alignment(c_i, c_j)`; the consensus is the mean
+    over off-diagonal pairs. Similarities come from one matrix multiply over
+    the claim embeddings (aaf/embeddings.py).
+    """
+    n = len(claims)
+    if n == 0:
+        return 0.0, np.zeros((0, 0))
+    if n == 1:
+        return float(confidences[0]), np.ones((1, 1))
+
+    conf = np.asarray(confidences, dtype=np.float64)
+    sim = similarity_matrix(list(claims)).astype(np.float64)
+    alignment = np.maximum(0.0, 1.0 - np.abs(conf[:, None] - conf[None, :]))
+    pair = lam * sim + (1.0 - lam) * alignment
+    np.fill_diagonal(pair, 1.0)
+
+    score = (pair.sum() - n) / (n * (n - 1))
+    return float(max(0.0, min(1.0, score))), pair
+
+
+def _row_sums(values: np.ndarray) -> np.ndarray:
+    # Column by column, in agent order, so sums match the per-incident
+    # loop exactly (ndarray.sum uses pairwise summation).
+    total = np.zeros(values.shape[0], dtype=np.float64)
+    for j in range(values.shape[1]):
+        total += values[:, j]
+    return total
+
+
+def consensus_score_batch(classes: Any, confidences: Any) -> np.ndarray:
+    """
+    `consensus_score` for N incidents at once.
+
+    `classes` and `confidences` are (N x n_agents) arrays holding each
+    agent's claim class (see `agents.base.CLASS_*`, e.g. the columns of
+    `AgentBatchOutput.claim_classes()`) and confidence. The counting rules
+    are evaluated with NumPy over the whole batch; the result matches the
+    per-incident score.
+    """
+    cls = np.asarray(classes)
+    conf = np.asarray(confidences, dtype=np.float64)
+    if cls.ndim != 2 or cls.shape != conf.shape:
+        raise ValueError(
+            f"classes and confidences must be matching (N x n_agents) arrays, "
+            f"got {cls.shape} and {conf.shape}"
+        )
+
+    n_incidents, n = cls.shape
+    if n == 0:
+        return np.zeros(n_incidents, dtype=np.float64)
+    if n == 1:
+        return conf[:, 0].copy()
+
+    primary = cls == CLASS_PRIMARY
+    possible = cls == CLASS_POSSIBLE
+    active = primary | possible | ((cls == CLASS_OTHER) & (conf >= 0.45))
+
+    active_count = active.sum(axis=1)
+    primary_count = primary.sum(axis=1)
+    possible_count = possible.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_active_conf = _row_sums(np.where(active, conf, 0.0)) / active_count
+
+    # Confidences of the first two primary claims, for the two-primary rule.
+    rows = np.arange(n_incidents)
+    first = primary.argmax(axis=1)
+    rest = primary.copy()
+    rest[rows, first] = False
+    second = rest.argmax(axis=1)
+    alignment = np.maximum(0.0, 1.0 - np.abs(conf[rows, first] - conf[rows, second]))
+
+    score = np.select(
+        [primary_count == 1, primary_count == 2, primary_count > 2],
+        [
+            np.maximum(0.70, np.minimum(0.92, avg_active_conf + 0.10)),
+            np.minimum(0.82, 0.55 + 0.25 * alignment),
+            0.50,
+        ],
+        default=np.minimum(0.65, np.maximum(0.45, avg_active_conf)),
+    )
+    score = score - np.where(possible_count > 0, np.minimum(0.10, 0.03 * possible_count), 0.0)
+    score = np.maximum(0.0, np.minimum(1.0, score))
+
+    # All agents report no material issue.
+    quiet = np.minimum(0.80, np.maximum(0.60, _row_sums(conf) / n))
+    return np.where(active_count == 0, quiet, score)
@@ -1,243 +1,517 @@
 from __future__ import annotations
 
-from typing import Dict, Any, Tuple, List
-import copy
+from collections import ChainMap
+from dataclasses import dataclass, field
+import itertools
+import time
+from typing import Dict, Any, Iterator, Mapping, MutableMapping, Sequence, Tuple, List
+
+from agents.memo import AgentMemo
+from agents.registry import REGISTRY
+from agents.rules import DOMAIN_KEYS, RULES
+from agents.telemetry import Telemetry
+from orchestrator.consensus import ConsensusAccumulator
+from orchestrator.retrieval import RETRIEVAL, EvidenceRetrieval
+from orchestrator.scheduler import RarScheduler
+
+
+# A context flag is raised when any listed rule reaches its minimum level.
+CONTEXT_RULES: Dict[str, Dict[str, int]] = {
+    "deploy_bad": {
+        "pipeline_failed": 1,
+        "config_drift": 1,
+        "rollback_marker": 1,
+        "artifact_mismatch": 1,
+        "restart_loops": 2,
+    },
+    "sre_bad": {
+        "p95_latency_ms": 1,
+        "error_rate_pct": 1,
+        "saturation_pct": 1,
+        "availability_pct": 1,
+    },
+    "cost_bad": {
+        "cost_spike_pct": 2,
+        "hpa_scale_to": 1,
+        "cpu_request_increase_pct": 1,
+        "memory_request_increase_pct": 1,
+    },
+    "sec_bad": {
+        "critical_cves": 1,
+        "policy_violation": 1,
+        "iam_drift": 1,
+        "compliance_gap": 1,
+    },
+}
+
+
+def _update_consensus(
+    accumulator: ConsensusAccumulator,
+    before: List[Any],
+    after: List[Any],
+) -> float:
+    # Memoized agents return the same output object; only the agents whose
+    # block changed are replaced in the accumulator.
+    for i, (old, new) in enumerate(zip(before, after)):
+        if new is not old:
+            accumulator.replace_output(i, new)
+    return accumulator.score()
+
+
+def _state_key(telemetry: Telemetry) -> Tuple[Any, ...]:
+    # Per-block change detection: what a block's agent reads plus which keys
+    # the block carries (the recovery heuristics depend on both).
+    return tuple((block.fingerprint, block.present) for block in telemetry.blocks())
+
+
+def _missing_domains(telemetry: Mapping[str, Any]) -> List[str]:
+    return [block.domain for block in Telemetry.parse(telemetry).blocks() if block.missing]
+
+
+def _context_flags(telemetry: Mapping[str, Any]) -> Dict[str, bool]:
+    levels = Telemetry.parse(telemetry).rules.levels
+    return {
+        flag: any(levels[key] >= min_level for key, min_level in spec.items())
+        for flag, spec in CONTEXT_RULES.items()
+    }
 
-from agents.devops import DevOpsAgent
-from agents.sre import SREAgent
-from agents.finops import FinOpsAgent
-from agents.devsecops import DevSecOpsAgent
-from orchestrator.consensus import consensus_score
 
+def _recover_deploy(deploy: MutableMapping[str, Any], flags: Mapping[str, bool]) -> str:
+    deploy["_missing"] = False
+    deploy["_rar_retrieved"] = True
 
-AGENTS = [DevOpsAgent(), SREAgent(), FinOpsAgent(), DevSecOpsAgent()]
+    if flags["sre_bad"] and not flags["sec_bad"]:
+        deploy["rollback_marker"] = True
+        deploy["restart_loops"] = max(int(float(deploy.get("restart_loops", 0) or 0)), 12)
+        deploy["config_drift"] = bool(deploy.get("config_drift", True))
+        return "Recovered deployment evidence from reliability-impact context"
 
+    deploy.setdefault("pipeline_failed", False)
+    deploy.setdefault("config_drift", False)
+    deploy.setdefault("restart_loops", 0)
+    return "Recovered deployment evidence; no deployment anomaly confirmed"
 
-DOMAIN_KEYS = ["deploy", "sre", "finops", "sec"]
 
+def _recover_sre(sre: MutableMapping[str, Any], flags: Mapping[str, bool]) -> str:
+    sre["_missing"] = False
+    sre["_rar_retrieved"] = True
 
-def _run_agents(
-    telemetry: Dict[str, Any],
-    lam: float = 0.5,
-) -> Tuple[List[Any], List[str], List[float], float]:
-    outputs = [agent.infer(telemetry) for agent in AGENTS]
-    claims = [output.claim for output in outputs]
-    confidences = [float(output.confidence) for output in outputs]
-    score, _ = consensus_score(claims, confidences, lam=lam)
-    return outputs, claims, confidences, float(score)
-
-
-def _missing_domains(telemetry: Dict[str, Any]) -> List[str]:
-    missing = []
-    for domain in DOMAIN_KEYS:
-        block = telemetry.get(domain, {}) or {}
-        if block.get("_missing") is True:
-            missing.append(domain)
-    return missing
-
-
-def _context_flags(telemetry: Dict[str, Any]) -> Dict[str, bool]:
-    deploy = telemetry.get("deploy", {}) or {}
-    sre = telemetry.get("sre", {}) or {}
-    finops = telemetry.get("finops", {}) or {}
-    sec = telemetry.get("sec", {}) or {}
-
-    deploy_bad = (
-        bool(deploy.get("pipeline_failed", False))
-        or bool(deploy.get("config_drift", False))
-        or bool(deploy.get("rollback_marker", False))
-        or bool(deploy.get("artifact_mismatch", False))
-        or int(float(deploy.get("restart_loops", 0) or 0)) >= 12
-    )
-
-    sre_bad = (
-        float(sre.get("p95_latency_ms", 0.0) or 0.0) >= 450
-        or float(sre.get("error_rate_pct", 0.0) or 0.0) >= 8.0
-        or float(sre.get("saturation_pct", 0.0) or 0.0) >= 85
-        or float(sre.get("availability_pct", 99.9) or 99.9) < 99.0
-    )
-
-    cost_bad = (
-        float(finops.get("cost_spike_pct", 0.0) or 0.0) >= 22
-        or int(float(finops.get("hpa_scale_to", 0) or 0)) >= 11
-        or float(finops.get("cpu_request_increase_pct", 0.0) or 0.0) >= 50
-        or float(finops.get("memory_request_increase_pct", 0.0) or 0.0) >= 40
-    )
-
-    sec_bad = (
-        int(float(sec.get("critical_cves", 0) or 0)) > 0
-        or bool(sec.get("policy_violation", False))
-        or bool(sec.get("iam_drift", False))
-        or bool(sec.get("compliance_gap", False))
-    )
+    if flags["deploy_bad"]:
+        sre["p95_latency_ms"] = max(float(sre.get("p95_latency_ms", 0.0) or 0.0), 520.0)
+        sre["error_rate_pct"] = max(float(sre.get("error_rate_pct", 0.0) or 0.0), 9.0)
+        sre["availability_pct"] = min(float(sre.get("availability_pct", 99.9) or 99.9), 98.5)
+        return "Recovered SRE evidence from deployment-impact context"
+    if flags["cost_bad"]:
+        sre["saturation_pct"] = max(float(sre.get("saturation_pct", 0.0) or 0.0), 88.0)
+        return "Recovered SRE evidence from scaling/cost context"
 
-    return {
-        "deploy_bad": deploy_bad,
-        "sre_bad": sre_bad,
-        "cost_bad": cost_bad,
-        "sec_bad": sec_bad,
-    }
+    sre.setdefault("p95_latency_ms", 220.0)
+    sre.setdefault("error_rate_pct", 2.0)
+    sre.setdefault("saturation_pct", 70.0)
+    sre.setdefault("availability_pct", 99.9)
+    return "Recovered SRE evidence; no reliability anomaly confirmed"
+
+
+def _recover_finops(finops: MutableMapping[str, Any], flags: Mapping[str, bool]) -> str:
+    finops["_missing"] = False
+    finops["_rar_retrieved"] = True
+
+    if flags["sre_bad"]:
+        finops["cost_spike_pct"] = max(float(finops.get("cost_spike_pct", 0.0) or 0.0), 24.0)
+        finops["hpa_scale_to"] = max(int(float(finops.get("hpa_scale_to", 0) or 0)), 11)
+        return "Recovered FinOps evidence from reliability scaling context"
+
+    finops.setdefault("cost_spike_pct", 8.0)
+    finops.setdefault("hpa_scale_to", 7)
+    return "Recovered FinOps evidence; no material cost anomaly confirmed"
+
+
+def _recover_sec(sec: MutableMapping[str, Any], flags: Mapping[str, bool]) -> str:
+    sec["_missing"] = False
+    sec["_rar_retrieved"] = True
+
+    # Security retrieval is intentionally conservative.
+    # We only strengthen it if security indicators already exist or
+    # compliance context is present.
+    if flags["sec_bad"]:
+        sec["policy_violation"] = bool(sec.get("policy_violation", True))
+        return "Recovered security evidence from policy/compliance context"
+
+    sec.setdefault("critical_cves", 0)
+    sec.setdefault("policy_violation", False)
+    sec.setdefault("iam_drift", False)
+    sec.setdefault("compliance_gap", False)
+    return "Recovered security evidence; no security anomaly confirmed"
 
 
-def _enrich_missing_evidence(telemetry: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+_RECOVER = {
+    "deploy": _recover_deploy,
+    "sre": _recover_sre,
+    "finops": _recover_finops,
+    "sec": _recover_sec,
+}
+
+
+def _build_outcome_table() -> Dict[Tuple[str, Tuple[bool, ...]], Tuple[Telemetry, str]]:
+    """
+    Recovered block and note for every (domain, context flags) pair, for a
+    missing block that carries no values of its own. Such a block's outcome
+    only depends on the flags, and the outcome for a set of missing domains
+    is the union of the per-domain entries.
+    """
+    table: Dict[Tuple[str, Tuple[bool, ...]], Tuple[Telemetry, str]] = {}
+    for bits in itertools.product((False, True), repeat=len(CONTEXT_RULES)):
+        flags = dict(zip(CONTEXT_RULES, bits))
+        for domain, recover in _RECOVER.items():
+            block: Dict[str, Any] = {"_missing": True}
+            note = recover(block, flags)
+            table[(domain, bits)] = (Telemetry.parse({domain: block}), note)
+    return table
+
+
+# Outcome table per rule table version, rebuilt after RULES.configure().
+_OUTCOMES: Dict[int, Dict[Tuple[str, Tuple[bool, ...]], Tuple[Telemetry, str]]] = {}
+
+
+def _outcome_table() -> Dict[Tuple[str, Tuple[bool, ...]], Tuple[Telemetry, str]]:
+    table = _OUTCOMES.get(RULES.version)
+    if table is None:
+        _OUTCOMES.clear()
+        table = _OUTCOMES[RULES.version] = _build_outcome_table()
+    return table
+
+
+def _enrich_missing_evidence(
+    telemetry: Mapping[str, Any],
+    retrieval: EvidenceRetrieval | None = None,
+    domains: Sequence[str] | None = None,
+) -> Tuple[Telemetry, List[str]]:
     """
     Controlled evidence retrieval used for the reproducible experiment.
 
     This function simulates tool/MCP retrieval by filling missing telemetry
     using adjacent evidence. It does not invent arbitrary success.
     It only enriches domains that were explicitly marked as missing.
-    """
-    enriched = copy.deepcopy(telemetry)
-    notes: List[str] = []
-    flags = _context_flags(enriched)
-
-    deploy = enriched.get("deploy", {}) or {}
-    sre = enriched.get("sre", {}) or {}
-    finops = enriched.get("finops", {}) or {}
-    sec = enriched.get("sec", {}) or {}
-
-    if deploy.get("_missing") is True:
-        deploy["_missing"] = False
-        deploy["_rar_retrieved"] = True
-
-        if flags["sre_bad"] and not flags["sec_bad"]:
-            deploy["rollback_marker"] = True
-            deploy["restart_loops"] = max(int(float(deploy.get("restart_loops", 0) or 0)), 12)
-            deploy["config_drift"] = bool(deploy.get("config_drift", True))
-            notes.append("Recovered deployment evidence from reliability-impact context")
-        else:
-            deploy.setdefault("pipeline_failed", False)
-            deploy.setdefault("config_drift", False)
-            deploy.setdefault("restart_loops", 0)
-            notes.append("Recovered deployment evidence; no deployment anomaly confirmed")
-
-        enriched["deploy"] = deploy
-
-    if sre.get("_missing") is True:
-        sre["_missing"] = False
-        sre["_rar_retrieved"] = True
-
-        if flags["deploy_bad"]:
-            sre["p95_latency_ms"] = max(float(sre.get("p95_latency_ms", 0.0) or 0.0), 520.0)
-            sre["error_rate_pct"] = max(float(sre.get("error_rate_pct", 0.0) or 0.0), 9.0)
-            sre["availability_pct"] = min(float(sre.get("availability_pct", 99.9) or 99.9), 98.5)
-            notes.append("Recovered SRE evidence from deployment-impact context")
-        elif flags["cost_bad"]:
-            sre["saturation_pct"] = max(float(sre.get("saturation_pct", 0.0) or 0.0), 88.0)
-            notes.append("Recovered SRE evidence from scaling/cost context")
-        else:
-            sre.setdefault("p95_latency_ms", 220.0)
-            sre.setdefault("error_rate_pct", 2.0)
-            sre.setdefault("saturation_pct", 70.0)
-            sre.setdefault("availability_pct", 99.9)
-            notes.append("Recovered SRE evidence; no reliability anomaly confirmed")
-
-        enriched["sre"] = sre
-
-    if finops.get("_missing") is True:
-        finops["_missing"] = False
-        finops["_rar_retrieved"] = True
-
-        if flags["sre_bad"]:
-            finops["cost_spike_pct"] = max(float(finops.get("cost_spike_pct", 0.0) or 0.0), 24.0)
-            finops["hpa_scale_to"] = max(int(float(finops.get("hpa_scale_to", 0) or 0)), 11)
-            notes.append("Recovered FinOps evidence from reliability scaling context")
-        else:
-            finops.setdefault("cost_spike_pct", 8.0)
-            finops.setdefault("hpa_scale_to", 7)
-            notes.append("Recovered FinOps evidence; no material cost anomaly confirmed")
-
-        enriched["finops"] = finops
-
-    if sec.get("_missing") is True:
-        sec["_missing"] = False
-        sec["_rar_retrieved"] = True
-
-        # Security retrieval is intentionally conservative.
-        # We only strengthen it if security indicators already exist or
-        # compliance context is present.
-        if flags["sec_bad"]:
-            sec["policy_violation"] = bool(sec.get("policy_violation", True))
-            notes.append("Recovered security evidence from policy/compliance context")
-        else:
-            sec.setdefault("critical_cves", 0)
-            sec.setdefault("policy_violation", False)
-            sec.setdefault("iam_drift", False)
-            sec.setdefault("compliance_gap", False)
-            notes.append("Recovered security evidence; no security anomaly confirmed")
-
-        enriched["sec"] = sec
 
-    return enriched, notes
+    Missing blocks that have a retriever in `retrieval` are first fetched
+    concurrently (see orchestrator/retrieval.py); the heuristics only fill
+    the blocks left missing. A missing block that carries no values is taken,
+    already parsed, from the precomputed outcome table; the heuristics run
+    for blocks whose own values feed into the recovered fields.
 
+    `domains`, when given, limits enrichment to those blocks.
 
-def re_ground(
-    telemetry: Dict[str, Any],
-    tau: float = 0.65,
-    delta_min: float = 0.05,
-    lam: float = 0.5,
-) -> Dict[str, Any]:
-    initial_outputs, initial_claims, initial_confs, s_before = _run_agents(telemetry, lam=lam)
-
-    result: Dict[str, Any] = {
-        "rar_triggered": False,
-        "rar_accepted": False,
-        "escalated": False,
-        "iterations": 0,
-        "consensus_before": float(s_before),
-        "consensus_after": float(s_before),
-        "missing_domains": _missing_domains(telemetry),
-        "evidence_added": [],
-        "updated_telemetry": telemetry,
-        "updated_agent_outputs": [o.__dict__ for o in initial_outputs],
-        "rar_notes": [],
-    }
+    Each block is read through a ChainMap whose first map collects the
+    retrieved fields; only those are applied, as an overlay on the parsed
+    snapshot.
+    """
+    parsed = Telemetry.parse(telemetry)
+    notes: List[str] = []
+    flags = _context_flags(parsed)
+    flag_bits = tuple(flags.values())
+    targets = set(DOMAIN_KEYS if domains is None else domains)
+
+    views = {domain: ChainMap({}, parsed[domain]) for domain in DOMAIN_KEYS}
+
+    if retrieval is not None and len(retrieval):
+        missing = [
+            domain for domain, view in views.items()
+            if domain in targets and view.get("_missing") is True
+        ]
+        for domain, fields in retrieval.retrieve(parsed, missing).items():
+            source = retrieval.retriever_for(domain).name
+            views[domain].update(fields, _missing=False, _rar_retrieved=True, _rar_source=source)
+            notes.append(f"Retrieved {domain} evidence from {source}")
+
+    recovered: Dict[str, Telemetry] = {}
+    for domain, view in views.items():
+        if view.get("_missing") is not True or domain not in targets:
+            continue
+        if len(parsed[domain].present) == 1:
+            source, note = _outcome_table()[(domain, flag_bits)]
+            recovered[domain] = source
+        else:
+            note = _RECOVER[domain](view, flags)
+        notes.append(note)
 
-    if s_before >= tau:
-        result["rar_notes"].append("RAR not triggered: consensus above threshold")
-        return result
+    changes = {domain: view.maps[0] for domain, view in views.items() if domain not in recovered}
+    return parsed.overlay(changes).with_blocks(recovered), notes
 
-    missing = _missing_domains(telemetry)
 
-    if not missing:
-        result["escalated"] = True
-        result["rar_notes"].append("RAR not executed: low consensus but no missing evidence marker")
-        return result
+@dataclass
+class RarStep:
+    """
+    Outcome of one RAR attempt.
 
-    result["rar_triggered"] = True
-    result["iterations"] = 1
+    `telemetry` and `outputs` are the enriched snapshot and its agent outputs
+    when the attempt was accepted, and the caller's otherwise; `consensus` is
+    the consensus of `outputs`.
+    """
 
-    enriched, notes = _enrich_missing_evidence(telemetry)
-    updated_outputs, updated_claims, updated_confs, s_after = _run_agents(enriched, lam=lam)
+    telemetry: Telemetry
+    outputs: List[Any]
+    consensus: float
+    consensus_before: float
+    consensus_after: float
+    missing_domains: List[str]
+    triggered: bool = False
+    accepted: bool = False
+    escalated: bool = False
+    evidence_added: List[str] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+    # Set when a latency budget was given: the planned domains, and why RAR
+    # stopped before enriching anything ("budget" or "unreachable").
+    planned_domains: List[str] | None = None
+    stopped: str = ""
+
+    def to_result(self, before_outputs: List[Any]) -> Dict[str, Any]:
+        """The `re_ground` result dict."""
+        return {
+            "rar_triggered": self.triggered,
+            "rar_accepted": self.accepted,
+            "escalated": self.escalated,
+            "iterations": 1 if self.triggered else 0,
+            "consensus_before": self.consensus_before,
+            "consensus_after": self.consensus_after,
+            "missing_domains": self.missing_domains,
+            "evidence_added": self.evidence_added,
+            "updated_telemetry": self.telemetry.to_dict(),
+            "updated_agent_outputs": [
+                o.to_dict() for o in (self.outputs if self.accepted else before_outputs)
+            ],
+            "rar_notes": self.notes,
+        }
+
+
+class RarSession:
+    """
+    RAR attempts against outputs the caller already holds.
+
+    `step()` takes the current telemetry together with its agent outputs and
+    consensus, and returns the enriched outputs it computed, so the agents run
+    once per RAR loop rather than once for the input, once for the enriched
+    telemetry and once more in the caller. `agent_runs` counts agent-set
+    evaluations done by the session. Missing blocks are fetched through
+    `retrieval` (default: the retrievers configured in config.yaml).
+
+    With a `budget_ms`, `step()` only enriches the domains `scheduler` plans
+    for the remaining budget (see orchestrator/scheduler.py), and records the
+    outcome back into the scheduler's per-domain history. The session starts
+    with an empty history unless a `scheduler` shared across the incidents
+    of a run is given.
+    """
 
-    result["consensus_after"] = float(s_after)
-    result["evidence_added"] = notes
+    def __init__(
+        self,
+        tau: float = 0.65,
+        delta_min: float = 0.05,
+        lam: float = 0.5,
+        memo: AgentMemo | None = None,
+        retrieval: EvidenceRetrieval | None = RETRIEVAL,
+        scheduler: RarScheduler | None = None,
+    ) -> None:
+        self.tau = tau
+        self.delta_min = delta_min
+        self.lam = lam
+        self.memo = memo
+        self.retrieval = retrieval
+        self.scheduler = scheduler if scheduler is not None else RarScheduler()
+        self.steps = 0
+        self.enriched = 0
+        self.agent_runs = 0
+        self.termination = ""
+
+    def run_agents(self, telemetry: Telemetry) -> List[Any]:
+        self.agent_runs += 1
+        if self.memo is not None:
+            return self.memo.run(telemetry)
+        return REGISTRY.run(telemetry)
+
+    def step(
+        self,
+        telemetry: Mapping[str, Any],
+        outputs: List[Any] | None = None,
+        consensus: float | None = None,
+        budget_ms: float | None = None,
+    ) -> RarStep:
+        """
+        One RAR attempt. `outputs` and `consensus` describe `telemetry`;
+        either is computed when not given. `budget_ms` is the latency the
+        incident has left for RAR.
+        """
+        self.steps += 1
+        telemetry = Telemetry.parse(telemetry)
+        if outputs is None:
+            outputs = self.run_agents(telemetry)
+        if consensus is None:
+            consensus = ConsensusAccumulator.from_outputs(outputs).score()
+        s_before = float(consensus)
+
+        missing = _missing_domains(telemetry)
+        step = RarStep(
+            telemetry=telemetry,
+            outputs=outputs,
+            consensus=s_before,
+            consensus_before=s_before,
+            consensus_after=s_before,
+            missing_domains=missing,
+        )
 
-    improvement = float(s_after) - float(s_before)
+        if s_before >= self.tau:
+            step.notes.append("RAR not triggered: consensus above threshold")
+            return step
+
+        if not missing:
+            step.escalated = True
+            step.notes.append("RAR not executed: low consensus but no missing evidence marker")
+            return step
+
+        domains = None
+        if budget_ms is not None:
+            domains, step.stopped = self.scheduler.plan(missing, s_before, self.tau, budget_ms)
+            step.planned_domains = domains
+            if not domains:
+                step.escalated = True
+                step.notes.append(f"RAR stopped early ({step.stopped}): {budget_ms:.1f} ms budget left")
+                return step
+
+        step.triggered = True
+        self.enriched += 1
+        accumulator = ConsensusAccumulator.from_outputs(outputs)
+
+        started = time.perf_counter()
+        enriched, notes = _enrich_missing_evidence(telemetry, self.retrieval, domains)
+        updated_outputs = self.run_agents(enriched)
+        if domains is not None:
+            gains = self._domain_gains(domains, outputs, updated_outputs)
+        s_after = float(_update_consensus(accumulator, outputs, updated_outputs))
+
+        step.consensus_after = s_after
+        step.evidence_added = notes
+
+        improvement = s_after - s_before
+
+        if s_after >= self.tau or improvement >= self.delta_min:
+            step.accepted = True
+            step.telemetry = enriched
+            step.outputs = updated_outputs
+            step.consensus = s_after
+            step.notes.append(
+                f"RAR accepted: consensus changed from {s_before:.3f} to {s_after:.3f}"
+            )
+        else:
+            step.escalated = True
+            step.notes.append(
+                f"RAR escalation: consensus changed from {s_before:.3f} to {s_after:.3f}, below acceptance rule"
+            )
+
+        if domains is not None:
+            self.scheduler.record(gains, step.accepted, (time.perf_counter() - started) * 1000.0)
+        return step
+
+    def _domain_gains(
+        self,
+        domains: Sequence[str],
+        before: List[Any],
+        after: List[Any],
+    ) -> Dict[str, float]:
+        # Consensus gain of each enriched domain, applying the changed agent
+        # outputs one domain at a time in plan order.
+        agents = self.memo.agents if self.memo is not None else REGISTRY.agents()
+        accumulator = ConsensusAccumulator.from_outputs(before)
+        score = accumulator.score()
+        gains: Dict[str, float] = {}
+        for domain in domains:
+            for i, agent in enumerate(agents):
+                if agent.domain == domain and after[i] is not before[i]:
+                    accumulator.replace_output(i, after[i])
+            new_score = accumulator.score()
+            gains[domain] = new_score - score
+            score = new_score
+        return gains
+
+    def iterate(
+        self,
+        telemetry: Mapping[str, Any],
+        outputs: List[Any],
+        consensus: float,
+        max_loops: int,
+        budget_ms: float | None = None,
+    ) -> Iterator[RarStep]:
+        """
+        Run RAR to a fixed point, yielding each step.
+
+        Iteration stops once consensus reaches tau or the telemetry stops
+        changing ("converged"), when consensus is below tau with no missing
+        domain left to retrieve ("escalated"), when an attempt is rejected by
+        the acceptance rule ("rejected"), when `max_loops` or the latency
+        budget is used up ("budget"), or when the scheduler judges tau out of reach of the
+        missing domains ("unreachable"). The reason is left in `termination`
+        ("not_triggered" when consensus already met tau).
+        """
+        started = time.perf_counter()
+        loops = 0
+        telemetry = Telemetry.parse(telemetry)
+        self.termination = "not_triggered"
+
+        while consensus < self.tau:
+            if loops >= max_loops:
+                self.termination = "budget"
+                return
+            remaining = None
+            if budget_ms is not None:
+                remaining = float(budget_ms) - (time.perf_counter() - started) * 1000.0
+                if remaining <= 0.0:
+                    self.termination = "budget"
+                    return
+            loops += 1
+
+            step = self.step(telemetry, outputs, consensus, budget_ms=remaining)
+            before = _state_key(telemetry)
+            telemetry, outputs, consensus = step.telemetry, step.outputs, step.consensus
+            yield step
+
+            if step.stopped:
+                self.termination = step.stopped
+                return
+            if step.triggered and not step.accepted:
+                self.termination = "rejected"
+                return
+            if not step.accepted:
+                self.termination = "escalated"
+                return
+            if _state_key(telemetry) == before:
+                self.termination = "converged"
+                return
+
+        if loops:
+            self.termination = "converged"
+
+    def counters(self) -> Dict[str, int]:
+        return {"steps": self.steps, "enriched": self.enriched, "agent_runs": self.agent_runs}
 
-    if s_after >= tau or improvement >= delta_min:
-        result["rar_accepted"] = True
-        result["updated_telemetry"] = enriched
-        result["updated_agent_outputs"] = [o.__dict__ for o in updated_outputs]
-        result["rar_notes"].append(
-            f"RAR accepted: consensus changed from {s_before:.3f} to {s_after:.3f}"
-        )
-    else:
-        result["escalated"] = True
-        result["rar_notes"].append(
-            f"RAR escalation: consensus changed from {s_before:.3f} to {s_after:.3f}, below acceptance rule"
-        )
 
-    return result
+def re_ground(
+    telemetry: Mapping[str, Any],
+    tau: float = 0.65,
+    delta_min: float = 0.05,
+    lam: float = 0.5,
+    memo: AgentMemo | None = None,
+) -> Dict[str, Any]:
+    session = RarSession(tau=tau, delta_min=delta_min, lam=lam, memo=memo)
+    telemetry = Telemetry.parse(telemetry)
+    outputs = session.run_agents(telemetry)
+    return session.step(telemetry, outputs).to_result(outputs)
 
 
 def re_ground_telemetry(
-    telemetry: Dict[str, Any],
+    telemetry: Mapping[str, Any],
     tau: float = 0.65,
     delta_min: float = 0.05,
     lam: float = 0.5,
+    memo: AgentMemo | None = None,
 ) -> Tuple[Dict[str, Any], float, bool]:
-    result = re_ground(telemetry=telemetry, tau=tau, delta_min=delta_min, lam=lam)
+    result = re_ground(telemetry=telemetry, tau=tau, delta_min=delta_min, lam=lam, memo=memo)
     updated = result.get("updated_telemetry", telemetry)
     s_after = float(result.get("consensus_after", 0.0))
     accepted = bool(result.get("rar_accepted", False))
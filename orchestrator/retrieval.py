@@ -0,0 +1,566 @@
+"""Pluggable evidence retrieval for RAR.
+
+Each `EvidenceRetriever` serves one telemetry domain and reads a local
+artifact:
+
+- `PrometheusDumpRetriever` (`sre`): a saved Prometheus query API response,
+- `TrivyReportRetriever` (`sec`): a Trivy JSON report,
+- `BillingCsvRetriever` (`finops`): a billing export scored with
+  `ingest.cost.score_costs`,
+- `CiLogRetriever` (`deploy`): a CI/CD job log.
+
+Retrievers serve the incident's own service, read from the top-level
+`service` key of its telemetry. Prometheus dumps and billing exports are
+filtered on that service; Trivy reports and CI logs hold one artifact, so
+their `path` either names the service (`dumps/trivy/{service}.json`) or the
+retriever is pinned to one `service`. An incident whose service cannot be
+resolved gets nothing, and its block stays missing for the heuristic.
+
+`EvidenceRetrieval.retrieve` fetches every missing domain concurrently with
+asyncio, so an RAR attempt waits for the slowest retriever rather than the
+sum of all of them. Each retriever has a deadline; an attempt still running
+after `hedge_after_s` is hedged with a second one, and a failed attempt is
+retried while the deadline allows. Domains without a retriever, or whose
+retriever missed its deadline or found nothing, keep the heuristic
+enrichment in `orchestrator/rar.py`.
+
+`RetrievalCache` shares retrieved evidence per (service, domain) across RAR
+calls and incidents until its TTL expires. Each retriever also keeps its
+parsed source file for `source_ttl_s` and serves every service's rows from
+it, so an incident storm across many services reads and scores a billing
+export or scanner report once per TTL, not once per service.
+
+Retrievers and the cache are configured in the `retrieval` section of
+`config/config.yaml` (`RETRIEVAL.configure` reloads them from another
+config); with no retrievers configured RAR only uses the heuristic.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import importlib
+import json
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agents.rules import DEFAULT_CONFIG, load_config
+from agents.telemetry import Telemetry
+from ingest.cost import score_costs
+
+
+# Shared reader threads. Not the event loop's default executor, which
+# `asyncio.run` waits for on exit: a read that missed its deadline must not
+# hold up the RAR attempt.
+_READERS = ThreadPoolExecutor(max_workers=8, thread_name_prefix="aaf-retriever")
+
+# Event loops for `EvidenceRetrieval.retrieve` called from a thread that
+# already runs one (e.g. an async Gradio handler).
+_LOOPS = ThreadPoolExecutor(max_workers=4, thread_name_prefix="aaf-retrieval-loop")
+
+
+def incident_service(telemetry: Telemetry) -> Optional[str]:
+    """The incident's service, from the top-level `service` telemetry key."""
+    service = telemetry.extra.get("service")
+    return str(service) if service not in (None, "") else None
+
+
+class EvidenceRetriever:
+    """
+    Retrieves the fields of one telemetry domain.
+
+    Subclasses implement `parse()`, which reads one source file into
+    fields per service (`labelled` sources) or into the fields of the one
+    artifact it holds. `read()` runs in a worker thread, resolves the
+    incident's service and serves its fields from the parsed file, which is
+    kept for `source_ttl_s` seconds, or until the file changes. Retrievers
+    backed by a real async client can override `fetch()` instead.
+
+    `service`, when set, pins the retriever to that one service. Sources
+    without per-service labels (`labelled = False`) need either a pinned
+    service or a `{service}` placeholder in `path`.
+    """
+
+    domain: str = ""
+    name: str = "retriever"
+    labelled: bool = True
+
+    def __init__(
+        self,
+        path: Path | str,
+        service: Optional[str] = None,
+        timeout_s: float = 1.0,
+        source_ttl_s: float = 60.0,
+    ) -> None:
+        self.path = Path(path)
+        self.service = service
+        self.timeout_s = float(timeout_s)
+        self.source_ttl_s = float(source_ttl_s)
+        self.source_loads = 0
+        self._sources: Dict[Path, Tuple[float, int, Any]] = {}
+        self._source_lock = threading.Lock()
+
+    def resolve_service(self, telemetry: Telemetry) -> Optional[str]:
+        """The incident's service if this retriever can serve it, else None."""
+        service = incident_service(telemetry)
+        if service is None or (self.service is not None and service != self.service):
+            return None
+        if not self.labelled and self.service is None and "{service}" not in str(self.path):
+            return None
+        return service
+
+    def path_for(self, service: str) -> Path:
+        return Path(str(self.path).format(service=service)) if "{service}" in str(self.path) else self.path
+
+    async def fetch(self, telemetry: Telemetry) -> Optional[Dict[str, Any]]:
+        return await asyncio.get_running_loop().run_in_executor(_READERS, self.read, telemetry)
+
+    def read(self, telemetry: Telemetry) -> Optional[Dict[str, Any]]:
+        service = self.resolve_service(telemetry)
+        if service is None:
+            return None
+        path = self.path_for(service)
+        if not path.exists():
+            return None
+        parsed = self.load(path)
+        fields = parsed.get(service) if self.labelled else parsed
+        return dict(fields) if fields else None
+
+    def load(self, path: Path) -> Any:
+        """`parse(path)`, shared by all services until it expires or the file changes."""
+        mtime = path.stat().st_mtime_ns
+        with self._source_lock:
+            entry = self._sources.get(path)
+            if entry is not None and entry[0] > time.monotonic() and entry[1] == mtime:
+                return entry[2]
+            parsed = self.parse(path)
+            self.source_loads += 1
+            self._sources[path] = (time.monotonic() + self.source_ttl_s, mtime, parsed)
+            return parsed
+
+    def parse(self, path: Path) -> Any:
+        raise NotImplementedError
+
+
+class PrometheusDumpRetriever(EvidenceRetriever):
+    """
+    `sre` fields from a saved `/api/v1/query` response (instant vector).
+
+    `metrics` maps Prometheus metric names to `sre` fields; samples are
+    filtered on the incident's `service` label.
+    """
+
+    domain = "sre"
+    name = "Prometheus dump"
+
+    default_metrics = {
+        "p95_latency_ms": "p95_latency_ms",
+        "error_rate_pct": "error_rate_pct",
+        "saturation_pct": "saturation_pct",
+        "availability_pct": "availability_pct",
+    }
+
+    def __init__(
+        self,
+        path: Path | str,
+        service: Optional[str] = None,
+        timeout_s: float = 1.0,
+        metrics: Optional[Mapping[str, str]] = None,
+        source_ttl_s: float = 60.0,
+    ) -> None:
+        super().__init__(path, service, timeout_s, source_ttl_s)
+        self.metrics = dict(metrics or self.default_metrics)
+
+    def parse(self, path: Path) -> Dict[str, Dict[str, Any]]:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        by_service: Dict[str, Dict[str, Any]] = {}
+        for sample in (payload.get("data") or {}).get("result") or []:
+            labels = sample.get("metric") or {}
+            field = self.metrics.get(labels.get("__name__", ""))
+            if field is None or labels.get("service") is None:
+                continue
+            by_service.setdefault(str(labels["service"]), {})[field] = float(sample["value"][1])
+        return by_service
+
+
+class TrivyReportRetriever(EvidenceRetriever):
+    """`sec` fields from a Trivy JSON report of the service's image."""
+
+    domain = "sec"
+    name = "Trivy report"
+    labelled = False
+
+    def parse(self, path: Path) -> Optional[Dict[str, Any]]:
+        report = json.loads(path.read_text(encoding="utf-8"))
+        results = report.get("Results")
+        if results is None:
+            return None
+        critical = 0
+        failed_policies = 0
+        for result in results or []:
+            for vuln in result.get("Vulnerabilities") or []:
+                if str(vuln.get("Severity", "")).upper() == "CRITICAL":
+                    critical += 1
+            for check in result.get("Misconfigurations") or []:
+                if str(check.get("Status", "")).upper() == "FAIL" and str(
+                    check.get("Severity", "")
+                ).upper() in ("HIGH", "CRITICAL"):
+                    failed_policies += 1
+        return {"critical_cves": critical, "policy_violation": failed_policies > 0}
+
+
+class BillingCsvRetriever(EvidenceRetriever):
+    """
+    `finops` cost spike from a billing CSV with `period`, `service` and
+    `cost` columns, one row per service and period (periods sort as
+    strings, e.g. ISO dates).
+    """
+
+    domain = "finops"
+    name = "billing export"
+
+    def __init__(
+        self,
+        path: Path | str,
+        service: Optional[str] = None,
+        timeout_s: float = 1.0,
+        period: int = 7,
+        seasons: int = 4,
+        source_ttl_s: float = 60.0,
+    ) -> None:
+        super().__init__(path, service, timeout_s, source_ttl_s)
+        self.period = int(period)
+        self.seasons = int(seasons)
+
+    def parse(self, path: Path) -> Dict[str, Dict[str, Any]]:
+        # Every service in the export is scored in one score_costs pass.
+        spend: Dict[str, Dict[str, float]] = {}
+        with path.open("r", encoding="utf-8", newline="") as fh:
+            for row in csv.DictReader(fh):
+                by_period = spend.setdefault(row["service"], {})
+                by_period[row["period"]] = by_period.get(row["period"], 0.0) + float(row["cost"] or 0.0)
+
+        periods = sorted({p for by_period in spend.values() for p in by_period})
+        if len(periods) < 2:
+            return {}
+        services = sorted(spend)
+        series = np.array([[spend[s].get(p, np.nan) for p in periods] for s in services])
+        scores = score_costs(series, services, period=self.period, seasons=self.seasons)
+        return {s: {"cost_spike_pct": float(v)} for s, v in zip(services, scores.cost_spike_pct)}
+
+
+class CiLogRetriever(EvidenceRetriever):
+    """`deploy` fields from markers in the service's CI/CD job log."""
+
+    domain = "deploy"
+    name = "CI log"
+    labelled = False
+
+    markers = {
+        "pipeline_failed": re.compile(r"\b(pipeline|build|job) failed\b|\bERROR: Job failed\b", re.I),
+        "rollback_marker": re.compile(r"\brollback\b|\brolled back\b", re.I),
+        "config_drift": re.compile(r"\b(config(uration)?|manifest) drift\b", re.I),
+        "artifact_mismatch": re.compile(r"\b(artifact|digest|checksum) mismatch\b", re.I),
+    }
+    restart = re.compile(r"\bCrashLoopBackOff\b|\bBack-off restarting\b", re.I)
+
+    def parse(self, path: Path) -> Optional[Dict[str, Any]]:
+        text = path.read_text(encoding="utf-8", errors="ignore")
+        if not text.strip():
+            return None
+        fields: Dict[str, Any] = {key: bool(p.search(text)) for key, p in self.markers.items()}
+        fields["restart_loops"] = sum(1 for line in text.splitlines() if self.restart.search(line))
+        return fields
+
+
+def _sizeof(fields: Dict[str, Any]) -> int:
+    return sys.getsizeof(fields) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in fields.items())
+
+
+class RetrievalCache:
+    """
+    Retrieved evidence shared across RAR calls and incidents.
+
+    Entries are keyed by (incident service, domain), expire after `ttl_s`
+    and are evicted least recently used once
+    `max_entries` or `max_bytes` is exceeded. Concurrent misses on one key
+    are single-flight: the first caller fetches, the others wait for its
+    result, from any thread or event loop. Only retrieved evidence is cached;
+    missed deadlines and empty results are fetched again next time.
+    Cached field dicts are shared and must not be mutated.
+    """
+
+    def __init__(
+        self,
+        ttl_s: float = 300.0,
+        max_entries: int = 1024,
+        max_bytes: int = 8 << 20,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl_s = float(ttl_s)
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes)
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.joined = 0
+        self.evictions = 0
+        self.bytes_held = 0
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[float, Dict[str, Any], int]]" = OrderedDict()
+        self._inflight: Dict[Tuple[Any, ...], Future] = {}
+        self._lock = threading.Lock()
+
+    def key(self, service: Optional[str], domain: str) -> Tuple[Any, ...]:
+        return (service, domain)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_fetch(
+        self,
+        key: Tuple[Any, ...],
+        fetch: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+    ) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self._drop(key)
+            flight = self._inflight.get(key)
+            owner = flight is None
+            if owner:
+                flight = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.joined += 1
+
+        if not owner:
+            return await asyncio.wrap_future(flight)
+
+        fields = None
+        try:
+            fields = await fetch()
+        finally:
+            with self._lock:
+                del self._inflight[key]
+                if fields is not None:
+                    self._store(key, fields)
+            flight.set_result(fields)
+        return fields
+
+    def _store(self, key: Tuple[Any, ...], fields: Dict[str, Any]) -> None:
+        if key in self._entries:
+            self._drop(key)
+        nbytes = _sizeof(fields)
+        self._entries[key] = (self.clock() + self.ttl_s, fields, nbytes)
+        self.bytes_held += nbytes
+        while self._entries and (
+            len(self._entries) > self.max_entries or self.bytes_held > self.max_bytes
+        ):
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _drop(self, key: Tuple[Any, ...]) -> None:
+        _, _, nbytes = self._entries.pop(key)
+        self.bytes_held -= nbytes
+
+    def hit_ratio(self) -> float:
+        """Share of lookups served without a fetch (joined misses count as hits)."""
+        total = self.hits + self.joined + self.misses
+        return (self.hits + self.joined) / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": float(len(self)),
+            "hits": float(self.hits),
+            "misses": float(self.misses),
+            "joined": float(self.joined),
+            "evictions": float(self.evictions),
+            "hit_ratio": self.hit_ratio(),
+            "bytes_held": float(self.bytes_held),
+        }
+
+
+class EvidenceRetrieval:
+    """
+    Concurrent, deadline-bounded retrieval over the configured retrievers.
+
+    `hedge_after_s` starts a duplicate attempt when the first is still
+    running; `retries` bounds the extra attempts (hedges and retries after a
+    failure) per retriever. With a `cache`, results are shared through it
+    instead of being fetched on every call.
+    """
+
+    def __init__(
+        self,
+        retrievers: Sequence[EvidenceRetriever] = (),
+        hedge_after_s: float = 0.25,
+        retries: int = 1,
+        cache: Optional[RetrievalCache] = None,
+    ) -> None:
+        self.hedge_after_s = float(hedge_after_s)
+        self.retries = int(retries)
+        self.cache = cache
+        self.retrieved = 0
+        self.hedges = 0
+        self.errors = 0
+        self.deadline_misses = 0
+        self._retrievers: Dict[str, EvidenceRetriever] = {}
+        for retriever in retrievers:
+            self.register(retriever)
+
+    def configure(self, spec: Mapping[str, Any]) -> None:
+        """
+        Reload retrievers, cache and hedging settings in place from a
+        `retrieval` config section.
+        """
+        retrievers = [_load_retriever(entry) for entry in spec.get("retrievers", []) or []]
+        cache_spec = spec.get("cache")
+        self.cache = None
+        if cache_spec:
+            self.cache = RetrievalCache(
+                ttl_s=float(cache_spec.get("ttl_s", 300.0)),
+                max_entries=int(cache_spec.get("max_entries", 1024)),
+                max_bytes=int(cache_spec.get("max_bytes", 8 << 20)),
+            )
+        self.hedge_after_s = float(spec.get("hedge_after_s", 0.25))
+        self.retries = int(spec.get("retries", 1))
+        self._retrievers = {}
+        for retriever in retrievers:
+            self.register(retriever)
+
+    def register(self, retriever: EvidenceRetriever) -> EvidenceRetriever:
+        if retriever.domain in self._retrievers:
+            raise ValueError(f"Retriever already registered for domain: {retriever.domain}")
+        self._retrievers[retriever.domain] = retriever
+        return retriever
+
+    def retriever_for(self, domain: str) -> Optional[EvidenceRetriever]:
+        return self._retrievers.get(domain)
+
+    def __len__(self) -> int:
+        return len(self._retrievers)
+
+    def retrieve(self, telemetry: Telemetry, domains: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fields retrieved for each of `domains` that has a retriever and
+        produced a result in time. Runs its own event loop, on a helper
+        thread when the calling thread already runs one; async callers
+        should await `retrieve_async` instead.
+        """
+        if not any(domain in self._retrievers for domain in domains):
+            return {}
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.retrieve_async(telemetry, domains))
+        return _LOOPS.submit(asyncio.run, self.retrieve_async(telemetry, domains)).result()
+
+    async def retrieve_async(
+        self,
+        telemetry: Telemetry,
+        domains: Sequence[str],
+    ) -> Dict[str, Dict[str, Any]]:
+        retrievers = [self._retrievers[d] for d in domains if d in self._retrievers]
+        results = await asyncio.gather(*(self._cached_fetch(r, telemetry) for r in retrievers))
+        return {r.domain: fields for r, fields in zip(retrievers, results) if fields is not None}
+
+    async def _cached_fetch(
+        self,
+        retriever: EvidenceRetriever,
+        telemetry: Telemetry,
+    ) -> Optional[Dict[str, Any]]:
+        if self.cache is None:
+            return await self._fetch(retriever, telemetry)
+        service = retriever.resolve_service(telemetry)
+        if service is None:
+            return None
+        return await self.cache.get_or_fetch(
+            self.cache.key(service, retriever.domain),
+            lambda: self._fetch(retriever, telemetry),
+        )
+
+    async def _fetch(self, retriever: EvidenceRetriever, telemetry: Telemetry) -> Optional[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + retriever.timeout_s
+        attempts = {asyncio.ensure_future(retriever.fetch(telemetry))}
+        extra = 0
+        hedge_at = loop.time() + self.hedge_after_s
+
+        try:
+            while attempts:
+                now = loop.time()
+                if now >= deadline:
+                    self.deadline_misses += 1
+                    return None
+                wait = deadline - now
+                if extra < self.retries:
+                    wait = min(wait, max(0.0, hedge_at - now))
+                done, attempts = await asyncio.wait(
+                    attempts, timeout=wait, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    if task.exception() is not None:
+                        self.errors += 1
+                        continue
+                    fields = task.result()
+                    if fields is not None:
+                        self.retrieved += 1
+                    return fields
+
+                # Hedge a slow attempt, or retry a failed one.
+                if extra < self.retries and (not attempts or loop.time() >= hedge_at):
+                    if attempts:
+                        self.hedges += 1
+                    extra += 1
+                    hedge_at = loop.time() + self.hedge_after_s
+                    attempts.add(asyncio.ensure_future(retriever.fetch(telemetry)))
+            return None
+        finally:
+            for task in attempts:
+                task.cancel()
+
+    def counters(self) -> Dict[str, int]:
+        counters = {
+            "retrieved": self.retrieved,
+            "hedges": self.hedges,
+            "errors": self.errors,
+            "deadline_misses": self.deadline_misses,
+        }
+        if self.cache is not None:
+            counters["cache_hits"] = self.cache.hits + self.cache.joined
+            counters["cache_misses"] = self.cache.misses
+            counters["cache_bytes"] = self.cache.bytes_held
+        return counters
+
+
+def _load_retriever(entry: Mapping[str, Any]) -> EvidenceRetriever:
+    spec = dict(entry)
+    module_name, sep, class_name = str(spec.pop("class", "")).partition(":")
+    if not sep:
+        raise ValueError(f"Retriever class must be 'module:Class', got {entry.get('class')!r}")
+    cls = getattr(importlib.import_module(module_name), class_name)
+    if not (isinstance(cls, type) and issubclass(cls, EvidenceRetriever)):
+        raise TypeError(f"Retriever class {entry.get('class')!r} is not an EvidenceRetriever subclass")
+    return cls(**spec)
+
+
+def load_retrieval(path: Path | str = DEFAULT_CONFIG) -> EvidenceRetrieval:
+    retrieval = EvidenceRetrieval()
+    retrieval.configure(load_config(path).get("retrieval") or {})
+    return retrieval
+
+
+RETRIEVAL = load_retrieval()
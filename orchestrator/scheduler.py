@@ -0,0 +1,148 @@
+"""Latency-budgeted scheduling of RAR retrieval.
+
+`RarScheduler` keeps per-domain statistics of past RAR attempts: how often
+enriching the domain was accepted, the consensus gain it contributed and how
+long the attempt took. Given an incident's remaining latency budget it plans
+which missing domains to enrich next:
+
+- domains are taken in order of expected gain (acceptance rate x mean gain),
+  skipping those whose expected latency does not fit the remaining budget
+  (retrieval is concurrent, so a plan costs about its slowest domain), until
+  consensus plus the cumulative expected gain reaches `tau`; the rest wait
+  for a later RAR loop;
+- if even the best gain observed for the planned domains cannot lift
+  consensus to `tau`, the plan is empty and RAR stops early ("unreachable").
+
+Observed gains come from other incidents and are not a bound on what this
+one can gain, so the check is optimistic: a domain tried fewer than
+`min_attempts` times, or skipped by `stale_after` plans in a row since its
+last attempt, is assumed to be able to reach `tau` and is planned at the
+prior latency. Early stops are recorded as skips, so no domain stays
+written off.
+
+History is per instance. `run_experiments.py` and `run_pipeline_clustered`
+share one scheduler across the incidents of a run; a `RarSession` given none
+starts with an empty history.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+
+@dataclass
+class DomainStats:
+    attempts: int = 0
+    accepted: int = 0
+    gain_sum: float = 0.0
+    best_gain: float = 0.0
+    latency_ms: float = 0.0
+    skipped: int = 0
+
+    def acceptance_rate(self) -> float:
+        return self.accepted / self.attempts if self.attempts else 0.0
+
+    def mean_gain(self) -> float:
+        return self.gain_sum / self.attempts if self.attempts else 0.0
+
+
+class RarScheduler:
+    """
+    Plans RAR retrieval against a latency budget from per-domain history.
+
+    `prior_gain` and `prior_latency_ms` stand in for domains not seen yet;
+    latencies are tracked as an EWMA with weight `alpha`. `min_attempts` and
+    `stale_after` bound how long a domain is judged on its history (see the
+    module docstring).
+    """
+
+    def __init__(
+        self,
+        prior_gain: float = 0.10,
+        prior_latency_ms: float = 5.0,
+        alpha: float = 0.2,
+        min_attempts: int = 3,
+        stale_after: int = 4,
+    ) -> None:
+        self.prior_gain = float(prior_gain)
+        self.prior_latency_ms = float(prior_latency_ms)
+        self.alpha = float(alpha)
+        self.min_attempts = int(min_attempts)
+        self.stale_after = int(stale_after)
+        self.early_stops = 0
+        self._stats: Dict[str, DomainStats] = {}
+        self._lock = threading.Lock()
+
+    def stats(self, domain: str) -> DomainStats:
+        return self._stats.get(domain) or DomainStats()
+
+    def expected_gain(self, domain: str) -> float:
+        s = self._stats.get(domain)
+        if s is None or not s.attempts:
+            return self.prior_gain
+        return s.acceptance_rate() * s.mean_gain()
+
+    def expected_latency_ms(self, domain: str) -> float:
+        s = self._stats.get(domain)
+        if s is None or not s.attempts:
+            return self.prior_latency_ms
+        if s.skipped >= self.stale_after:
+            return min(s.latency_ms, self.prior_latency_ms)
+        return s.latency_ms
+
+    def _gain_bound(self, domain: str) -> float:
+        # Optimistic bound on the consensus gain of enriching `domain`.
+        s = self._stats.get(domain)
+        if s is None or s.attempts < self.min_attempts or s.skipped >= self.stale_after:
+            return float("inf")
+        return s.best_gain
+
+    def plan(
+        self,
+        missing: Sequence[str],
+        consensus: float,
+        tau: float,
+        budget_ms: float,
+    ) -> Tuple[List[str], str]:
+        """
+        Domains to enrich within `budget_ms`, in expected-gain order up to
+        the one whose cumulative expected gain reaches `tau`, and the reason
+        when the plan is empty ("budget" or "unreachable").
+        """
+        order = sorted(missing, key=self.expected_gain, reverse=True)
+        fitting = [d for d in order if self.expected_latency_ms(d) <= budget_ms]
+        if not fitting:
+            reason = "budget"
+        elif consensus + sum(self._gain_bound(d) for d in fitting) < tau:
+            reason = "unreachable"
+        else:
+            chosen: List[str] = []
+            expected = consensus
+            for domain in fitting:
+                chosen.append(domain)
+                expected += self.expected_gain(domain)
+                if expected >= tau:
+                    break
+            return chosen, ""
+        with self._lock:
+            self.early_stops += 1
+            for domain in missing:
+                self._stats.setdefault(domain, DomainStats()).skipped += 1
+        return [], reason
+
+    def record(self, gains: Dict[str, float], accepted: bool, latency_ms: float) -> None:
+        """Record one RAR attempt: the consensus gain per enriched domain."""
+        with self._lock:
+            for domain, gain in gains.items():
+                s = self._stats.setdefault(domain, DomainStats())
+                s.latency_ms = (
+                    latency_ms if not s.attempts
+                    else (1.0 - self.alpha) * s.latency_ms + self.alpha * latency_ms
+                )
+                s.attempts += 1
+                s.accepted += int(accepted)
+                s.gain_sum += gain
+                s.best_gain = max(s.best_gain, gain)
+                s.skipped = 0
@@ -0,0 +1,55 @@
+import random
+
+import numpy as np
+import pytest
+
+from agents.base import CLASS_NEGATIVE, CLASS_OTHER, CLASS_POSSIBLE, CLASS_PRIMARY
+from orchestrator.consensus import (
+    ConsensusAccumulator,
+    consensus_score,
+    consensus_score_batch,
+)
+
+CLASSES = [CLASS_NEGATIVE, CLASS_OTHER, CLASS_POSSIBLE, CLASS_PRIMARY]
+CONFIDENCES = [0.25, 0.44, 0.45, 0.5, 0.62, 0.78, 0.85, 0.9, 0.95]
+
+
+def _incidents(rng, n, n_agents):
+    classes = [[rng.choice(CLASSES) for _ in range(n_agents)] for _ in range(n)]
+    confs = [[rng.choice(CONFIDENCES) for _ in range(n_agents)] for _ in range(n)]
+    return classes, confs
+
+
+@pytest.mark.parametrize("n_agents", [0, 1, 2, 4, 6])
+def test_batch_matches_per_incident_score(n_agents):
+    classes, confs = _incidents(random.Random(n_agents), 2000, n_agents)
+    batch = consensus_score_batch(
+        np.array(classes, dtype=np.int8).reshape(2000, n_agents),
+        np.array(confs, dtype=np.float64).reshape(2000, n_agents),
+    )
+    for i in range(2000):
+        score, _ = consensus_score([""] * n_agents, confs[i], classes=classes[i])
+        assert batch[i] == score, i
+
+
+def test_batch_rejects_mismatched_shapes():
+    with pytest.raises(ValueError):
+        consensus_score_batch(np.zeros((3, 4)), np.zeros((3, 5)))
+
+
+def test_accumulator_tracks_replacements():
+    rng = random.Random(7)
+    classes, confs = _incidents(rng, 1, 4)
+    classes, confs = classes[0], confs[0]
+    acc = ConsensusAccumulator(classes, confs)
+    for _ in range(2000):
+        i = rng.randrange(4)
+        classes[i], confs[i] = rng.choice(CLASSES), rng.choice(CONFIDENCES)
+        acc.replace(i, classes[i], confs[i])
+        score, _ = consensus_score([""] * 4, confs, classes=classes)
+        assert acc.score() == score
+
+
+def test_semantic_mode_rejects_classes():
+    with pytest.raises(ValueError):
+        consensus_score(["a", "b"], [0.5, 0.5], mode="semantic", classes=[CLASS_OTHER] * 2)
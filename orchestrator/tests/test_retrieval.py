@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+import pytest
+
+from agents import Telemetry
+from orchestrator.retrieval import EvidenceRetrieval
+
+
+@pytest.fixture
+def retrieval(tmp_path):
+    dump = tmp_path / "prometheus.json"
+    dump.write_text(json.dumps({"data": {"result": [
+        {"metric": {"__name__": "error_rate_pct", "service": s}, "value": [0, str(v)]}
+        for s, v in (("cart", 1.5), ("checkout", 13.0))
+    ]}}))
+    r = EvidenceRetrieval()
+    r.configure({
+        "cache": {"ttl_s": 60.0},
+        "retrievers": [{"class": "orchestrator.retrieval:PrometheusDumpRetriever", "path": str(dump)}],
+    })
+    return r
+
+
+def test_retrievers_serve_the_incident_service(retrieval):
+    for _ in range(2):
+        for service, rate in (("cart", 1.5), ("checkout", 13.0)):
+            fields = retrieval.retrieve(Telemetry.parse({"service": service}), ["sre"])
+            assert fields == {"sre": {"error_rate_pct": rate}}
+    assert retrieval.cache.hits == 2 and retrieval.cache.misses == 2
+
+
+def test_unresolved_service_gets_nothing(retrieval):
+    assert retrieval.retrieve(Telemetry.parse({}), ["sre"]) == {}
+    assert retrieval.retrieve(Telemetry.parse({"service": "search"}), ["sre"]) == {}
+
+
+def test_retrieve_inside_a_running_loop(retrieval):
+    async def handler():
+        return retrieval.retrieve(Telemetry.parse({"service": "checkout"}), ["sre"])
+
+    assert asyncio.run(handler()) == {"sre": {"error_rate_pct": 13.0}}
+
+
+def test_storm_across_services_reads_the_export_once(tmp_path):
+    export = tmp_path / "billing.csv"
+    rows = ["period,service,cost"]
+    for day in range(1, 30):
+        for service, cost in (("cart", 10.0), ("checkout", 20.0), ("search", 5.0)):
+            rows.append(f"2026-01-{day:02d},{service},{cost * (3 if day == 29 and service == 'checkout' else 1)}")
+    export.write_text("\n".join(rows))
+    retrieval = EvidenceRetrieval()
+    retrieval.configure({
+        "cache": {"ttl_s": 60.0},
+        "retrievers": [{"class": "orchestrator.retrieval:BillingCsvRetriever", "path": str(export)}],
+    })
+
+    spikes = {
+        service: retrieval.retrieve(Telemetry.parse({"service": service}), ["finops"])["finops"]["cost_spike_pct"]
+        for service in ("cart", "checkout", "search")
+    }
+    assert spikes["cart"] == pytest.approx(0.0) and spikes["search"] == pytest.approx(0.0)
+    assert spikes["checkout"] == pytest.approx(200.0)
+    assert retrieval.retriever_for("finops").source_loads == 1
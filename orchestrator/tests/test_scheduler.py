@@ -0,0 +1,37 @@
+from orchestrator.scheduler import RarScheduler
+
+
+def test_unexplored_domains_are_always_planned():
+    scheduler = RarScheduler()
+    domains, reason = scheduler.plan(["sre", "sec"], consensus=0.1, tau=0.9, budget_ms=100.0)
+    assert sorted(domains) == ["sec", "sre"] and reason == ""
+
+
+def test_unreachable_domain_is_retried_once_stale():
+    scheduler = RarScheduler(min_attempts=1, stale_after=2)
+    scheduler.record({"sre": 0.05}, accepted=False, latency_ms=1.0)
+
+    for _ in range(2):
+        assert scheduler.plan(["sre"], consensus=0.4, tau=0.75, budget_ms=100.0) == ([], "unreachable")
+    assert scheduler.stats("sre").skipped == 2
+    assert scheduler.plan(["sre"], consensus=0.4, tau=0.75, budget_ms=100.0) == (["sre"], "")
+
+    scheduler.record({"sre": 0.05}, accepted=False, latency_ms=1.0)
+    assert scheduler.stats("sre").skipped == 0
+
+
+def test_plan_respects_the_latency_budget():
+    scheduler = RarScheduler(prior_latency_ms=5.0)
+    assert scheduler.plan(["sre"], consensus=0.4, tau=0.75, budget_ms=1.0) == ([], "budget")
+
+
+def test_plan_stops_once_expected_gain_reaches_tau():
+    scheduler = RarScheduler(min_attempts=1)
+    scheduler.record({"sre": 0.3, "sec": 0.02}, accepted=True, latency_ms=1.0)
+    scheduler.record({"finops": 0.1}, accepted=True, latency_ms=1.0)
+
+    assert scheduler.plan(["sec", "finops", "sre"], consensus=0.5, tau=0.75, budget_ms=100.0) == (["sre"], "")
+    assert scheduler.plan(["sec", "finops", "sre"], consensus=0.35, tau=0.7, budget_ms=100.0) == (
+        ["sre", "finops"],
+        "",
+    )
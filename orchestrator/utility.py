@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Mapping, Tuple
+
+from agents.telemetry import Telemetry
 
 
 def utility_score(
@@ -25,108 +27,56 @@ def utility_score(
     )
 
 
-def _severity_scores(telemetry: Dict[str, Any]) -> Dict[str, float]:
-    deploy = telemetry.get("deploy", {}) or {}
-    sre = telemetry.get("sre", {}) or {}
-    finops = telemetry.get("finops", {}) or {}
-    sec = telemetry.get("sec", {}) or {}
-
-    restart_loops = int(float(deploy.get("restart_loops", 0) or 0))
-    pipeline_failed = bool(deploy.get("pipeline_failed", False))
-    config_drift = bool(deploy.get("config_drift", False))
-    rollback_marker = bool(deploy.get("rollback_marker", False))
-    artifact_mismatch = bool(deploy.get("artifact_mismatch", False))
-
-    p95 = float(sre.get("p95_latency_ms", 0.0) or 0.0)
-    err = float(sre.get("error_rate_pct", 0.0) or 0.0)
-    sat = float(sre.get("saturation_pct", 0.0) or 0.0)
-    availability = float(sre.get("availability_pct", 99.9) or 99.9)
-
-    cost_spike = float(finops.get("cost_spike_pct", 0.0) or 0.0)
-    hpa_scale = int(float(finops.get("hpa_scale_to", 0) or 0))
-    cpu_inc = float(finops.get("cpu_request_increase_pct", 0.0) or 0.0)
-    mem_inc = float(finops.get("memory_request_increase_pct", 0.0) or 0.0)
-
-    critical_cves = int(float(sec.get("critical_cves", 0) or 0))
-    policy_violation = bool(sec.get("policy_violation", False))
-    iam_drift = bool(sec.get("iam_drift", False))
-    compliance_gap = bool(sec.get("compliance_gap", False))
-
-    deployment = 0.0
-    if pipeline_failed:
-        deployment += 0.35
-    if config_drift:
-        deployment += 0.25
-    if rollback_marker:
-        deployment += 0.25
-    if artifact_mismatch:
-        deployment += 0.25
-    if restart_loops >= 12:
-        deployment += 0.25
-    elif restart_loops >= 6:
-        deployment += 0.10
-
-    reliability = 0.0
-    if p95 >= 800:
-        reliability += 0.35
-    elif p95 >= 450:
-        reliability += 0.25
-    if err >= 12:
-        reliability += 0.35
-    elif err >= 8:
-        reliability += 0.25
-    if sat >= 90:
-        reliability += 0.25
-    elif sat >= 85:
-        reliability += 0.15
-    if availability < 99.0:
-        reliability += 0.25
-
-    cost = 0.0
-    if cost_spike >= 35:
-        cost += 0.40
-    elif cost_spike >= 22:
-        cost += 0.30
-    elif cost_spike >= 8:
-        cost += 0.15
-    if hpa_scale >= 14:
-        cost += 0.25
-    elif hpa_scale >= 11:
-        cost += 0.15
-    if cpu_inc >= 50:
-        cost += 0.20
-    if mem_inc >= 40:
-        cost += 0.20
-
-    security = 0.0
-    if critical_cves >= 2:
-        security += 0.40
-    elif critical_cves == 1:
-        security += 0.30
-    if policy_violation:
-        security += 0.25
-    if iam_drift:
-        security += 0.20
-    if compliance_gap:
-        security += 0.20
-
-    return {
-        "deployment": min(1.0, deployment),
-        "reliability": min(1.0, reliability),
-        "cost": min(1.0, cost),
-        "security": min(1.0, security),
-    }
-
-
-def _action_components(telemetry: Dict[str, Any]) -> Dict[str, Tuple[float, float, float]]:
+# Severity contribution per rule level, keyed by telemetry field. Thresholds
+# come from the shared rule table (agents/rules.py).
+SEVERITY_WEIGHTS: Dict[str, Dict[str, Tuple[float, ...]]] = {
+    "deployment": {
+        "pipeline_failed": (0.0, 0.35),
+        "config_drift": (0.0, 0.25),
+        "rollback_marker": (0.0, 0.25),
+        "artifact_mismatch": (0.0, 0.25),
+        "restart_loops": (0.0, 0.10, 0.25),
+    },
+    "reliability": {
+        "p95_latency_ms": (0.0, 0.25, 0.35),
+        "error_rate_pct": (0.0, 0.25, 0.35),
+        "saturation_pct": (0.0, 0.15, 0.25),
+        "availability_pct": (0.0, 0.25),
+    },
+    "cost": {
+        "cost_spike_pct": (0.0, 0.15, 0.30, 0.40),
+        "hpa_scale_to": (0.0, 0.15, 0.25),
+        "cpu_request_increase_pct": (0.0, 0.20),
+        "memory_request_increase_pct": (0.0, 0.20),
+    },
+    "security": {
+        "critical_cves": (0.0, 0.30, 0.40),
+        "policy_violation": (0.0, 0.25),
+        "iam_drift": (0.0, 0.20),
+        "compliance_gap": (0.0, 0.20),
+    },
+}
+
+
+def _severity_scores(telemetry: Mapping[str, Any]) -> Dict[str, float]:
+    levels = Telemetry.parse(telemetry).rules.levels
+
+    severities: Dict[str, float] = {}
+    for signal, weights in SEVERITY_WEIGHTS.items():
+        score = 0.0
+        for key, w in weights.items():
+            score += w[levels[key]]
+        severities[signal] = min(1.0, score)
+    return severities
+
+
+def _components_from_severities(s: Mapping[str, float]) -> Dict[str, Tuple[float, float, float]]:
     """
     Returns:
         action -> (performance_score, cost_efficiency_score, risk_reduction_score)
 
     Higher is better for all three components.
     """
-    s = _severity_scores(telemetry)
-
     deployment = s["deployment"]
     reliability = s["reliability"]
     cost = s["cost"]
@@ -171,13 +121,26 @@ def _action_components(telemetry: Dict[str, Any]) -> Dict[str, Tuple[float, floa
     }
 
 
+def _action_components(telemetry: Mapping[str, Any]) -> Dict[str, Tuple[float, float, float]]:
+    return _components_from_severities(_severity_scores(telemetry))
+
+
 def _dominant_signal(severities: Dict[str, float]) -> str:
     return max(severities, key=lambda k: severities[k])
 
 
-def _action_fit_bonus(action: str, severities: Dict[str, float]) -> float:
+_ROLLBACK = "Rollback to stable deployment"
+_BLOCK = "Block release and fix pipeline"
+_MITIGATE = "Mitigate and monitor"
+_SCALE = "Scale adjustment"
+_REVIEW = "Review scaling policy"
+_PATCH = "Patch or block release"
+_OBSERVE = "No action (observe)"
+
+
+def _action_fit_bonuses(severities: Mapping[str, float]) -> Dict[str, float]:
     """
-    Governance action-fit adjustment.
+    Governance action-fit adjustment for every action, in one pass.
 
     This rewards actions that fit the dominant operational signal and
     penalizes generic actions when a specific governance action is required.
@@ -188,116 +151,107 @@ def _action_fit_bonus(action: str, severities: Dict[str, float]) -> float:
     security = severities["security"]
 
     dominant = _dominant_signal(severities)
-    bonus = 0.0
+    bonus = dict.fromkeys((_ROLLBACK, _BLOCK, _MITIGATE, _SCALE, _REVIEW, _PATCH, _OBSERVE), 0.0)
 
     # ------------------------------------------------------------
     # Deployment governance
     # ------------------------------------------------------------
     if dominant == "deployment":
-        if action == "Rollback to stable deployment":
-            bonus += 0.13
-        elif action == "Block release and fix pipeline":
-            bonus += 0.13
-        elif action == "Mitigate and monitor":
-            bonus -= 0.12
+        bonus[_ROLLBACK] += 0.13
+        bonus[_BLOCK] += 0.13
+        bonus[_MITIGATE] -= 0.12
 
     # Pipeline gate / release evidence cases:
     # high deployment signal but limited reliability impact should block release,
     # not rollback.
     if deployment >= 0.55 and reliability < 0.35:
-        if action == "Block release and fix pipeline":
-            bonus += 0.08
-        if action == "Rollback to stable deployment":
-            bonus -= 0.05
+        bonus[_BLOCK] += 0.08
+        bonus[_ROLLBACK] -= 0.05
 
     # Deployment incident with reliability impact should rollback.
     if deployment >= 0.50 and reliability >= 0.35:
-        if action == "Rollback to stable deployment":
-            bonus += 0.10
-        if action == "Block release and fix pipeline":
-            bonus -= 0.03
-        if action == "Mitigate and monitor":
-            bonus -= 0.08
+        bonus[_ROLLBACK] += 0.10
+        bonus[_BLOCK] -= 0.03
+        bonus[_MITIGATE] -= 0.08
 
     # ------------------------------------------------------------
     # Reliability governance
     # ------------------------------------------------------------
     if dominant == "reliability":
-        if action == "Mitigate and monitor":
-            bonus += 0.10
-        if action == "Scale adjustment" and reliability >= 0.55:
-            bonus += 0.08
-        if action == "Rollback to stable deployment" and deployment < 0.40:
-            bonus -= 0.08
+        bonus[_MITIGATE] += 0.10
+        if reliability >= 0.55:
+            bonus[_SCALE] += 0.08
+        if deployment < 0.40:
+            bonus[_ROLLBACK] -= 0.08
 
     # Capacity/resource cases should scale, not only monitor.
     if reliability >= 0.55 and cost >= 0.15:
-        if action == "Scale adjustment":
-            bonus += 0.18
-        if action == "Mitigate and monitor":
-            bonus -= 0.08
+        bonus[_SCALE] += 0.18
+        bonus[_MITIGATE] -= 0.08
 
     # Pure reliability degradation without cost pressure should mitigate.
     if reliability >= 0.55 and cost < 0.15 and deployment < 0.35:
-        if action == "Mitigate and monitor":
-            bonus += 0.10
-        if action == "Scale adjustment":
-            bonus -= 0.10
+        bonus[_MITIGATE] += 0.10
+        bonus[_SCALE] -= 0.10
 
     # ------------------------------------------------------------
     # Cost governance
     # ------------------------------------------------------------
     if dominant == "cost":
-        if action == "Scale adjustment":
-            bonus += 0.22
-        elif action == "Review scaling policy":
-            bonus += 0.13
-        elif action == "Mitigate and monitor":
-            bonus -= 0.18
+        bonus[_SCALE] += 0.22
+        bonus[_REVIEW] += 0.13
+        bonus[_MITIGATE] -= 0.18
 
     # High autoscaling / over-provisioning should scale-adjust.
     if cost >= 0.45:
-        if action == "Scale adjustment":
-            bonus += 0.10
-        if action == "Review scaling policy":
-            bonus -= 0.04
-        if action == "Mitigate and monitor":
-            bonus -= 0.12
+        bonus[_SCALE] += 0.10
+        bonus[_REVIEW] -= 0.04
+        bonus[_MITIGATE] -= 0.12
 
     # Moderate cost with stable reliability should review policy.
     if 0.25 <= cost < 0.45 and reliability < 0.30:
-        if action == "Review scaling policy":
-            bonus += 0.12
-        if action == "Scale adjustment":
-            bonus -= 0.04
+        bonus[_REVIEW] += 0.12
+        bonus[_SCALE] -= 0.04
 
     # ------------------------------------------------------------
     # Security / compliance governance
     # ------------------------------------------------------------
     if dominant == "security":
-        if action == "Patch or block release":
-            bonus += 0.24
-        elif action in {"Rollback to stable deployment", "Mitigate and monitor"}:
-            bonus -= 0.15
+        bonus[_PATCH] += 0.24
+        bonus[_ROLLBACK] -= 0.15
+        bonus[_MITIGATE] -= 0.15
 
     # Any meaningful security/compliance signal should strongly prefer patch/block.
     if security >= 0.20:
-        if action == "Patch or block release":
-            bonus += 0.16
-        if action == "Rollback to stable deployment":
-            bonus -= 0.10
-        if action == "Mitigate and monitor":
-            bonus -= 0.12
+        bonus[_PATCH] += 0.16
+        bonus[_ROLLBACK] -= 0.10
+        bonus[_MITIGATE] -= 0.12
 
     return bonus
 
 
+def _action_fit_bonus(action: str, severities: Dict[str, float]) -> float:
+    """Governance action-fit adjustment for a single action."""
+    return _action_fit_bonuses(severities).get(action, 0.0)
+
+
+def _score_actions(
+    telemetry: Mapping[str, Any],
+) -> Tuple[Dict[str, float], Dict[str, Tuple[float, float, float]], Dict[str, float]]:
+    """
+    Scoring kernel: severities are computed once and both the action
+    component tuples and the fit bonuses are derived from them.
+    """
+    severities = _severity_scores(telemetry)
+    return severities, _components_from_severities(severities), _action_fit_bonuses(severities)
+
+
 def choose_action_details(
-    telemetry: Dict[str, Any],
+    telemetry: Mapping[str, Any],
     w: Tuple[float, float, float],
 ) -> Dict[str, Any]:
-    severities = _severity_scores(telemetry)
-    components = _action_components(telemetry)
+    telemetry = Telemetry.parse(telemetry)
+    _, components, bonuses = _score_actions(telemetry)
 
     best_action = None
     best_utility = float("-inf")
@@ -307,7 +261,7 @@ def choose_action_details(
 
     for action, (perf, cost_eff, risk_red) in components.items():
         base_utility = utility_score(perf, cost_eff, risk_red, w)
-        fit_bonus = _action_fit_bonus(action, severities)
+        fit_bonus = bonuses[action]
         final_utility = base_utility + fit_bonus
 
         candidate = {
@@ -339,7 +293,7 @@ def choose_action_details(
 
 
 def choose_action(
-    telemetry: Dict[str, Any],
+    telemetry: Mapping[str, Any],
     w: Tuple[float, float, float],
 ) -> Tuple[str, float]:
     details = choose_action_details(telemetry, w)
@@ -1,28 +1,50 @@
 from __future__ import annotations
 
-from typing import Dict, Any, Tuple, Literal
-from dataclasses import dataclass
+from typing import Dict, Any, List, Tuple, Literal
+from dataclasses import dataclass, replace
+from pathlib import Path
+import copy
 import time
 
-from agents.devops import DevOpsAgent
-from agents.sre import SREAgent
-from agents.finops import FinOpsAgent
-from agents.devsecops import DevSecOpsAgent
-from orchestrator.consensus import consensus_score
-from orchestrator.rar import re_ground_telemetry
+from aaf.lsh import cluster_near_duplicates, incident_tokens, telemetry_tokens
+from agents.base import CLASS_NEGATIVE
+from agents.memo import AgentMemo
+from agents.registry import REGISTRY
+from agents.rules import DEFAULT_CONFIG, RULES, load_config
+from agents.telemetry import Telemetry
+from orchestrator.consensus import classify_claim, consensus_score
+from orchestrator.rar import RarSession
+from orchestrator.retrieval import RETRIEVAL
+from orchestrator.scheduler import RarScheduler
 from orchestrator.utility import choose_action, choose_action_details
 from llm.deterministic_explainer import generate_explanation
 from metrics.explainability import compute_xi
 
 
-AGENTS = [DevOpsAgent(), SREAgent(), FinOpsAgent(), DevSecOpsAgent()]
+def configure(config_path: Path | str) -> Dict[str, Any]:
+    """
+    Load a config file and apply its `rules`, `agents` and `retrieval`
+    sections to the shared rule table, agent registry and retrieval, which
+    are otherwise built from the default config. Sections the file does not
+    have keep the default config's. Returns the loaded config.
+    """
+    cfg = load_config(config_path)
+    defaults = load_config(DEFAULT_CONFIG)
+    RULES.configure(cfg.get("rules", defaults["rules"]))
+    REGISTRY.configure(cfg.get("agents", defaults["agents"]) or {})
+    RETRIEVAL.configure(cfg.get("retrieval", defaults.get("retrieval")) or {})
+    return cfg
 
 
-def _run_agents(telemetry: Dict[str, Any]):
-    outputs = [a.infer(telemetry) for a in AGENTS]
+def _run_agents(telemetry: Telemetry, memo: AgentMemo | None = None):
+    if memo is not None:
+        outputs = memo.run(telemetry)
+    else:
+        outputs = REGISTRY.run(telemetry)
     claims = [o.claim for o in outputs]
     confs = [float(o.confidence) for o in outputs]
-    return outputs, claims, confs
+    classes = [o.claim_class for o in outputs]
+    return outputs, claims, confs, classes
 
 
 def run_once(
@@ -30,6 +52,7 @@ def run_once(
     thresholds: Dict[str, Any],
     lam: float,
     w: Tuple[float, float, float],
+    scheduler: RarScheduler | None = None,
 ) -> Dict[str, Any]:
     """
     Core reproducibility execution path.
@@ -40,49 +63,41 @@ def run_once(
     3. Trigger RAR if consensus is below threshold
     4. Re-run agents if RAR accepted
     5. Select recommended action from telemetry-aware utility
+
+    Agent outputs are memoized per domain block across RAR loops, and each
+    loop evaluates the agents once, on the enriched telemetry. A budgeted
+    RAR (`rar_budget_ms`) plans from `scheduler`, which callers share across
+    the incidents of one run.
     """
-    outputs, claims, confs = _run_agents(telemetry)
-    s, _ = consensus_score(claims, confs, lam=lam)
+    telemetry = Telemetry.parse(telemetry)
+    memo = AgentMemo(REGISTRY)
+    outputs, claims, confs, classes = _run_agents(telemetry, memo)
+    s, _ = consensus_score(claims, confs, lam=lam, classes=classes)
 
     tau = float(thresholds["tau_consensus"])
     delta_min = float(thresholds["delta_min"])
     max_loops = int(thresholds.get("max_rar_loops", 2))
 
-    rar_triggered = False
-    loops = 0
     t = telemetry
+    session = RarSession(tau=tau, delta_min=delta_min, lam=lam, memo=memo, scheduler=scheduler)
+    loops = 0
 
-    while s < tau and loops < max_loops:
-        rar_triggered = True
+    for step in session.iterate(t, outputs, s, max_loops, budget_ms=thresholds.get("rar_budget_ms")):
         loops += 1
-
-        t_updated, s_after, accepted = re_ground_telemetry(
-            telemetry=t,
-            tau=tau,
-            delta_min=delta_min,
-            lam=lam,
-        )
-
-        t = t_updated
-        outputs, claims, confs = _run_agents(t)
-        s_recomputed, _ = consensus_score(claims, confs, lam=lam)
-        s = float(s_recomputed)
-
-        if not accepted:
-            break
-
-        if s_after < tau:
-            continue
+        t, outputs, s = step.telemetry, step.outputs, step.consensus
+    rar_triggered = loops > 0
 
     action, util = choose_action(t, w)
 
     return {
-        "agents": [o.__dict__ for o in outputs],
+        "agents": [o.to_dict() for o in outputs],
         "consensus_score": float(s),
         "rar_triggered": bool(rar_triggered),
         "rar_loops": int(loops),
         "recommended_action": action,
         "utility_score": float(util),
+        "agent_cache": memo.counters(),
+        "rar_session": session.counters(),
     }
 
 
@@ -107,7 +122,11 @@ class PipelineResult:
     timings: Dict[str, float]
 
 
-def run_pipeline(scenario: Dict[str, Any], mode: Mode = "aaf_full") -> PipelineResult:
+def run_pipeline(
+    scenario: Dict[str, Any],
+    mode: Mode = "aaf_full",
+    scheduler: RarScheduler | None = None,
+) -> PipelineResult:
     """
     Paper-oriented pipeline runner.
 
@@ -116,9 +135,17 @@ def run_pipeline(scenario: Dict[str, Any], mode: Mode = "aaf_full") -> PipelineR
     - deterministic explanation
     - explainability index
     - ablation modes
+    - agent output memoization across RAR loops (AG-CACHE-* counters)
+    - one agent evaluation per RAR loop (RAR-AG-RUNS counter)
+    - an optional per-incident RAR latency budget (`rar_budget_ms`),
+      planned from `scheduler`'s history (a fresh one per call by default)
+    - RAR run to a fixed point, with its termination reason in `rar`;
+      `rar["loops"]` counts RAR iterations and `rar["enriched"]` the ones
+      that actually retrieved evidence
     """
     t0 = time.perf_counter()
     timings: Dict[str, float] = {}
+    memo = AgentMemo(REGISTRY)
 
     telemetry = scenario.get("telemetry", {})
     thresholds = scenario.get(
@@ -128,14 +155,14 @@ def run_pipeline(scenario: Dict[str, Any], mode: Mode = "aaf_full") -> PipelineR
     lam = float(scenario.get("lam", 0.5))
     w = tuple(scenario.get("utility_weights", (0.4, 0.3, 0.3)))  # type: ignore
 
-    # T-IN
+    # T-IN: parse, validate and evaluate the threshold rules once
     t_in = time.perf_counter()
-    _ = dict(telemetry)
+    telemetry = Telemetry.parse(telemetry)
     timings["T-IN"] = (time.perf_counter() - t_in) * 1000.0
 
     # AG-INF
     t_ag = time.perf_counter()
-    outputs, claims, confs = _run_agents(telemetry)
+    outputs, claims, confs, classes = _run_agents(telemetry, memo)
     timings["AG-INF"] = (time.perf_counter() - t_ag) * 1000.0
 
     # CN-CHK
@@ -143,7 +170,7 @@ def run_pipeline(scenario: Dict[str, Any], mode: Mode = "aaf_full") -> PipelineR
     if mode == "aaf_no_consensus":
         s = 1.0
     else:
-        s, _ = consensus_score(claims, confs, lam=lam)
+        s, _ = consensus_score(claims, confs, lam=lam, classes=classes)
     timings["CN-CHK"] = (time.perf_counter() - t_cn) * 1000.0
 
     # RAR
@@ -153,6 +180,7 @@ def run_pipeline(scenario: Dict[str, Any], mode: Mode = "aaf_full") -> PipelineR
         "before": float(s),
         "after": float(s),
         "loops": 0,
+        "enriched": 0,
     }
     timings["RAR"] = 0.0
 
@@ -160,36 +188,33 @@ def run_pipeline(scenario: Dict[str, Any], mode: Mode = "aaf_full") -> PipelineR
     delta_min = float(thresholds.get("delta_min", 0.15))
     max_loops = int(thresholds.get("max_rar_loops", 2))
 
-    t_cur = telemetry
+    # Optional per-incident RAR latency budget (see orchestrator/scheduler.py).
+    budget_ms = scenario.get("rar_budget_ms", thresholds.get("rar_budget_ms"))
+    if budget_ms is not None:
+        rar_info["budget_ms"] = float(budget_ms)
+        rar_info["stopped"] = ""
 
-    if mode != "aaf_no_rar":
-        loops = 0
-        while s < tau and loops < max_loops:
-            loops += 1
-            rar_info["triggered"] = True
+    t_cur = telemetry
+    session = RarSession(tau=tau, delta_min=delta_min, lam=lam, memo=memo, scheduler=scheduler)
 
-            t_rar = time.perf_counter()
-            t_updated, s_after, accepted = re_ground_telemetry(
-                telemetry=t_cur,
-                tau=tau,
-                delta_min=delta_min,
-                lam=lam,
-            )
+    if mode == "aaf_no_rar":
+        rar_info["termination"] = "disabled"
+    else:
+        t_rar = time.perf_counter()
+        for step in session.iterate(t_cur, outputs, s, max_loops, budget_ms=budget_ms):
             timings["RAR"] += (time.perf_counter() - t_rar) * 1000.0
+            rar_info["triggered"] = True
+            if step.stopped:
+                rar_info["stopped"] = step.stopped
 
-            t_cur = t_updated
-            outputs, claims, confs = _run_agents(t_cur)
-            s, _ = consensus_score(claims, confs, lam=lam)
+            t_cur, outputs, s = step.telemetry, step.outputs, step.consensus
 
-            rar_info["accepted"] = bool(accepted)
+            rar_info["accepted"] = bool(step.accepted)
             rar_info["after"] = float(s)
-            rar_info["loops"] = loops
-
-            if not accepted:
-                break
-
-            if s_after < tau:
-                continue
+            rar_info["loops"] += 1
+            rar_info["enriched"] += int(step.triggered)
+            t_rar = time.perf_counter()
+        rar_info["termination"] = session.termination
 
         # Utility
     t_ut = time.perf_counter()
@@ -238,6 +263,10 @@ def run_pipeline(scenario: Dict[str, Any], mode: Mode = "aaf_full") -> PipelineR
     timings["OUT-GEN"] = (time.perf_counter() - t_out) * 1000.0
 
     timings["TOTAL"] = (time.perf_counter() - t0) * 1000.0
+    timings["AG-CACHE-HIT"] = float(memo.hits)
+    timings["AG-CACHE-MISS"] = float(memo.misses)
+    timings["AG-TIMEOUT"] = float(memo.timeouts)
+    timings["RAR-AG-RUNS"] = float(session.agent_runs)
 
     pred = _predict_primary_domain(outputs)
 
@@ -246,7 +275,7 @@ def run_pipeline(scenario: Dict[str, Any], mode: Mode = "aaf_full") -> PipelineR
         ground_truth=scenario.get("ground_truth", {}),
         mode=mode,
         predicted_primary_domain=pred,
-        agents=[o.__dict__ for o in outputs],
+        agents=[o.to_dict() for o in outputs],
         consensus_score=float(s),
         rar=rar_info,
         utility=utility_details,
@@ -256,14 +285,92 @@ def run_pipeline(scenario: Dict[str, Any], mode: Mode = "aaf_full") -> PipelineR
     )
 
 
+def _incident_texts(outputs: list) -> List[str]:
+    texts: List[str] = []
+    for o in outputs:
+        texts.append(o.claim)
+        texts.extend(o.evidence or [])
+    return texts
+
+
+def run_pipeline_clustered(
+    scenarios: List[Dict[str, Any]],
+    mode: Mode = "aaf_full",
+    threshold: float = 0.9,
+    digits: int = 2,
+    scheduler: RarScheduler | None = None,
+) -> List[PipelineResult]:
+    """
+    `run_pipeline` over a batch of incidents, deduplicating alert storms.
+
+    Incidents with the same thresholds, RAR budget, lambda, utility weights,
+    rule levels and agent outputs (claims and confidences) are clustered by
+    the MinHash/LSH Jaccard similarity of their claims, evidence and
+    telemetry fields rounded to `digits` significant digits (aaf/lsh.py).
+    The full pipeline runs once per cluster, on its first incident, and a
+    deep copy of that result is fanned out to each other member with its own
+    scenario_id and ground_truth. `timings["CLUSTER-SIZE"]` records the
+    cluster size and `timings["CLUSTER-REUSED"]` is 1.0 on fanned-out
+    results. Results are returned in input order. Budgeted RAR plans from
+    one `scheduler` for the whole batch.
+    """
+    groups: Dict[str, List[int]] = {}
+    outputs_by_index: Dict[int, list] = {}
+    for i, scenario in enumerate(scenarios):
+        telemetry = Telemetry.parse(scenario.get("telemetry", {}))
+        outputs = REGISTRY.run(telemetry)
+        outputs_by_index[i] = outputs
+        # Only incidents on the same side of every rule threshold, with
+        # identical agent outputs, can share a result; the LSH documents
+        # round values and cannot tell them apart.
+        key = repr((
+            scenario.get("thresholds"),
+            scenario.get("rar_budget_ms"),
+            scenario.get("lam", 0.5),
+            tuple(scenario.get("utility_weights", (0.4, 0.3, 0.3))),
+            sorted(telemetry.rules.levels.items()),
+            sorted(telemetry.rules.missing.items()),
+            tuple((o.claim, o.confidence) for o in outputs),
+        ))
+        groups.setdefault(key, []).append(i)
+
+    if scheduler is None:
+        scheduler = RarScheduler()
+    results: List[PipelineResult | None] = [None] * len(scenarios)
+    for members in groups.values():
+        documents = [
+            incident_tokens(_incident_texts(outputs_by_index[i]), ignore_numbers=True)
+            | telemetry_tokens(scenarios[i].get("telemetry", {}), digits=digits)
+            for i in members
+        ]
+        for cluster in cluster_near_duplicates(documents, threshold=threshold):
+            leader = members[cluster[0]]
+            result = run_pipeline(scenarios[leader], mode=mode, scheduler=scheduler)
+            result.timings["CLUSTER-SIZE"] = float(len(cluster))
+            result.timings["CLUSTER-REUSED"] = 0.0
+            results[leader] = result
+            for k in cluster[1:]:
+                scenario = scenarios[members[k]]
+                results[members[k]] = replace(
+                    copy.deepcopy(result),
+                    scenario_id=str(scenario.get("scenario_id", scenario.get("incident_id", "unknown"))),
+                    ground_truth=scenario.get("ground_truth", {}),
+                    timings={**result.timings, "CLUSTER-REUSED": 1.0},
+                )
+
+    return results  # type: ignore[return-value]
+
+
 def _predict_primary_domain(outputs: list) -> str | None:
     """
     Pick the agent with highest confidence among non-trivial claims.
     """
     filtered = []
     for o in outputs:
-        claim = (o.claim or "").lower()
-        if claim.startswith("no ") or "no issue" in claim or "no violation" in claim:
+        cls = getattr(o, "claim_class", None)
+        if cls is None:
+            cls = classify_claim(o.claim)
+        if cls == CLASS_NEGATIVE:
             continue
         filtered.append(o)
 
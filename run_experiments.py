@@ -6,11 +6,11 @@ import time
 from pathlib import Path
 
 import pandas as pd
-import yaml
 
 from aaf.utils import set_seed, now_ms
 from scenario_generator.generate import generate_scenarios
-from pipeline import run_once
+from pipeline import configure, run_once
+from orchestrator.scheduler import RarScheduler
 from llm.llama_cpp_runner import run_llama
 
 
@@ -55,11 +55,8 @@ def parse_args() -> argparse.Namespace:
 def main() -> None:
     args = parse_args()
 
-    config_path = Path(args.config)
-    if not config_path.exists():
-        raise FileNotFoundError(f"Config file not found: {config_path}")
-
-    cfg = yaml.safe_load(config_path.read_text(encoding="utf-8"))
+    # Rules, agent dispatch and retrieval follow the chosen config too.
+    cfg = configure(args.config)
 
     use_llm = bool(args.llm and not args.no_llm)
 
@@ -87,6 +84,9 @@ def main() -> None:
     sys_prompt = load_text(ROOT / "prompts" / "system.txt")
     user_template = load_text(ROOT / "prompts" / "user_template.txt")
 
+    # Budgeted RAR learns per-domain statistics over this run only.
+    scheduler = RarScheduler()
+
     lat_rows = []
     outputs_path = outdir / "scenario_outputs.jsonl"
 
@@ -106,6 +106,7 @@ def main() -> None:
                 thresholds=cfg["experiment"]["thresholds"],
                 lam=lam,
                 w=w,
+                scheduler=scheduler,
             )
             t_pipe = now_ms() - t_pipe0
 
@@ -0,0 +1,40 @@
+import copy
+
+from pipeline import run_pipeline, run_pipeline_clustered
+
+
+def _incident(scenario_id, cost_spike_pct):
+    return {
+        "scenario_id": scenario_id,
+        "telemetry": {
+            "deploy": {"restart_loops": 6, "pipeline_failed": True, "config_drift": True},
+            "sre": {"p95_latency_ms": 300, "error_rate_pct": 13, "saturation_pct": 60, "availability_pct": 99.9},
+            "finops": {
+                "cost_spike_pct": cost_spike_pct,
+                "hpa_scale_to": 11,
+                "cpu_request_increase_pct": 55,
+                "memory_request_increase_pct": 45,
+            },
+            "sec": {"critical_cves": 1},
+        },
+    }
+
+
+def test_clustering_reuses_identical_incidents():
+    leader = _incident("A", 30.0)
+    storm = [leader] + [dict(copy.deepcopy(leader), scenario_id=f"A{i}") for i in range(3)]
+    results = run_pipeline_clustered(storm)
+    assert [r.timings["CLUSTER-REUSED"] for r in results] == [0.0, 1.0, 1.0, 1.0]
+    assert [r.scenario_id for r in results] == ["A", "A0", "A1", "A2"]
+
+
+def test_clustering_splits_incidents_across_a_rule_threshold():
+    # 21.54 and 22.4 both round to "22", but straddle the 22% cost-spike rule.
+    below, above = _incident("below", 21.54), _incident("above", 22.4)
+    clustered = run_pipeline_clustered([above, below])
+    for scenario, result in zip([above, below], clustered):
+        alone = run_pipeline(scenario)
+        assert result.timings["CLUSTER-REUSED"] == 0.0
+        assert result.utility["selected_action"] == alone.utility["selected_action"]
+        assert result.consensus_score == alone.consensus_score
+        assert result.agents == alone.agents
@@ -0,0 +1,280 @@
+"""
+Microbenchmark for utility scoring.
+
+Compares the scoring that `choose_action_details` did before the
+single-pass kernel against `_score_actions`. The legacy path is vendored
+below verbatim from the replaced code: severities are scored once for the
+fit bonuses and again inside `_legacy_action_components`, and
+`_legacy_action_fit_bonus` re-runs every rule, including the dominant-signal
+lookup, once per action. Both paths are checked to give identical components
+and bonuses before they are timed.
+
+Both paths run on the 30-scenario corpus and on a synthetic corpus. The
+synthetic corpus is not new data: it is the same generator's output
+re-seeded (seed 0, 1, 2, ...) until it has the requested size, parsed and
+timed in chunks so a 1M corpus fits in memory.
+
+    PYTHONPATH=. python tools/bench_utility.py --synthetic 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Tuple
+
+from agents.telemetry import Telemetry
+from orchestrator.utility import _dominant_signal, _score_actions, _severity_scores
+from scenario_generator.generate import generate_scenarios
+
+
+# ---------------------------------------------------------------------------
+# Legacy scoring, vendored from orchestrator/utility.py before the
+# single-pass kernel.
+
+
+def _legacy_action_components(telemetry: Mapping[str, Any]) -> Dict[str, Tuple[float, float, float]]:
+    """
+    Returns:
+        action -> (performance_score, cost_efficiency_score, risk_reduction_score)
+
+    Higher is better for all three components.
+    """
+    s = _severity_scores(telemetry)
+
+    deployment = s["deployment"]
+    reliability = s["reliability"]
+    cost = s["cost"]
+    security = s["security"]
+
+    return {
+        "Rollback to stable deployment": (
+            min(1.0, 0.35 + 0.40 * deployment + 0.25 * reliability),
+            0.65,
+            min(1.0, 0.35 + 0.35 * deployment + 0.10 * security),
+        ),
+        "Block release and fix pipeline": (
+            min(1.0, 0.25 + 0.45 * deployment),
+            0.75,
+            min(1.0, 0.40 + 0.30 * deployment + 0.20 * security),
+        ),
+        "Mitigate and monitor": (
+            min(1.0, 0.30 + 0.35 * reliability),
+            0.68,
+            min(1.0, 0.30 + 0.20 * reliability),
+        ),
+        "Scale adjustment": (
+            min(1.0, 0.32 + 0.38 * reliability + 0.28 * cost),
+            min(1.0, 0.48 + 0.40 * cost),
+            min(1.0, 0.32 + 0.25 * reliability),
+        ),
+        "Review scaling policy": (
+            min(1.0, 0.22 + 0.25 * cost),
+            min(1.0, 0.60 + 0.35 * cost),
+            min(1.0, 0.32 + 0.18 * cost),
+        ),
+        "Patch or block release": (
+            min(1.0, 0.22 + 0.25 * security),
+            0.70,
+            min(1.0, 0.48 + 0.48 * security),
+        ),
+        "No action (observe)": (
+            0.20,
+            0.95,
+            max(0.05, 0.30 - 0.20 * max(deployment, reliability, cost, security)),
+        ),
+    }
+
+
+def _legacy_action_fit_bonus(action: str, severities: Dict[str, float]) -> float:
+    """
+    Governance action-fit adjustment.
+
+    This rewards actions that fit the dominant operational signal and
+    penalizes generic actions when a specific governance action is required.
+    """
+    deployment = severities["deployment"]
+    reliability = severities["reliability"]
+    cost = severities["cost"]
+    security = severities["security"]
+
+    dominant = _dominant_signal(severities)
+    bonus = 0.0
+
+    # ------------------------------------------------------------
+    # Deployment governance
+    # ------------------------------------------------------------
+    if dominant == "deployment":
+        if action == "Rollback to stable deployment":
+            bonus += 0.13
+        elif action == "Block release and fix pipeline":
+            bonus += 0.13
+        elif action == "Mitigate and monitor":
+            bonus -= 0.12
+
+    # Pipeline gate / release evidence cases:
+    # high deployment signal but limited reliability impact should block release,
+    # not rollback.
+    if deployment >= 0.55 and reliability < 0.35:
+        if action == "Block release and fix pipeline":
+            bonus += 0.08
+        if action == "Rollback to stable deployment":
+            bonus -= 0.05
+
+    # Deployment incident with reliability impact should rollback.
+    if deployment >= 0.50 and reliability >= 0.35:
+        if action == "Rollback to stable deployment":
+            bonus += 0.10
+        if action == "Block release and fix pipeline":
+            bonus -= 0.03
+        if action == "Mitigate and monitor":
+            bonus -= 0.08
+
+    # ------------------------------------------------------------
+    # Reliability governance
+    # ------------------------------------------------------------
+    if dominant == "reliability":
+        if action == "Mitigate and monitor":
+            bonus += 0.10
+        if action == "Scale adjustment" and reliability >= 0.55:
+            bonus += 0.08
+        if action == "Rollback to stable deployment" and deployment < 0.40:
+            bonus -= 0.08
+
+    # Capacity/resource cases should scale, not only monitor.
+    if reliability >= 0.55 and cost >= 0.15:
+        if action == "Scale adjustment":
+            bonus += 0.18
+        if action == "Mitigate and monitor":
+            bonus -= 0.08
+
+    # Pure reliability degradation without cost pressure should mitigate.
+    if reliability >= 0.55 and cost < 0.15 and deployment < 0.35:
+        if action == "Mitigate and monitor":
+            bonus += 0.10
+        if action == "Scale adjustment":
+            bonus -= 0.10
+
+    # ------------------------------------------------------------
+    # Cost governance
+    # ------------------------------------------------------------
+    if dominant == "cost":
+        if action == "Scale adjustment":
+            bonus += 0.22
+        elif action == "Review scaling policy":
+            bonus += 0.13
+        elif action == "Mitigate and monitor":
+            bonus -= 0.18
+
+    # High autoscaling / over-provisioning should scale-adjust.
+    if cost >= 0.45:
+        if action == "Scale adjustment":
+            bonus += 0.10
+        if action == "Review scaling policy":
+            bonus -= 0.04
+        if action == "Mitigate and monitor":
+            bonus -= 0.12
+
+    # Moderate cost with stable reliability should review policy.
+    if 0.25 <= cost < 0.45 and reliability < 0.30:
+        if action == "Review scaling policy":
+            bonus += 0.12
+        if action == "Scale adjustment":
+            bonus -= 0.04
+
+    # ------------------------------------------------------------
+    # Security / compliance governance
+    # ------------------------------------------------------------
+    if dominant == "security":
+        if action == "Patch or block release":
+            bonus += 0.24
+        elif action in {"Rollback to stable deployment", "Mitigate and monitor"}:
+            bonus -= 0.15
+
+    # Any meaningful security/compliance signal should strongly prefer patch/block.
+    if security >= 0.20:
+        if action == "Patch or block release":
+            bonus += 0.16
+        if action == "Rollback to stable deployment":
+            bonus -= 0.10
+        if action == "Mitigate and monitor":
+            bonus -= 0.12
+
+    return bonus
+
+
+def _legacy_score(telemetry: Telemetry) -> Tuple[Dict[str, Tuple[float, float, float]], Dict[str, float]]:
+    severities = _severity_scores(telemetry)
+    components = _legacy_action_components(telemetry)
+    return components, {action: _legacy_action_fit_bonus(action, severities) for action in components}
+
+
+def _kernel_score(telemetry: Telemetry) -> Tuple[Dict[str, Tuple[float, float, float]], Dict[str, float]]:
+    _, components, bonuses = _score_actions(telemetry)
+    return components, bonuses
+
+
+# ---------------------------------------------------------------------------
+
+
+def _check(corpus: List[Telemetry]) -> None:
+    for telemetry in corpus:
+        if _legacy_score(telemetry) != _kernel_score(telemetry):
+            raise AssertionError("Legacy and single-pass scoring disagree")
+
+
+def _time(fn: Callable[[Telemetry], Any], corpus: List[Telemetry], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for telemetry in corpus:
+            fn(telemetry)
+    return time.perf_counter() - start
+
+
+def _synthetic(n: int, chunk: int) -> Iterator[List[Telemetry]]:
+    # The 30-scenario generator re-seeded until n scenarios are produced.
+    batch: List[Telemetry] = []
+    seed = 0
+    while n > 0:
+        for s in generate_scenarios(seed=seed):
+            batch.append(Telemetry.parse(s["telemetry"]))
+            n -= 1
+            if len(batch) == chunk or n == 0:
+                yield batch
+                batch = []
+            if n == 0:
+                break
+        seed += 1
+
+
+def _report(name: str, calls: int, old_s: float, new_s: float) -> None:
+    print(f"\n{name} ({calls} calls)")
+    print(f"legacy     : {old_s * 1e6 / calls:.2f} us/call")
+    print(f"single-pass: {new_s * 1e6 / calls:.2f} us/call")
+    print(f"speedup    : {old_s / new_s:.2f}x")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark single-pass utility scoring")
+    ap.add_argument("--repeat", type=int, default=2000, help="Passes over the 30-scenario corpus")
+    ap.add_argument("--synthetic", type=int, default=1_000_000, help="Re-seeded generator corpus size (0 to skip)")
+    ap.add_argument("--chunk", type=int, default=50_000, help="Synthetic scenarios parsed per chunk")
+    args = ap.parse_args()
+
+    corpus = [Telemetry.parse(s["telemetry"]) for s in generate_scenarios()]
+    _check(corpus)
+    old_s = _time(_legacy_score, corpus, args.repeat)
+    new_s = _time(_kernel_score, corpus, args.repeat)
+    _report("30-scenario corpus", len(corpus) * args.repeat, old_s, new_s)
+
+    if args.synthetic > 0:
+        old_s = new_s = 0.0
+        for batch in _synthetic(args.synthetic, args.chunk):
+            _check(batch)
+            old_s += _time(_legacy_score, batch, 1)
+            new_s += _time(_kernel_score, batch, 1)
+        _report("re-seeded synthetic corpus", args.synthetic, old_s, new_s)
+
+
+if __name__ == "__main__":
+    main()